@@ -47,6 +47,19 @@ GOOGLE_SHEETS_CREDENTIALS: str = os.environ.get(
 OPENAI_API_KEY: str = os.environ.get(
     "OPENAI_API_KEY", _env_values.get("OPENAI_API_KEY", "")
 )
+# Number of user partitions the reminder schedulers are split into; must be
+# the same for the bot and every ``python -m Bot.scheduler`` worker.
+SCHEDULER_SHARDS: int = int(
+    os.environ.get("SCHEDULER_SHARDS", _env_values.get("SCHEDULER_SHARDS", "1")) or 1
+)
+# How many minutes a scheduler replays after a slow tick or a restart; older
+# slots are dropped and counted as missed.
+SCHEDULER_CATCH_UP_MINUTES: int = int(
+    os.environ.get(
+        "SCHEDULER_CATCH_UP_MINUTES", _env_values.get("SCHEDULER_CATCH_UP_MINUTES", "15")
+    )
+    or 15
+)
 
 
 @dataclass
@@ -60,6 +73,8 @@ class Settings:
     webapp_url: str = WEBAPP_URL
     google_sheets_credentials: str = GOOGLE_SHEETS_CREDENTIALS
     openai_api_key: str = OPENAI_API_KEY
+    scheduler_shards: int = SCHEDULER_SHARDS
+    scheduler_catch_up_minutes: int = SCHEDULER_CATCH_UP_MINUTES
 
 
 def get_settings() -> Settings:
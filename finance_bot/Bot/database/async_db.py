@@ -0,0 +1,422 @@
+"""Awaitable access to FinanceDatabase that keeps SQLite work off the event loop."""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from Bot.database.crud import FinanceDatabase
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_READ_POOL_SIZE = 4
+DEFAULT_COMMIT_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 64
+
+T = TypeVar("T")
+
+# Methods that only issue SELECT statements and may run on read-only connections.
+# Anything not listed here (including getters that lazily create default rows)
+# is routed through the single writer connection.
+READ_METHODS = frozenset(
+    {
+        "list_active_household_items",
+        "list_household_items_with_status",
+        "get_household_item_by_code",
+        "get_next_household_position",
+        "household_status_exists",
+        "get_unpaid_household_questions",
+        "get_household_payment_status_map",
+        "has_unpaid_household_questions",
+        "should_show_household_payments_button",
+        "list_active_income_categories",
+        "get_income_categories_map",
+        "list_active_expense_categories",
+        "list_active_wishlist_categories",
+        "sum_income_category_percents",
+        "sum_expense_category_percents",
+        "get_income_category_by_id",
+        "get_income_category_by_code",
+        "get_expense_category_by_id",
+        "get_wishlist_category_by_title",
+        "get_wishlist_category_by_id",
+        "get_user_savings",
+        "get_user_savings_map",
+        "get_wishes_by_user",
+        "get_wish",
+        "get_active_byt_wishes",
+        "list_active_byt_items_for_reminder",
+        "get_all_savings_list",
+        "get_welcome_message_id",
+        "get_users_with_byt_reminder_times",
+        "get_users_with_byt_timer_times",
+        "get_users_with_active_byt_wishes",
+        "get_users_with_active_reminders",
+        "get_users_with_pending_snoozes",
+        "list_scheduled_reminders",
+        "get_reminder_change_seq",
+        "list_reminder_changes",
+        "list_reminders_by_category",
+        "get_reminder",
+        "get_reminder_schedule",
+        "get_reminder_event",
+        "get_reminder_event_by_hash",
+        "get_pending_snooze_events",
+        "get_reminder_stats",
+        "get_budget_status",
+        "get_budget_status_between",
+        "list_recurring_payments",
+        "get_due_recurring_payments",
+        "list_expenses",
+        "get_monthly_report_data",
+        "get_monthly_totals",
+        "list_debts",
+        "get_debt_summary",
+        "get_sheet_snapshots",
+    }
+)
+
+
+# Small, self-contained writes that only ``commit()`` at the end and never open
+# their own transaction. These are coalesced by the writer into one transaction
+# per commit window; everything else runs alone.
+GROUP_COMMIT_METHODS = frozenset(
+    {
+        "ensure_user_settings",
+        "update_saving",
+        "log_income",
+        "add_expense",
+        "delete_expense",
+        "set_budget_limit",
+        "set_goal",
+        "add_debt",
+        "settle_debt",
+        "delete_debt",
+        "add_wish",
+        "mark_wish_purchased",
+        "set_wishlist_item_deferred_until",
+        "increment_reminder_stat",
+        "record_reminder_event",
+        "update_purchased_keep_days",
+        "set_byt_reminders_enabled",
+        "set_report_day",
+        "set_google_sheets_id",
+        "save_sheet_snapshots",
+    }
+)
+
+
+def _complete(result: Any) -> Any:
+    """Finish coroutines returned by FinanceDatabase ``async def`` methods.
+
+    Those methods never suspend, so they are driven to completion inside the
+    worker thread instead of being handed back to the event loop.
+    """
+
+    if not asyncio.iscoroutine(result):
+        return result
+    try:
+        result.send(None)
+    except StopIteration as stop:
+        return stop.value
+    result.close()
+    raise RuntimeError("FinanceDatabase coroutine suspended in a worker thread")
+
+
+def _invoke(method: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Any:
+    return _complete(method(*args, **kwargs))
+
+
+class GroupCommitConnection(sqlite3.Connection):
+    """Connection whose ``commit``/``rollback`` are scoped to a savepoint.
+
+    While ``savepoint`` is set, FinanceDatabase methods running on this
+    connection cannot end the surrounding group transaction: ``commit`` is
+    a no-op and ``rollback`` only undoes the current job.
+    """
+
+    savepoint: Optional[str] = None
+
+    def commit(self) -> None:
+        if self.savepoint is None:
+            super().commit()
+
+    def rollback(self) -> None:
+        if self.savepoint is None:
+            super().rollback()
+        else:
+            self.execute(f"ROLLBACK TO SAVEPOINT {self.savepoint}")
+
+
+@dataclass
+class _WriteJob:
+    method: Callable[..., Any]
+    args: tuple
+    kwargs: Dict[str, Any]
+    batchable: bool
+    future: Future = field(default_factory=Future)
+
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """Single writer thread that batches small writes into one transaction.
+
+    Batchable jobs arriving within ``window`` seconds of each other (up to
+    ``max_batch``) share a transaction; each job runs inside its own
+    savepoint so a failing job does not discard its neighbours. A job's
+    future resolves only after the transaction containing it is committed.
+    """
+
+    _SAVEPOINT = "group_job"
+
+    def __init__(
+        self,
+        connect: Callable[[], GroupCommitConnection],
+        window: float = DEFAULT_COMMIT_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self.batches = 0
+        self.jobs = 0
+        self._connect = connect
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="finance-db-write", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self, method: Callable[..., Any], args: tuple, kwargs: Dict[str, Any], batchable: bool
+    ) -> Future:
+        job = _WriteJob(method, args, kwargs, batchable)
+        self._queue.put(job)
+        return job.future
+
+    def stop(self) -> None:
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        connection = self._connect()
+        carry: Any = None
+        try:
+            while True:
+                job = carry if carry is not None else self._queue.get()
+                carry = None
+                if job is _STOP:
+                    return
+                if not job.batchable:
+                    self._run_single(job)
+                    continue
+                batch = [job]
+                deadline = time.monotonic() + self.window
+                while len(batch) < self.max_batch:
+                    timeout = deadline - time.monotonic()
+                    try:
+                        if timeout > 0:
+                            nxt = self._queue.get(timeout=timeout)
+                        else:
+                            nxt = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if nxt is _STOP or not nxt.batchable:
+                        carry = nxt
+                        break
+                    batch.append(nxt)
+                self._run_batch(connection, batch)
+        finally:
+            try:
+                connection.close()
+            except sqlite3.Error as error:
+                LOGGER.error("Failed to close writer connection: %s", error)
+
+    @staticmethod
+    def _run_single(job: _WriteJob) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            return
+        try:
+            job.future.set_result(_invoke(job.method, job.args, job.kwargs))
+        except BaseException as exc:  # propagate to the awaiting caller
+            job.future.set_exception(exc)
+
+    def _run_batch(self, connection: GroupCommitConnection, batch: List[_WriteJob]) -> None:
+        outcomes: List[tuple] = []
+        try:
+            connection.execute("BEGIN")
+            for job in batch:
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                connection.execute(f"SAVEPOINT {self._SAVEPOINT}")
+                connection.savepoint = self._SAVEPOINT
+                try:
+                    result = _invoke(job.method, job.args, job.kwargs)
+                except BaseException as exc:
+                    connection.execute(f"ROLLBACK TO SAVEPOINT {self._SAVEPOINT}")
+                    outcomes.append((job, None, exc))
+                else:
+                    outcomes.append((job, result, None))
+                finally:
+                    connection.savepoint = None
+                    connection.execute(f"RELEASE SAVEPOINT {self._SAVEPOINT}")
+            connection.commit()
+        except sqlite3.Error as error:
+            LOGGER.error("Group commit of %s writes failed: %s", len(batch), error)
+            connection.savepoint = None
+            if connection.in_transaction:
+                connection.rollback()
+            for job in batch:
+                if job.future.running():
+                    job.future.set_exception(error)
+            return
+        self.batches += 1
+        self.jobs += len(outcomes)
+        for job, result, exc in outcomes:
+            if exc is not None:
+                job.future.set_exception(exc)
+            else:
+                job.future.set_result(result)
+
+
+class AsyncFinanceDatabase:
+    """Coroutine facade over FinanceDatabase backed by dedicated connections.
+
+    Read-only methods run on a small thread pool where every thread owns its
+    own ``query_only`` connection; all other methods are serialized through a
+    single group-commit writer. Method names and signatures match
+    FinanceDatabase, so callers only need to ``await`` the same calls; an
+    awaited write returns once its transaction is committed.
+    """
+
+    def __init__(
+        self,
+        db: FinanceDatabase,
+        read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+        commit_window: float = DEFAULT_COMMIT_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        self.db = db
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._closed = False
+        self._read_executor = ThreadPoolExecutor(
+            max_workers=max(1, read_pool_size),
+            thread_name_prefix="finance-db-read",
+            initializer=self._bind_connection,
+            initargs=(True,),
+        )
+        self._writer = GroupCommitWriter(
+            self._bind_writer_connection, window=commit_window, max_batch=max_batch
+        )
+
+    def _bind_connection(self, read_only: bool) -> None:
+        connection = self.db.open_connection()
+        if read_only:
+            connection.execute("PRAGMA query_only = ON")
+        self.db.bind_thread_connection(connection)
+        with self._connections_lock:
+            self._connections.append(connection)
+
+    def _bind_writer_connection(self) -> GroupCommitConnection:
+        connection = self.db.open_connection(factory=GroupCommitConnection)
+        self.db.bind_thread_connection(connection)
+        return connection
+
+    @property
+    def writer(self) -> GroupCommitWriter:
+        return self._writer
+
+    @property
+    def tables(self):
+        return self.db.tables
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self.db, name)
+        if not callable(attr):
+            return attr
+        if name in READ_METHODS:
+
+            @functools.wraps(attr)
+            async def call(*args: Any, **kwargs: Any) -> Any:
+                return await self._read(attr, args, kwargs)
+
+        else:
+            batchable = name in GROUP_COMMIT_METHODS
+
+            @functools.wraps(attr)
+            async def call(*args: Any, **kwargs: Any) -> Any:
+                return await self._write(attr, args, kwargs, batchable)
+
+        self.__dict__[name] = call
+        return call
+
+    async def _read(
+        self, method: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]
+    ) -> Any:
+        if self._closed:
+            raise RuntimeError("AsyncFinanceDatabase is closed")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._read_executor, functools.partial(_invoke, method, args, kwargs)
+        )
+
+    async def _write(
+        self,
+        method: Callable[..., Any],
+        args: tuple,
+        kwargs: Dict[str, Any],
+        batchable: bool,
+    ) -> Any:
+        if self._closed:
+            raise RuntimeError("AsyncFinanceDatabase is closed")
+        return await asyncio.wrap_future(
+            self._writer.submit(method, args, kwargs, batchable)
+        )
+
+    async def run_sync(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``func(db, *args, **kwargs)`` on the writer thread.
+
+        Use this for helpers that take a FinanceDatabase and issue several
+        queries (or touch ``db.connection`` directly) so they share the
+        writer connection instead of the event-loop thread.
+        """
+
+        return await self._write(func, (self.db, *args), kwargs, False)
+
+    async def flush(self) -> None:
+        """Wait until every write queued so far has been committed."""
+
+        await self._write(lambda: None, (), {}, False)
+
+    def shutdown(self) -> None:
+        """Stop worker threads and close their connections."""
+
+        if self._closed:
+            return
+        self._closed = True
+        self._read_executor.shutdown(wait=True)
+        self._writer.stop()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.close()
+            except sqlite3.Error as error:
+                LOGGER.error("Failed to close pooled connection: %s", error)
+
+    async def close(self) -> None:
+        """Drain pending work and close pooled connections."""
+
+        if self._closed:
+            return
+        await self.flush()
+        await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
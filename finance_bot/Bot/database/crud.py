@@ -2,26 +2,46 @@
 from __future__ import annotations
 
 import contextlib
+import json
 import logging
 import sqlite3
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from threading import Lock
-from typing import Any, Dict, List, Optional
+from threading import Lock, local
+from typing import Any, Callable, Dict, Iterable, List, Optional
 from zoneinfo import ZoneInfo
 
 from Bot.config import settings
 from Bot.config.settings import get_settings
 from Bot.utils.datetime_utils import add_one_month
-from Bot.utils.time import get_user_timezone, now_for_user
+from Bot.utils.schedules import invalidate_compiled_schedule
+from Bot.utils.time import get_user_zoneinfo, now_for_user
 from Bot.utils.text_sanitizer import sanitize_income_title
 
 
 LOGGER = logging.getLogger(__name__)
 DB_PATH = Path(__file__).resolve().parents[2] / "finance.db"
-TARGET_SCHEMA_VERSION = 1
+TARGET_SCHEMA_VERSION = 7
+
+# Connection-level tuning applied to every connection (shared, pooled and writer).
+# WAL lets readers run alongside the writer; synchronous=NORMAL skips the fsync
+# on each commit in WAL mode while staying crash-safe for the database file.
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("busy_timeout", "5000"),
+    ("cache_size", "-16000"),
+    ("mmap_size", str(64 * 1024 * 1024)),
+    ("temp_store", "MEMORY"),
+)
+
+USER_SETTINGS_CACHE_SIZE = 4096
+# The bot and the Mini App backend are separate processes writing the same
+# table, so cached rows also expire on a timer, not only on local writes.
+USER_SETTINGS_CACHE_TTL = 300.0
 
 
 @dataclass(frozen=True)
@@ -46,6 +66,14 @@ class TableNames:
     recurring_payments: str = "повторяющиеся_платежи"
     income_log: str = "журнал_доходов"
     debts: str = "долги"
+    monthly_totals: str = "месячные_итоги"
+    fsm_states: str = "состояния_диалогов"
+    scheduler_leases: str = "аренды_планировщика"
+    scheduler_cursors: str = "курсоры_планировщика"
+    report_deliveries: str = "доставка_отчётов"
+    sheet_snapshots: str = "снимки_таблиц"
+    reminder_changes: str = "изменения_напоминаний"
+    byt_reminder_slots: str = "слоты_быт_напоминаний"
 
 
 TABLES = TableNames()
@@ -70,6 +98,59 @@ TABLE_RENAMES: dict[str, str] = {
 }
 LEGACY_TABLE_NAMES = tuple(TABLE_RENAMES.keys())
 
+# Versioned secondary indexes: schema version -> (name, table, columns).
+# Migration N builds version N's set on existing databases; _ensure_indexes
+# builds every version's set on new ones, newest first. An index is skipped
+# when another index (e.g. a UNIQUE constraint) already starts with the same
+# columns.
+SCHEMA_INDEXES: dict[int, tuple[tuple[str, str, tuple[str, ...]], ...]] = {
+    2: (
+        ("idx_income_log_user_type_created", TABLES.income_log, ("user_id", "type", "created_at")),
+        (
+            "idx_household_payments_user_month_code",
+            TABLES.household_payments,
+            ("user_id", "month", "question_code"),
+        ),
+        ("idx_wishes_user_purchased_category", TABLES.wishes, ("user_id", "is_purchased", "category")),
+        ("idx_purchases_user_purchased_at", TABLES.purchases, ("user_id", "purchased_at")),
+        ("idx_debts_user_settled", TABLES.debts, ("user_id", "is_settled")),
+        (
+            "idx_recurring_payments_user_active_due",
+            TABLES.recurring_payments,
+            ("user_id", "is_active", "next_due_date"),
+        ),
+    ),
+    3: (
+        ("idx_wishes_user_category_key", TABLES.wishes, ("user_id", "category_key", "is_purchased")),
+        ("idx_purchases_user_category_key", TABLES.purchases, ("user_id", "category_key")),
+    ),
+    4: (
+        ("idx_purchases_user_purchased_utc", TABLES.purchases, ("user_id", "purchased_at_utc", "id")),
+    ),
+    5: (
+        (
+            "idx_purchases_user_category_expires",
+            TABLES.purchases,
+            ("user_id", "category_key", "expires_at"),
+        ),
+        ("idx_wishes_user_category_expires", TABLES.wishes, ("user_id", "category_key", "expires_at")),
+    ),
+    7: (
+        (
+            "idx_recurring_payments_active_due",
+            TABLES.recurring_payments,
+            ("is_active", "next_due_date"),
+        ),
+    ),
+}
+# Indexes made redundant by a composite index with the same leading column,
+# dropped by the migration that introduced the replacement.
+SUPERSEDED_INDEXES: dict[int, tuple[str, ...]] = {
+    2: ("idx_purchases_user_id", "idx_household_payments_user_id"),
+    5: ("idx_purchases_user_category_key",),
+    6: ("idx_savings_user_id",),
+}
+
 
 def _get_bot_user_id() -> int | None:
     try:
@@ -102,6 +183,79 @@ DEFAULT_EXPENSE_CATEGORIES = [
 
 
 
+# Tables whose free-text ``category`` is mirrored into an indexed ``category_key``.
+CATEGORY_KEY_TABLES = (TABLES.wishes, TABLES.purchases)
+# Legacy category spellings folded into their canonical key.
+CATEGORY_KEY_ALIASES = {"byt": "быт"}
+
+
+def normalize_category_key(value: Optional[str]) -> Optional[str]:
+    """Return the lookup key for a wish/purchase category title.
+
+    Trimmed and casefolded in Python (SQLite's ``lower()`` only folds ASCII,
+    so ``'БЫТ'`` never matched ``'быт'``) with legacy aliases resolved.
+    """
+
+    if value is None:
+        return None
+    normalized = str(value).strip().casefold()
+    return CATEGORY_KEY_ALIASES.get(normalized, normalized)
+
+
+UTC_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+# Stored for timestamps that are present but unparsable. Sorts after ''
+# and before any date, so it fails every retention cutoff.
+UNPARSABLE_TIMESTAMP = "-"
+
+
+def _parse_timestamp(value: str | datetime | None, zone: ZoneInfo) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        moment = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=zone)
+
+
+def _utc_timestamp(value: str | datetime | None, zone: ZoneInfo) -> str:
+    """Return ``value`` as a sortable UTC ISO string; naive values are in ``zone``.
+
+    Missing values become ``''`` and unparsable ones ``UNPARSABLE_TIMESTAMP``;
+    both sort before any date.
+    """
+
+    if not value:
+        return ""
+    moment = _parse_timestamp(value, zone)
+    if moment is None:
+        return UNPARSABLE_TIMESTAMP
+    return moment.astimezone(timezone.utc).strftime(UTC_TIMESTAMP_FORMAT)
+
+
+def _expiry_timestamp(value: str | datetime | None, zone: ZoneInfo) -> Optional[str]:
+    """Return the UTC time one calendar month after ``value`` (None if unparsable).
+
+    The month is added in the purchase's own timezone, matching how BYT
+    purchases used to be aged out.
+    """
+
+    moment = _parse_timestamp(value, zone)
+    if moment is None:
+        return None
+    return add_one_month(moment).astimezone(timezone.utc).strftime(UTC_TIMESTAMP_FORMAT)
+
+
+def _month_range(year: int, month: int) -> tuple[str, str]:
+    """Return ``[start, end)`` bounds matching ISO timestamps in a month.
+
+    Used instead of ``LIKE 'YYYY-MM%'`` so the filter can seek an index.
+    """
+
+    following = (year + month // 12, month % 12 + 1)
+    return f"{year:04d}-{month:02d}", f"{following[0]:04d}-{following[1]:02d}"
+
+
 def _get_user_version(cursor: sqlite3.Cursor) -> int:
     cursor.execute("PRAGMA user_version")
     row = cursor.fetchone()
@@ -147,44 +301,346 @@ def _table_has_column(cursor, table_name: str, column_name: str) -> bool:
     return column_name in cols
 
 
+def configure_connection(connection: sqlite3.Connection) -> None:
+    """Apply SQLITE_PRAGMAS to a freshly opened connection."""
+
+    for name, value in SQLITE_PRAGMAS:
+        try:
+            connection.execute(f"PRAGMA {name} = {value}")
+        except sqlite3.Error as error:
+            LOGGER.warning("Failed to set PRAGMA %s=%s: %s", name, value, error)
+
+
+def _table_exists(cursor: sqlite3.Cursor, table_name: str) -> bool:
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name = ?", (table_name,)
+    )
+    return cursor.fetchone() is not None
+
+
+def _has_index_prefix(cursor: sqlite3.Cursor, table_name: str, columns: tuple[str, ...]) -> bool:
+    cursor.execute(f'PRAGMA index_list("{table_name}")')
+    for index_row in cursor.fetchall():
+        cursor.execute(f'PRAGMA index_info("{index_row[1]}")')
+        indexed = tuple(row[2] for row in sorted(cursor.fetchall(), key=lambda row: row[0]))
+        if indexed[: len(columns)] == columns:
+            return True
+    return False
+
+
+def _create_schema_indexes(cursor: sqlite3.Cursor, versions: Iterable[int]) -> int:
+    """Create the SCHEMA_INDEXES of ``versions``; returns how many were built."""
+
+    created = 0
+    for version in versions:
+        for name, table_name, columns in SCHEMA_INDEXES.get(version, ()):
+            if not _table_exists(cursor, table_name):
+                continue
+            if not all(_table_has_column(cursor, table_name, column) for column in columns):
+                LOGGER.warning("%s lacks columns %s, skipping %s", table_name, columns, name)
+                continue
+            if _has_index_prefix(cursor, table_name, columns):
+                continue
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {name} ON "{table_name}" ({", ".join(columns)})'
+            )
+            created += 1
+    return created
+
+
+def _migrate_rename_tables(cursor: sqlite3.Cursor) -> None:
+    existing_tables = set(_list_user_tables(cursor))
+    renamed = 0
+    cursor.execute("PRAGMA foreign_keys = OFF")
+    for old_name, new_name in TABLE_RENAMES.items():
+        if old_name in existing_tables and new_name not in existing_tables:
+            cursor.execute(
+                f'ALTER TABLE "{old_name}" RENAME TO "{new_name}"'
+            )
+            renamed += 1
+            LOGGER.info("DB_MIGRATION rename %s->%s", old_name, new_name)
+            existing_tables.discard(old_name)
+            existing_tables.add(new_name)
+    cursor.execute("PRAGMA foreign_keys = ON")
+    cursor.execute("PRAGMA foreign_key_check")
+    fk_issues = cursor.fetchall()
+    if fk_issues:
+        raise RuntimeError(f"Foreign key issues after migration: {fk_issues}")
+    _assert_no_legacy_table_names(cursor)
+    LOGGER.info("DB_MIGRATION renamed=%s", renamed)
+
+
+def _migrate_hot_indexes(cursor: sqlite3.Cursor) -> None:
+    created = _create_schema_indexes(cursor, (2,))
+    for name in SUPERSEDED_INDEXES.get(2, ()):
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    LOGGER.info("DB_MIGRATION indexes_created=%s", created)
+
+
+def _backfill_category_keys(cursor: sqlite3.Cursor, table_name: str) -> int:
+    cursor.execute(
+        f'SELECT id, category FROM "{table_name}" '
+        "WHERE category_key IS NULL AND category IS NOT NULL"
+    )
+    updates = [(normalize_category_key(row[1]), row[0]) for row in cursor.fetchall()]
+    cursor.executemany(f'UPDATE "{table_name}" SET category_key = ? WHERE id = ?', updates)
+    return len(updates)
+
+
+def _migrate_category_keys(cursor: sqlite3.Cursor) -> None:
+    backfilled = 0
+    for table_name in CATEGORY_KEY_TABLES:
+        if not _table_exists(cursor, table_name):
+            continue
+        if not _table_has_column(cursor, table_name, "category_key"):
+            cursor.execute(f'ALTER TABLE "{table_name}" ADD COLUMN category_key TEXT')
+        backfilled += _backfill_category_keys(cursor, table_name)
+    created = _create_schema_indexes(cursor, (3,))
+    LOGGER.info("DB_MIGRATION category_keys=%s indexes_created=%s", backfilled, created)
+
+
+def _stored_user_zones(cursor: sqlite3.Cursor) -> tuple[ZoneInfo, dict[int, ZoneInfo]]:
+    """Return the default zone and every valid per-user zone in user_settings."""
+
+    default_zone = ZoneInfo(
+        settings.TIMEZONE.key if hasattr(settings.TIMEZONE, "key") else str(settings.TIMEZONE)
+    )
+    zones: dict[int, ZoneInfo] = {}
+    if _table_has_column(cursor, TABLES.user_settings, "timezone"):
+        cursor.execute(
+            f'SELECT user_id, timezone FROM "{TABLES.user_settings}" WHERE timezone IS NOT NULL'
+        )
+        for user_id, tz_name in cursor.fetchall():
+            try:
+                zones[user_id] = ZoneInfo(str(tz_name))
+            except Exception:  # noqa: BLE001
+                continue
+    return default_zone, zones
+
+
+def _migrate_purchase_utc_timestamps(cursor: sqlite3.Cursor) -> None:
+    if not _table_exists(cursor, TABLES.purchases):
+        return
+    if not _table_has_column(cursor, TABLES.purchases, "purchased_at_utc"):
+        cursor.execute(
+            f'ALTER TABLE "{TABLES.purchases}" ADD COLUMN purchased_at_utc TEXT NOT NULL DEFAULT \'\''
+        )
+    default_zone, zones = _stored_user_zones(cursor)
+    cursor.execute(
+        f'SELECT id, user_id, purchased_at FROM "{TABLES.purchases}" WHERE purchased_at_utc = \'\''
+    )
+    updates = [
+        (_utc_timestamp(purchased_at, zones.get(user_id, default_zone)), row_id)
+        for row_id, user_id, purchased_at in cursor.fetchall()
+    ]
+    cursor.executemany(
+        f'UPDATE "{TABLES.purchases}" SET purchased_at_utc = ? WHERE id = ?', updates
+    )
+    created = _create_schema_indexes(cursor, (4,))
+    LOGGER.info("DB_MIGRATION purchase_timestamps=%s indexes_created=%s", len(updates), created)
+
+
+def _migrate_byt_expiry(cursor: sqlite3.Cursor) -> None:
+    default_zone, zones = _stored_user_zones(cursor)
+    backfilled = 0
+    for table_name, purchased_filter in (
+        (TABLES.purchases, ""),
+        (TABLES.wishes, "AND is_purchased = 1"),
+    ):
+        if not _table_exists(cursor, table_name):
+            continue
+        if not _table_has_column(cursor, table_name, "expires_at"):
+            cursor.execute(f'ALTER TABLE "{table_name}" ADD COLUMN expires_at TEXT')
+        cursor.execute(
+            f'SELECT id, user_id, purchased_at FROM "{table_name}" '
+            f"WHERE expires_at IS NULL AND purchased_at IS NOT NULL {purchased_filter}"
+        )
+        updates = [
+            (_expiry_timestamp(purchased_at, zones.get(user_id, default_zone)), row_id)
+            for row_id, user_id, purchased_at in cursor.fetchall()
+        ]
+        cursor.executemany(f'UPDATE "{table_name}" SET expires_at = ? WHERE id = ?', updates)
+        backfilled += len(updates)
+    created = _create_schema_indexes(cursor, (5,))
+    for name in SUPERSEDED_INDEXES.get(5, ()):
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    LOGGER.info("DB_MIGRATION byt_expiry=%s indexes_created=%s", backfilled, created)
+
+
+def _ensure_unique_savings(cursor: sqlite3.Cursor) -> int:
+    """Fold duplicate (user_id, category) savings rows and make the pair unique.
+
+    Duplicates are merged into the oldest row: balances are summed and the
+    first non-empty goal is kept. Returns how many rows were folded away.
+    """
+
+    if not _table_exists(cursor, TABLES.savings):
+        return 0
+    if not all(
+        _table_has_column(cursor, TABLES.savings, column) for column in ("id", "user_id", "category")
+    ):
+        LOGGER.warning("%s lacks (user_id, category), skipping uniq_savings_user_category", TABLES.savings)
+        return 0
+    cursor.execute(
+        f"""
+        SELECT user_id, category, MIN(id), SUM(COALESCE(current, 0))
+        FROM "{TABLES.savings}"
+        GROUP BY user_id, category
+        HAVING COUNT(*) > 1
+        """
+    )
+    folded = 0
+    for user_id, category, keep_id, total in cursor.fetchall():
+        cursor.execute(
+            f"""
+            UPDATE "{TABLES.savings}"
+            SET current = ?,
+                (goal, purpose) = (
+                    SELECT goal, purpose FROM "{TABLES.savings}"
+                    WHERE user_id IS ? AND category IS ?
+                    ORDER BY COALESCE(goal, 0) > 0 DESC, id
+                    LIMIT 1
+                )
+            WHERE id = ?
+            """,
+            (total, user_id, category, keep_id),
+        )
+        cursor.execute(
+            f'DELETE FROM "{TABLES.savings}" WHERE user_id IS ? AND category IS ? AND id <> ?',
+            (user_id, category, keep_id),
+        )
+        folded += cursor.rowcount
+    cursor.execute(
+        f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS uniq_savings_user_category
+        ON "{TABLES.savings}" (user_id, category)
+        """
+    )
+    return folded
+
+
+def _migrate_unique_savings(cursor: sqlite3.Cursor) -> None:
+    folded = _ensure_unique_savings(cursor)
+    for name in SUPERSEDED_INDEXES.get(6, ()):
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    LOGGER.info("DB_MIGRATION savings_folded=%s", folded)
+
+
+def _migrate_recurring_due_index(cursor: sqlite3.Cursor) -> None:
+    created = _create_schema_indexes(cursor, (7,))
+    LOGGER.info("DB_MIGRATION indexes_created=%s", created)
+
+
+SCHEMA_MIGRATIONS: dict[int, Callable[[sqlite3.Cursor], None]] = {
+    1: _migrate_rename_tables,
+    2: _migrate_hot_indexes,
+    3: _migrate_category_keys,
+    4: _migrate_purchase_utc_timestamps,
+    5: _migrate_byt_expiry,
+    6: _migrate_unique_savings,
+    7: _migrate_recurring_due_index,
+}
+
+
 def migrate_schema(connection: sqlite3.Connection) -> None:
+    """Apply SCHEMA_MIGRATIONS above ``PRAGMA user_version``, one transaction each."""
+
     cursor = connection.cursor()
     current_version = _get_user_version(cursor)
     if current_version >= TARGET_SCHEMA_VERSION:
         return
 
-    existing_tables = set(_list_user_tables(cursor))
     LOGGER.info(
         "DB_MIGRATION start from_version=%s to_version=%s",
         current_version,
         TARGET_SCHEMA_VERSION,
     )
-    renamed = 0
-    try:
-        cursor.execute("BEGIN IMMEDIATE")
-        cursor.execute("PRAGMA foreign_keys = OFF")
-        for old_name, new_name in TABLE_RENAMES.items():
-            if old_name in existing_tables and new_name not in existing_tables:
-                cursor.execute(
-                    f'ALTER TABLE "{old_name}" RENAME TO "{new_name}"'
-                )
-                renamed += 1
-                LOGGER.info("DB_MIGRATION rename %s->%s", old_name, new_name)
-                existing_tables.discard(old_name)
-                existing_tables.add(new_name)
-        cursor.execute("PRAGMA foreign_keys = ON")
-        cursor.execute("PRAGMA foreign_key_check")
-        fk_issues = cursor.fetchall()
-        if fk_issues:
-            raise RuntimeError(f"Foreign key issues after migration: {fk_issues}")
-        _assert_no_legacy_table_names(cursor)
-        cursor.execute(f"PRAGMA user_version = {TARGET_SCHEMA_VERSION}")
-        cursor.execute("COMMIT")
-        LOGGER.info("DB_MIGRATION success renamed=%s", renamed)
-    except Exception:
-        cursor.execute("ROLLBACK")
-        LOGGER.error("DB_MIGRATION failed", exc_info=True)
-        raise
+    for version in range(current_version + 1, TARGET_SCHEMA_VERSION + 1):
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            SCHEMA_MIGRATIONS[version](cursor)
+            cursor.execute(f"PRAGMA user_version = {version}")
+            cursor.execute("COMMIT")
+            LOGGER.info("DB_MIGRATION success version=%s", version)
+        except Exception:
+            cursor.execute("ROLLBACK")
+            LOGGER.error("DB_MIGRATION failed version=%s", version, exc_info=True)
+            raise
+
+
+class UserSettingsCache:
+    """Bounded LRU of user_settings rows and resolved timezones with a TTL."""
+
+    def __init__(
+        self,
+        max_size: int = USER_SETTINGS_CACHE_SIZE,
+        ttl: float = USER_SETTINGS_CACHE_TTL,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, list[Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    def _entry(self, user_id: int) -> Optional[list[Any]]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return entry
+
+    def contains(self, user_id: int) -> bool:
+        """Return True when a fresh row is cached (does not count as a hit)."""
+
+        with self._lock:
+            return self._entry(user_id) is not None
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entry(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, user_id: int, row: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[user_id] = [time.monotonic() + self.ttl, dict(row), None]
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_zone(self, user_id: int) -> Optional[ZoneInfo]:
+        with self._lock:
+            entry = self._entry(user_id)
+            if entry is None or entry[2] is None:
+                return None
+            self.hits += 1
+            return entry[2]
+
+    def set_zone(self, user_id: int, zone: ZoneInfo) -> None:
+        with self._lock:
+            entry = self._entry(user_id)
+            if entry is not None:
+                entry[2] = zone
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """Drop one user's entry, or everything when ``user_id`` is None."""
+
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
 
 
 class FinanceDatabase:
@@ -205,13 +661,81 @@ class FinanceDatabase:
         """Initialize SQLite connection and create tables."""
 
         DB_PATH.touch(exist_ok=True)
+        self.db_path = DB_PATH
+        self._thread_state = local()
+        self.settings_cache = UserSettingsCache()
+        self._reminder_listeners: List[Callable[[Optional[int], Optional[int]], None]] = []
         self.connection = sqlite3.connect(DB_PATH, check_same_thread=False)
         self.connection.row_factory = sqlite3.Row
+        configure_connection(self.connection)
         self.tables = TABLES
         migrate_schema(self.connection)
         self.init_db()
         LOGGER.info("Database initialized at %s", DB_PATH)
 
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Return the connection bound to the current thread or the shared one."""
+
+        thread_state = self.__dict__.get("_thread_state")
+        bound = getattr(thread_state, "connection", None)
+        if bound is not None:
+            return bound
+        return self._connection
+
+    @connection.setter
+    def connection(self, value: sqlite3.Connection) -> None:
+        self._connection = value
+
+    def open_connection(
+        self, factory: type[sqlite3.Connection] = sqlite3.Connection
+    ) -> sqlite3.Connection:
+        """Open an additional, configured connection to the same database file."""
+
+        connection = sqlite3.connect(self.db_path, check_same_thread=False, factory=factory)
+        connection.row_factory = sqlite3.Row
+        configure_connection(connection)
+        return connection
+
+    def bind_thread_connection(self, connection: Optional[sqlite3.Connection]) -> None:
+        """Route queries issued from the calling thread through ``connection``."""
+
+        self._thread_state.connection = connection
+
+    def add_reminder_listener(
+        self, listener: Callable[[Optional[int], Optional[int]], None]
+    ) -> None:
+        """Register ``listener(reminder_id, user_id)`` for schedule-affecting changes.
+
+        It is called with ``(reminder_id, None)`` after a reminder's schedule
+        or enabled flag changes or it is deleted, and with ``(None, user_id)``
+        after a user's timezone changes.
+        """
+
+        self._reminder_listeners.append(listener)
+
+    def remove_reminder_listener(
+        self, listener: Callable[[Optional[int], Optional[int]], None]
+    ) -> None:
+        with contextlib.suppress(ValueError):
+            self._reminder_listeners.remove(listener)
+
+    def _notify_reminder_listeners(
+        self, reminder_id: Optional[int] = None, user_id: Optional[int] = None
+    ) -> None:
+        for listener in list(self._reminder_listeners):
+            try:
+                listener(reminder_id, user_id)
+            except Exception:  # noqa: BLE001
+                LOGGER.exception(
+                    "Reminder listener failed (reminder=%s, user=%s)", reminder_id, user_id
+                )
+
+    def notify_user_timezone_changed(self, user_id: int) -> None:
+        """Tell reminder listeners that ``user_id`` has a new timezone."""
+
+        self._notify_reminder_listeners(user_id=user_id)
+
     @staticmethod
     def _to_float(value: Any) -> float:
         """Safely convert a value to float, returning 0.0 on failure."""
@@ -250,7 +774,9 @@ class FinanceDatabase:
                 saved_amount REAL DEFAULT 0,
                 purchased_at TEXT,
                 debited_at TEXT,
-                deferred_until TEXT
+                deferred_until TEXT,
+                category_key TEXT,
+                expires_at TEXT
             )
             """
         )
@@ -262,7 +788,9 @@ class FinanceDatabase:
                 wish_name TEXT,
                 price REAL,
                 category TEXT,
-                purchased_at TEXT
+                purchased_at TEXT,
+                purchased_at_utc TEXT NOT NULL DEFAULT '',
+                expires_at TEXT
             )
             """
         )
@@ -490,6 +1018,13 @@ class FinanceDatabase:
             cursor, TABLES.user_settings, "updated_at", "TEXT"
         )
         self._add_column_if_missing(cursor, TABLES.wishes, "debited_at", "TEXT")
+        for table_name in CATEGORY_KEY_TABLES:
+            self._add_column_if_missing(cursor, table_name, "category_key", "TEXT")
+        self._add_column_if_missing(
+            cursor, TABLES.purchases, "purchased_at_utc", "TEXT NOT NULL DEFAULT ''"
+        )
+        for table_name in (TABLES.purchases, TABLES.wishes):
+            self._add_column_if_missing(cursor, table_name, "expires_at", "TEXT")
         cursor.execute(
             f"""
             CREATE TABLE IF NOT EXISTS "{TABLES.recurring_payments}" (
@@ -543,7 +1078,73 @@ class FinanceDatabase:
         self._add_column_if_missing(
             cursor, TABLES.user_settings, "google_sheets_id", "TEXT"
         )
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS "{TABLES.fsm_states}" (
+                key TEXT PRIMARY KEY,
+                state TEXT,
+                data TEXT NOT NULL DEFAULT '',
+                updated_at INTEGER NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS idx_fsm_states_updated_at ON "{TABLES.fsm_states}" (updated_at)'
+        )
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS "{TABLES.scheduler_leases}" (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS "{TABLES.scheduler_cursors}" (
+                name TEXT PRIMARY KEY,
+                last_minute TEXT NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS "{TABLES.byt_reminder_slots}" (
+                user_id INTEGER NOT NULL,
+                category_id INTEGER NOT NULL,
+                slot TEXT NOT NULL,
+                PRIMARY KEY (user_id, category_id, slot)
+            ) WITHOUT ROWID
+            """
+        )
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS "{TABLES.report_deliveries}" (
+                user_id INTEGER NOT NULL,
+                month TEXT NOT NULL,
+                status TEXT NOT NULL,
+                claimed_at TEXT NOT NULL,
+                finished_at TEXT,
+                PRIMARY KEY (user_id, month)
+            ) WITHOUT ROWID
+            """
+        )
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS "{TABLES.sheet_snapshots}" (
+                user_id INTEGER NOT NULL,
+                spreadsheet_id TEXT NOT NULL,
+                sheet TEXT NOT NULL,
+                width INTEGER NOT NULL,
+                row_hashes TEXT NOT NULL,
+                PRIMARY KEY (user_id, spreadsheet_id, sheet)
+            ) WITHOUT ROWID
+            """
+        )
         self._ensure_indexes(cursor)
+        self._ensure_monthly_totals(cursor)
+        self._ensure_reminder_change_log(cursor)
         self.connection.commit()
         self.sanitize_income_category_titles()
 
@@ -575,6 +1176,40 @@ class FinanceDatabase:
             )
             return []
 
+    def list_household_items_with_status(
+        self, user_id: int, month: str
+    ) -> List[Dict[str, Any]]:
+        """Return active household items with their ``is_paid`` flag for ``month``.
+
+        Items without a status row for the month count as unpaid.
+        """
+
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f"""
+                SELECT items.code, items.text, items.amount, items.position,
+                       COALESCE(payments.is_paid, 0) AS is_paid
+                FROM {TABLES.household_payment_items} AS items
+                LEFT JOIN {TABLES.household_payments} AS payments
+                  ON payments.user_id = items.user_id
+                 AND payments.month = ?
+                 AND payments.question_code = items.code
+                WHERE items.user_id = ? AND items.is_active = 1
+                ORDER BY items.position, items.id
+                """,
+                (month, user_id),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as error:
+            LOGGER.error(
+                "Failed to list household items with status for user %s month %s: %s",
+                user_id,
+                month,
+                error,
+            )
+            return []
+
     def get_household_item_by_code(
         self, user_id: int, code: str
     ) -> Optional[Dict[str, Any]]:
@@ -809,6 +1444,8 @@ class FinanceDatabase:
     def ensure_user_settings(self, user_id: int) -> None:
         """Ensure user_settings row exists with defaults."""
 
+        if self.settings_cache.contains(user_id):
+            return
         try:
             cursor = self.connection.cursor()
             cursor.execute(
@@ -1181,35 +1818,85 @@ class FinanceDatabase:
             LOGGER.error("Failed to set budget limit for user %s: %s", user_id, error)
             return False
 
+    @staticmethod
+    def _budget_row(
+        category_id: int,
+        title: str,
+        limit: float,
+        spent: float,
+        monthly_limit: float | None = None,
+    ) -> Dict[str, Any]:
+        return {
+            "category_id": category_id,
+            "category": title,
+            "budget_limit": limit,
+            "monthly_limit": limit if monthly_limit is None else monthly_limit,
+            "spent": spent,
+            "remaining": limit - spent,
+            "percent_used": round((spent / limit) * 100) if limit > 0 else 0,
+        }
+
     def get_budget_status(self, user_id: int, year: int, month: int) -> List[Dict[str, Any]]:
         """Return budget limit vs actual spending per category for a month."""
         month_prefix = f"{year:04d}-{month:02d}"
         try:
-            cursor = self.connection.cursor()
             cats = self.list_active_expense_categories(user_id)
-            result = []
-            for cat in cats:
-                if cat["budget_limit"] <= 0:
-                    continue
-                cursor.execute(
-                    f"""
-                    SELECT COALESCE(SUM(amount), 0) as spent
+            spent_by_category = {
+                row["category"]: float(row["total"])
+                for row in self.get_monthly_totals(user_id, month_prefix, "expense")
+            }
+            return [
+                self._budget_row(
+                    cat["id"], cat["title"], cat["budget_limit"],
+                    spent_by_category.get(cat["title"], 0.0),
+                )
+                for cat in cats
+                if cat["budget_limit"] > 0
+            ]
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to get budget status for user %s: %s", user_id, error)
+            return []
+
+    def get_budget_status_between(
+        self, user_id: int, start: str, end: str, limit_factor: float = 1.0
+    ) -> List[Dict[str, Any]]:
+        """Return budget limit vs spending for ``start <= created_at < end``.
+
+        ``start``/``end`` are ISO timestamps in the income log's UTC format.
+        ``budget_limit`` is the monthly limit scaled by ``limit_factor`` (see
+        ``BudgetPeriod.limit_factor``); ``monthly_limit`` is the stored one.
+        All categories are computed in one grouped pass over the
+        (user_id, type, created_at) index.
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f"""
+                SELECT c.id, c.title, COALESCE(c.budget_limit, 0) AS budget_limit,
+                       COALESCE(s.spent, 0) AS spent
+                FROM {TABLES.expense_categories} c
+                LEFT JOIN (
+                    SELECT category, SUM(amount) AS spent
                     FROM {TABLES.income_log}
-                    WHERE user_id = ? AND type = 'expense' AND category = ? AND created_at LIKE ?
-                    """,
-                    (user_id, cat["title"], f"{month_prefix}%"),
+                    WHERE user_id = ? AND type = 'expense'
+                      AND created_at >= ? AND created_at < ?
+                    GROUP BY category
+                ) s ON s.category = c.title
+                WHERE c.user_id = ? AND c.is_active = 1 AND COALESCE(c.budget_limit, 0) > 0
+                ORDER BY c.position, c.id
+                """,
+                (user_id, start, end, user_id),
+            )
+            return [
+                self._budget_row(
+                    row["id"],
+                    row["title"],
+                    round(float(row["budget_limit"]) * limit_factor, 2),
+                    float(row["spent"]),
+                    monthly_limit=float(row["budget_limit"]),
                 )
-                row = cursor.fetchone()
-                spent = float(row["spent"]) if row else 0.0
-                result.append({
-                    "category_id": cat["id"],
-                    "category": cat["title"],
-                    "budget_limit": cat["budget_limit"],
-                    "spent": spent,
-                    "remaining": cat["budget_limit"] - spent,
-                    "percent_used": round((spent / cat["budget_limit"]) * 100) if cat["budget_limit"] > 0 else 0,
-                })
-            return result
+                for row in cursor.fetchall()
+            ]
         except sqlite3.Error as error:
             LOGGER.error("Failed to get budget status for user %s: %s", user_id, error)
             return []
@@ -1524,8 +2211,15 @@ class FinanceDatabase:
             return None
 
     def get_user_settings(self, user_id: int) -> Dict[str, Any]:
-        """Return user settings ensuring defaults exist."""
+        """Return user settings ensuring defaults exist.
 
+        Rows are served from ``settings_cache`` when fresh; setters on this
+        class invalidate the user's entry.
+        """
+
+        cached = self.settings_cache.get(user_id)
+        if cached is not None:
+            return cached
         self.ensure_user_settings(user_id)
         try:
             cursor = self.connection.cursor()
@@ -1551,7 +2245,11 @@ class FinanceDatabase:
                 (user_id,),
             )
             row = cursor.fetchone()
-            return dict(row) if row else {}
+            if not row:
+                return {}
+            result = dict(row)
+            self.settings_cache.put(user_id, result)
+            return result
         except sqlite3.Error as error:
             LOGGER.error("Failed to fetch user settings for %s: %s", user_id, error)
             return {}
@@ -1593,6 +2291,7 @@ class FinanceDatabase:
                 (category, user_id),
             )
             self.connection.commit()
+            self.settings_cache.invalidate(user_id)
         except sqlite3.Error as error:
             LOGGER.error(
                 "Failed to update household debit category for user %s: %s",
@@ -1637,6 +2336,7 @@ class FinanceDatabase:
                 (category, user_id),
             )
             self.connection.commit()
+            self.settings_cache.invalidate(user_id)
             LOGGER.info(
                 "USER=%s ACTION=WISHLIST_DEBIT_CATEGORY_SET META=category_id=%s",
                 user_id,
@@ -1689,6 +2389,7 @@ class FinanceDatabase:
                 (category_id, user_id),
             )
             self.connection.commit()
+            self.settings_cache.invalidate(user_id)
         except sqlite3.Error as error:
             LOGGER.error(
                 "Failed to update BYT wishlist category for user %s: %s",
@@ -1762,6 +2463,7 @@ class FinanceDatabase:
                 (days, user_id),
             )
             self.connection.commit()
+            self.settings_cache.invalidate(user_id)
         except sqlite3.Error as error:
             LOGGER.error(
                 "Failed to update purchased_keep_days for user %s: %s", user_id, error
@@ -1818,6 +2520,7 @@ class FinanceDatabase:
                 (1 if enabled else 0, user_id),
             )
             self.connection.commit()
+            self.settings_cache.invalidate(user_id)
         except sqlite3.Error as error:
             LOGGER.error(
                 "Failed to update byt_reminders_enabled for user %s: %s", user_id, error
@@ -1834,6 +2537,7 @@ class FinanceDatabase:
                 (1 if enabled else 0, user_id),
             )
             self.connection.commit()
+            self.settings_cache.invalidate(user_id)
         except sqlite3.Error as error:
             LOGGER.error(
                 "Failed to update byt_defer_enabled for user %s: %s", user_id, error
@@ -1850,6 +2554,7 @@ class FinanceDatabase:
                 (max_days, user_id),
             )
             self.connection.commit()
+            self.settings_cache.invalidate(user_id)
         except sqlite3.Error as error:
             LOGGER.error(
                 "Failed to update byt_defer_max_days for user %s: %s", user_id, error
@@ -1927,21 +2632,13 @@ class FinanceDatabase:
     def _ensure_indexes(self, cursor: sqlite3.Cursor) -> None:
         """Create required indexes and unique constraints."""
 
-        cursor.execute(
-            f'CREATE INDEX IF NOT EXISTS idx_savings_user_id ON "{TABLES.savings}" (user_id)'
-        )
+        _ensure_unique_savings(cursor)
         cursor.execute(
             f'CREATE INDEX IF NOT EXISTS idx_wishes_user_id ON "{TABLES.wishes}" (user_id)'
         )
         cursor.execute(
             f'CREATE INDEX IF NOT EXISTS idx_wishes_user_category ON "{TABLES.wishes}" (user_id, category)'
         )
-        cursor.execute(
-            f'CREATE INDEX IF NOT EXISTS idx_purchases_user_id ON "{TABLES.purchases}" (user_id)'
-        )
-        cursor.execute(
-            f'CREATE INDEX IF NOT EXISTS idx_household_payments_user_id ON "{TABLES.household_payments}" (user_id)'
-        )
         cursor.execute(
             f'CREATE INDEX IF NOT EXISTS idx_household_items_user_id ON "{TABLES.household_payment_items}" (user_id)'
         )
@@ -2005,20 +2702,225 @@ class FinanceDatabase:
             f'CREATE INDEX IF NOT EXISTS idx_reminder_events_hash'
             f' ON "{TABLES.reminder_events}" (callback_hash)'
         )
+        _create_schema_indexes(cursor, range(TARGET_SCHEMA_VERSION, 0, -1))
 
-    def get_user_savings(self, user_id: int) -> Dict[str, Dict[str, Any]]:
-        """Get all savings for a user.
-
-        Args:
-            user_id (int): Telegram user id.
+    def _ensure_monthly_totals(self, cursor: sqlite3.Cursor) -> None:
+        """Create the per-month rollup table and the triggers that maintain it.
 
-        Returns:
-            dict: Mapping category to saving details.
+        Rows are keyed by (user_id, month, kind, category) where ``kind`` is
+        the income log ``type`` or ``'purchase'``. Triggers keep the totals in
+        step with every insert, update and delete on the source tables, in
+        the same transaction as the write. A freshly created table is
+        backfilled from existing history.
         """
 
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute(
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS "{TABLES.monthly_totals}" (
+                user_id INTEGER NOT NULL,
+                month TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                category TEXT NOT NULL,
+                total REAL NOT NULL DEFAULT 0,
+                entries INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, month, kind, category)
+            ) WITHOUT ROWID
+            """
+        )
+        sources = (
+            ("income_log", TABLES.income_log, "{row}.type", "{row}.amount", "{row}.created_at"),
+            ("purchases", TABLES.purchases, "'purchase'", "{row}.price", "{row}.purchased_at"),
+        )
+        for name, table, kind, amount, stamp in sources:
+            def key(row: str) -> tuple[str, str, str]:
+                return (
+                    f"substr({stamp.format(row=row)}, 1, 7)",
+                    kind.format(row=row),
+                    f"COALESCE({row}.category, '')",
+                )
+
+            def add(row: str) -> str:
+                month, kind_sql, category = key(row)
+                return f"""
+                INSERT INTO "{TABLES.monthly_totals}" (user_id, month, kind, category, total, entries)
+                SELECT {row}.user_id, {month}, {kind_sql}, {category}, COALESCE({amount.format(row=row)}, 0), 1
+                WHERE {row}.user_id IS NOT NULL AND {stamp.format(row=row)} IS NOT NULL
+                ON CONFLICT (user_id, month, kind, category)
+                DO UPDATE SET total = total + excluded.total, entries = entries + 1;
+                """
+
+            def remove(row: str) -> str:
+                month, kind_sql, category = key(row)
+                where = (
+                    f"user_id = {row}.user_id AND month = {month}"
+                    f" AND kind = {kind_sql} AND category = {category}"
+                )
+                return f"""
+                UPDATE "{TABLES.monthly_totals}"
+                SET total = total - COALESCE({amount.format(row=row)}, 0), entries = entries - 1
+                WHERE {where};
+                DELETE FROM "{TABLES.monthly_totals}" WHERE {where} AND entries <= 0;
+                """
+
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS trg_{name}_totals_insert'
+                f' AFTER INSERT ON "{table}" BEGIN {add("NEW")} END'
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS trg_{name}_totals_delete'
+                f' AFTER DELETE ON "{table}" BEGIN {remove("OLD")} END'
+            )
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS trg_{name}_totals_update'
+                f' AFTER UPDATE ON "{table}" BEGIN {remove("OLD")} {add("NEW")} END'
+            )
+
+        cursor.execute(f'SELECT 1 FROM "{TABLES.monthly_totals}" LIMIT 1')
+        if cursor.fetchone() is None:
+            self._rebuild_monthly_totals(cursor)
+
+    def _ensure_reminder_change_log(self, cursor: sqlite3.Cursor) -> None:
+        """Create the reminder change log and the triggers that append to it.
+
+        Every insert, update and delete on reminders and their schedules
+        adds a ``reminder_id`` row, and a new or changed user timezone adds a
+        ``user_id`` row, in the same transaction, whichever process (bot,
+        Mini App, scheduler worker) made the write. ``ReminderIndex``
+        instances poll the log by ``seq`` to pick up changes their own
+        listeners never see.
+        """
+
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS "{TABLES.reminder_changes}" (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                reminder_id INTEGER,
+                user_id INTEGER,
+                changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now'))
+            )
+            """
+        )
+        sources = (
+            ("reminders", TABLES.reminders, "{row}.id"),
+            ("reminder_schedules", TABLES.reminder_schedules, "{row}.reminder_id"),
+        )
+        for name, table, reminder_id in sources:
+            for event, row in (("insert", "NEW"), ("update", "NEW"), ("delete", "OLD")):
+                cursor.execute(
+                    f'CREATE TRIGGER IF NOT EXISTS trg_{name}_changes_{event}'
+                    f' AFTER {event.upper()} ON "{table}" BEGIN'
+                    f' INSERT INTO "{TABLES.reminder_changes}" (reminder_id)'
+                    f" VALUES ({reminder_id.format(row=row)}); END"
+                )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS trg_user_settings_changes_insert'
+            f' AFTER INSERT ON "{TABLES.user_settings}" BEGIN'
+            f' INSERT INTO "{TABLES.reminder_changes}" (user_id) VALUES (NEW.user_id); END'
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS trg_user_settings_changes_timezone'
+            f' AFTER UPDATE OF timezone ON "{TABLES.user_settings}"'
+            f" WHEN OLD.timezone IS NOT NEW.timezone BEGIN"
+            f' INSERT INTO "{TABLES.reminder_changes}" (user_id) VALUES (NEW.user_id); END'
+        )
+
+    def _rebuild_monthly_totals(
+        self, cursor: sqlite3.Cursor, user_id: int | None = None
+    ) -> int:
+        user_filter = "" if user_id is None else "WHERE user_id = ?"
+        params: tuple[Any, ...] = () if user_id is None else (user_id,)
+        cursor.execute(
+            f'DELETE FROM "{TABLES.monthly_totals}" {user_filter}', params
+        )
+        source_filter = "" if user_id is None else "AND user_id = ?"
+        cursor.execute(
+            f"""
+            INSERT INTO "{TABLES.monthly_totals}" (user_id, month, kind, category, total, entries)
+            SELECT user_id, substr(created_at, 1, 7), type, COALESCE(category, ''),
+                   SUM(amount), COUNT(*)
+            FROM "{TABLES.income_log}"
+            WHERE user_id IS NOT NULL AND created_at IS NOT NULL {source_filter}
+            GROUP BY 1, 2, 3, 4
+            """,
+            params,
+        )
+        rows = cursor.rowcount
+        cursor.execute(
+            f"""
+            INSERT INTO "{TABLES.monthly_totals}" (user_id, month, kind, category, total, entries)
+            SELECT user_id, substr(purchased_at, 1, 7), 'purchase', COALESCE(category, ''),
+                   COALESCE(SUM(price), 0), COUNT(*)
+            FROM "{TABLES.purchases}"
+            WHERE user_id IS NOT NULL AND purchased_at IS NOT NULL {source_filter}
+            GROUP BY 1, 2, 3, 4
+            """,
+            params,
+        )
+        return rows + cursor.rowcount
+
+    def rebuild_monthly_totals(self, user_id: int | None = None) -> int:
+        """Recompute the monthly rollup from the source tables.
+
+        Rebuilds one user or, with ``user_id=None``, everyone. Returns the
+        number of rollup rows written, or -1 on error.
+        """
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            rows = self._rebuild_monthly_totals(cursor, user_id)
+            cursor.execute("COMMIT")
+            return rows
+        except sqlite3.Error as error:
+            cursor.execute("ROLLBACK")
+            LOGGER.error("Failed to rebuild monthly totals (user %s): %s", user_id, error)
+            return -1
+
+    def get_monthly_totals(
+        self, user_id: int, month: str, kind: str | None = None
+    ) -> List[Dict[str, Any]]:
+        """Return rollup rows (kind, category, total, entries) for ``YYYY-MM``."""
+
+        try:
+            cursor = self.connection.cursor()
+            if kind is None:
+                cursor.execute(
+                    f"""
+                    SELECT kind, category, total, entries
+                    FROM "{TABLES.monthly_totals}"
+                    WHERE user_id = ? AND month = ?
+                    ORDER BY kind, category
+                    """,
+                    (user_id, month),
+                )
+            else:
+                cursor.execute(
+                    f"""
+                    SELECT kind, category, total, entries
+                    FROM "{TABLES.monthly_totals}"
+                    WHERE user_id = ? AND month = ? AND kind = ?
+                    ORDER BY category
+                    """,
+                    (user_id, month, kind),
+                )
+            return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to get monthly totals for user %s: %s", user_id, error)
+            return []
+
+    def get_user_savings(self, user_id: int) -> Dict[str, Dict[str, Any]]:
+        """Get all savings for a user.
+
+        Args:
+            user_id (int): Telegram user id.
+
+        Returns:
+            dict: Mapping category to saving details.
+        """
+
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
                 f"SELECT category, current, goal, purpose FROM {TABLES.savings} WHERE user_id = ?",
                 (user_id,),
             )
@@ -2134,6 +3036,60 @@ class FinanceDatabase:
                 (user_id, category, delta),
             )
 
+    def distribute_income(
+        self,
+        user_id: int,
+        allocations: Iterable[tuple[str, float]],
+        entry_type: str = "income",
+        note: str = "",
+    ) -> bool:
+        """Credit every ``(category, amount)`` to savings and log it, atomically.
+
+        All balances are upserted and all income log rows inserted in one
+        transaction, so a failure leaves neither savings nor the log touched.
+        """
+
+        rows = [
+            (category, self._to_float(amount))
+            for category, amount in allocations
+            if self._to_float(amount) != 0
+        ]
+        if not rows:
+            return True
+        created_at = datetime.utcnow().isoformat()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.executemany(
+                f"""
+                INSERT INTO {TABLES.savings} (user_id, category, current, goal, purpose)
+                VALUES (?, ?, ?, 0, '')
+                ON CONFLICT(user_id, category) DO UPDATE SET
+                    current = COALESCE(current, 0) + excluded.current
+                """,
+                [(user_id, category, amount) for category, amount in rows],
+            )
+            cursor.executemany(
+                f"""
+                INSERT INTO {TABLES.income_log} (user_id, amount, category, type, note, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (user_id, amount, category, entry_type, note, created_at)
+                    for category, amount in rows
+                ],
+            )
+            cursor.execute("COMMIT")
+            LOGGER.info(
+                "Distributed income for user %s over %s categories", user_id, len(rows)
+            )
+            return True
+        except sqlite3.Error as error:
+            with contextlib.suppress(sqlite3.Error):
+                self.connection.execute("ROLLBACK")
+            LOGGER.error("Failed to distribute income for user %s: %s", user_id, error)
+            return False
+
     def decrease_savings(self, user_id: int, category: str, amount: float) -> None:
         """Decrease savings for category by amount."""
 
@@ -2184,8 +3140,8 @@ class FinanceDatabase:
         try:
             cursor = self.connection.cursor()
             cursor.execute(
-                f"INSERT INTO {TABLES.wishes} (user_id, name, price, url, category, is_purchased, saved_amount, purchased_at) VALUES (?, ?, ?, ?, ?, 0, 0, NULL)",
-                (user_id, name, price, url, category),
+                f"INSERT INTO {TABLES.wishes} (user_id, name, price, url, category, category_key, is_purchased, saved_amount, purchased_at) VALUES (?, ?, ?, ?, ?, ?, 0, 0, NULL)",
+                (user_id, name, price, url, category, normalize_category_key(category)),
             )
             self.connection.commit()
             wish_id = cursor.lastrowid
@@ -2242,20 +3198,16 @@ class FinanceDatabase:
             return []
         try:
             cursor = self.connection.cursor()
-            category_sql = "lower(trim(category)) = lower(trim(?))"
-            params: tuple[Any, ...] = (user_id, category_title)
-            if category_title.strip().casefold() == "быт":
-                category_sql = "lower(trim(category)) IN (lower(trim(?)), 'byt')"
             cursor.execute(
                 f"""
                 SELECT id, user_id, name, price, url, category, is_purchased, saved_amount, purchased_at, deferred_until
                 FROM {TABLES.wishes}
                 WHERE user_id = ?
-                  AND {category_sql}
+                  AND category_key = ?
                   AND (is_purchased = 0 OR is_purchased IS NULL)
                 ORDER BY id
                 """,
-                params,
+                (user_id, normalize_category_key(category_title)),
             )
             rows = cursor.fetchall()
             LOGGER.info("Fetched active BYT wishes for user %s", user_id)
@@ -2273,21 +3225,17 @@ class FinanceDatabase:
             return []
         try:
             cursor = self.connection.cursor()
-            category_sql = "lower(trim(category)) = lower(trim(?))"
-            params: tuple[Any, ...] = (user_id, category_title, now_dt.isoformat())
-            if category_title.strip().casefold() == "быт":
-                category_sql = "lower(trim(category)) IN (lower(trim(?)), 'byt')"
             cursor.execute(
                 f"""
                 SELECT id, user_id, name, price, url, category, is_purchased, saved_amount, purchased_at, deferred_until
                 FROM {TABLES.wishes}
                 WHERE user_id = ?
-                  AND {category_sql}
+                  AND category_key = ?
                   AND (is_purchased = 0 OR is_purchased IS NULL)
                   AND (deferred_until IS NULL OR deferred_until <= ?)
                 ORDER BY id
                 """,
-                params,
+                (user_id, normalize_category_key(category_title), now_dt.isoformat()),
             )
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
@@ -2332,17 +3280,15 @@ class FinanceDatabase:
 
         try:
             cursor = self.connection.cursor()
-            purchased_value = (
-                purchased_at
-                or datetime.now(tz=settings.TIMEZONE)
-            ).isoformat()
+            purchased_dt = purchased_at or datetime.now(tz=settings.TIMEZONE)
+            _, expires_at = self._purchase_timestamps(None, purchased_dt)
             cursor.execute(
                 f"""
                 UPDATE {TABLES.wishes}
-                SET is_purchased = 1, purchased_at = ?, deferred_until = NULL
+                SET is_purchased = 1, purchased_at = ?, expires_at = ?, deferred_until = NULL
                 WHERE id = ?
                 """,
-                (purchased_value, wish_id),
+                (purchased_dt.isoformat(), expires_at, wish_id),
             )
             self.connection.commit()
             LOGGER.info("Marked wish %s as purchased", wish_id)
@@ -2358,6 +3304,9 @@ class FinanceDatabase:
     ) -> Dict[str, Any]:
         """Purchase wish with debit in a single transaction."""
 
+        purchased_dt = purchased_at or datetime.now(tz=settings.TIMEZONE)
+        purchased_value = purchased_dt.isoformat()
+        purchased_utc, expires_at = self._purchase_timestamps(user_id, purchased_dt)
         cursor = self.connection.cursor()
         try:
             cursor.execute("BEGIN IMMEDIATE")
@@ -2381,23 +3330,29 @@ class FinanceDatabase:
 
             price = self._to_float(row["price"])
             if price <= 0 or debit_category is None:
-                purchased_value = (
-                    purchased_at or datetime.now(tz=settings.TIMEZONE)
-                ).isoformat()
                 cursor.execute(
                     f"""
                     UPDATE {TABLES.wishes}
-                    SET is_purchased = 1, purchased_at = ?, deferred_until = NULL
+                    SET is_purchased = 1, purchased_at = ?, expires_at = ?, deferred_until = NULL
                     WHERE id = ?
                     """,
-                    (purchased_value, wish_id),
+                    (purchased_value, expires_at, wish_id),
                 )
                 cursor.execute(
                     f"""
-                    INSERT INTO {TABLES.purchases} (user_id, wish_name, price, category, purchased_at)
-                    VALUES (?, ?, ?, ?, ?)
+                    INSERT INTO {TABLES.purchases} (user_id, wish_name, price, category, category_key, purchased_at, purchased_at_utc, expires_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                     """,
-                    (user_id, row["name"], price, row["category"], purchased_value),
+                    (
+                        user_id,
+                        row["name"],
+                        price,
+                        row["category"],
+                        normalize_category_key(row["category"]),
+                        purchased_value,
+                        purchased_utc,
+                        expires_at,
+                    ),
                 )
                 cursor.execute("COMMIT")
                 return {
@@ -2422,23 +3377,29 @@ class FinanceDatabase:
                 }
 
             self._update_saving_in_transaction(cursor, user_id, debit_category, -price)
-            purchased_value = (
-                purchased_at or datetime.now(tz=settings.TIMEZONE)
-            ).isoformat()
             cursor.execute(
                 f"""
                 UPDATE {TABLES.wishes}
-                SET is_purchased = 1, purchased_at = ?, debited_at = ?, deferred_until = NULL
+                SET is_purchased = 1, purchased_at = ?, debited_at = ?, expires_at = ?, deferred_until = NULL
                 WHERE id = ?
                 """,
-                (purchased_value, purchased_value, wish_id),
+                (purchased_value, purchased_value, expires_at, wish_id),
             )
             cursor.execute(
                 f"""
-                INSERT INTO {TABLES.purchases} (user_id, wish_name, price, category, purchased_at)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO {TABLES.purchases} (user_id, wish_name, price, category, category_key, purchased_at, purchased_at_utc, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (user_id, row["name"], price, row["category"], purchased_value),
+                (
+                    user_id,
+                    row["name"],
+                    price,
+                    row["category"],
+                    normalize_category_key(row["category"]),
+                    purchased_value,
+                    purchased_utc,
+                    expires_at,
+                ),
             )
             cursor.execute("COMMIT")
             return {
@@ -2465,12 +3426,20 @@ class FinanceDatabase:
 
         try:
             cursor = self.connection.cursor()
-            purchased_value = (
-                purchased_at or datetime.now(tz=settings.TIMEZONE)
-            ).isoformat()
+            purchased_dt = purchased_at or datetime.now(tz=settings.TIMEZONE)
+            purchased_utc, expires_at = self._purchase_timestamps(user_id, purchased_dt)
             cursor.execute(
-                f"INSERT INTO {TABLES.purchases} (user_id, wish_name, price, category, purchased_at) VALUES (?, ?, ?, ?, ?)",
-                (user_id, wish_name, price, category, purchased_value),
+                f"INSERT INTO {TABLES.purchases} (user_id, wish_name, price, category, category_key, purchased_at, purchased_at_utc, expires_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    user_id,
+                    wish_name,
+                    price,
+                    category,
+                    normalize_category_key(category),
+                    purchased_dt.isoformat(),
+                    purchased_utc,
+                    expires_at,
+                ),
             )
             self.connection.commit()
             LOGGER.info("Added purchase for user %s", user_id)
@@ -2816,54 +3785,105 @@ class FinanceDatabase:
                 error,
             )
 
-    def get_purchases_by_user(self, user_id: int) -> List[Dict[str, Any]]:
-        """Get purchases for user honoring retention settings."""
+    def _purchase_timestamps(
+        self, user_id: Optional[int], purchased_at: datetime
+    ) -> tuple[str, Optional[str]]:
+        """Return ``(purchased_at_utc, expires_at)`` for a purchase time.
+
+        Naive times are read in the user's timezone (the default one when
+        ``user_id`` is unknown).
+        """
+
+        default_tz = settings.TIMEZONE.key if hasattr(settings.TIMEZONE, "key") else str(settings.TIMEZONE)
+        if purchased_at.tzinfo is not None:
+            zone = ZoneInfo("UTC")
+        elif user_id is None:
+            zone = ZoneInfo(default_tz)
+        else:
+            zone = get_user_zoneinfo(self, user_id, default_tz)
+        return _utc_timestamp(purchased_at, zone), _expiry_timestamp(purchased_at, zone)
+
+    def _purchase_retention_cutoffs(
+        self, user_id: int, now_utc: datetime
+    ) -> tuple[dict[str, Optional[str]], str]:
+        """Return per-category cutoffs (None keeps all) and the default cutoff."""
+
+        settings_row = self.get_user_settings(user_id)
+        default_days = int(settings_row.get("purchased_keep_days", 30) or 30)
+
+        def cutoff(days: int) -> str:
+            return (now_utc - timedelta(days=days)).strftime(UTC_TIMESTAMP_FORMAT)
+
+        cutoffs: dict[str, Optional[str]] = {}
+        for cat in self.list_active_wishlist_categories(user_id):
+            if (cat.get("purchased_mode") or "days") == "always":
+                cutoffs[cat.get("title", "")] = None
+            else:
+                cutoffs[cat.get("title", "")] = cutoff(int(cat.get("purchased_days") or default_days))
+        return cutoffs, cutoff(default_days)
+
+    def get_purchases_by_user(
+        self,
+        user_id: int,
+        limit: Optional[int] = None,
+        after: Optional[tuple[str, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get purchases for user honoring retention settings, newest first.
+
+        Retention is applied in SQL against ``purchased_at_utc`` using a
+        cutoff per wishlist category. Legacy rows without a purchase time
+        (``purchased_at_utc = ''``) are always kept and come last; rows with
+        an unparsable one are only kept in 'always' categories. ``after``
+        is the ``(purchased_at_utc, id)`` of the last row of the previous
+        page for keyset pagination.
+        """
 
         self.ensure_user_settings(user_id)
         try:
+            cutoffs, default_cutoff = self._purchase_retention_cutoffs(
+                user_id, datetime.now(timezone.utc)
+            )
+            keeps_all = any(value is None for value in cutoffs.values())
+            # Lower bound on visible timestamps so the index range stops early.
+            floor = "" if keeps_all else min([default_cutoff, *cutoffs.values()])
+            cutoff_rows = " UNION ALL ".join("SELECT ?, ?" for _ in cutoffs)
+            params: list[Any] = [value for item in cutoffs.items() for value in item]
+            params += [user_id, floor, default_cutoff]
+            page_sql = ""
+            if after is not None:
+                page_sql = "AND (p.purchased_at_utc, p.id) < (?, ?)"
+                params += list(after)
+            limit_sql = ""
+            if limit is not None:
+                limit_sql = "LIMIT ?"
+                params.append(int(limit))
             cursor = self.connection.cursor()
             cursor.execute(
-                f"SELECT id, wish_name, price, category, purchased_at FROM {TABLES.purchases} WHERE user_id = ? ORDER BY purchased_at DESC",
-                (user_id,),
+                f"""
+                WITH cutoffs(category, cutoff) AS ({cutoff_rows or "SELECT NULL, NULL WHERE 0"})
+                SELECT p.id, p.wish_name, p.price, p.category, p.purchased_at, p.purchased_at_utc
+                FROM {TABLES.purchases} p
+                LEFT JOIN cutoffs c ON c.category = p.category
+                WHERE p.user_id = ?
+                  AND (
+                    p.purchased_at_utc = ''
+                    OR (
+                      p.purchased_at_utc >= ?
+                      AND (
+                        (c.category IS NOT NULL AND c.cutoff IS NULL)
+                        OR p.purchased_at_utc > COALESCE(c.cutoff, ?)
+                      )
+                    )
+                  )
+                  {page_sql}
+                ORDER BY p.purchased_at_utc DESC, p.id DESC
+                {limit_sql}
+                """,
+                params,
             )
             rows = cursor.fetchall()
             LOGGER.info("Fetched purchases for user %s", user_id)
-            purchases = [dict(row) for row in rows]
-            filtered: list[Dict[str, Any]] = []
-            default_tz = settings.TIMEZONE.key if hasattr(settings.TIMEZONE, "key") else str(settings.TIMEZONE)
-            user_tz = get_user_timezone(self, user_id, default_tz)
-            current_time = now_for_user(self, user_id, default_tz)
-            settings_row = self.get_user_settings(user_id)
-            default_days = int(settings_row.get("purchased_keep_days", 30) or 30)
-            categories = self.list_active_wishlist_categories(user_id)
-            category_map = {
-                cat.get("title", ""): {
-                    "mode": (cat.get("purchased_mode") or "days"),
-                    "days": int(cat.get("purchased_days") or default_days),
-                }
-                for cat in categories
-            }
-            for purchase in purchases:
-                cat_settings = category_map.get(
-                    str(purchase.get("category", "")),
-                    {"mode": "days", "days": default_days},
-                )
-                if cat_settings.get("mode") == "always":
-                    filtered.append(purchase)
-                    continue
-                keep_delta = timedelta(days=int(cat_settings.get("days", default_days)))
-                timestamp = purchase.get("purchased_at")
-                if timestamp:
-                    try:
-                        purchase_dt = datetime.fromisoformat(str(timestamp))
-                        if purchase_dt.tzinfo is None:
-                            purchase_dt = purchase_dt.replace(tzinfo=ZoneInfo(user_tz))
-                    except ValueError:
-                        continue
-                    if purchase_dt + keep_delta <= current_time:
-                        continue
-                filtered.append(purchase)
-            return filtered
+            return [dict(row) for row in rows]
         except sqlite3.Error as error:
             LOGGER.error("Failed to fetch purchases for user %s: %s", user_id, error)
             return []
@@ -3001,97 +4021,72 @@ class FinanceDatabase:
             LOGGER.error("Failed to get users with active BYT wishes: %s", error)
             return []
 
-    def cleanup_old_byt_purchases(
-        self, user_id: int, category_title: str, now: Optional[datetime] = None
-    ) -> None:
-        """Remove BYT purchases older than one month from purchases and wishes."""
+    def list_byt_purge_targets(self) -> List[Dict[str, Any]]:
+        """Return ``(user_id, category_key)`` of every enabled BYT category."""
 
-        if not category_title:
-            return
-        default_tz = settings.TIMEZONE.key if hasattr(settings.TIMEZONE, "key") else str(settings.TIMEZONE)
-        current_time = now or now_for_user(self, user_id, default_tz)
-        user_tz = get_user_timezone(self, user_id, default_tz)
         try:
             cursor = self.connection.cursor()
-            category_sql = "lower(trim(category)) = lower(trim(?))"
-            params: tuple[Any, ...] = (user_id, category_title)
-            if category_title.strip().casefold() == "быт":
-                category_sql = "lower(trim(category)) IN (lower(trim(?)), 'byt')"
-
             cursor.execute(
                 f"""
-                SELECT id, purchased_at
-                FROM {TABLES.purchases}
-                WHERE user_id = ?
-                  AND {category_sql}
-                """,
-                params,
+                SELECT DISTINCT wc.user_id, wc.title
+                FROM {TABLES.byt_reminder_categories} AS brc
+                JOIN {TABLES.wishlist_categories} AS wc
+                  ON wc.id = brc.category_id AND wc.user_id = brc.user_id
+                WHERE brc.enabled = 1 AND wc.is_active = 1
+                """
             )
-            purchases = cursor.fetchall()
-            ids_to_delete: list[int] = []
-            for purchase in purchases:
-                timestamp = purchase["purchased_at"]
-                if not timestamp:
-                    continue
-                try:
-                    purchase_dt = datetime.fromisoformat(timestamp)
-                    if purchase_dt.tzinfo is None:
-                        purchase_dt = purchase_dt.replace(tzinfo=ZoneInfo(user_tz))
-                except ValueError:
-                    continue
-                if add_one_month(purchase_dt) <= current_time:
-                    ids_to_delete.append(int(purchase["id"]))
-
-            if ids_to_delete:
-                placeholders = ",".join("?" * len(ids_to_delete))
-                query = "DELETE FROM {} WHERE id IN ({})".format(
-                    TABLES.purchases,
-                    placeholders,
-                )
-                cursor.execute(
-                    query,
-                    ids_to_delete,
-                )
+            targets = {
+                (int(row["user_id"]), normalize_category_key(row["title"]))
+                for row in cursor.fetchall()
+            }
+            return [
+                {"user_id": user_id, "category_key": key}
+                for user_id, key in sorted(targets)
+            ]
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to list BYT purge targets: %s", error)
+            return []
+
+    def purge_expired_byt_rows(
+        self,
+        table: str,
+        user_id: int,
+        category_key: str,
+        now_utc: str,
+        limit: int,
+        dry_run: bool = False,
+    ) -> int:
+        """Delete up to ``limit`` expired BYT rows; returns how many.
+
+        ``table`` is ``"purchases"`` or ``"wishes"`` (purchased wishes only).
+        With ``dry_run`` nothing is deleted and all expired rows are counted.
+        """
 
+        table_name = {"purchases": TABLES.purchases, "wishes": TABLES.wishes}[table]
+        purchased_filter = "AND is_purchased = 1" if table == "wishes" else ""
+        where_sql = (
+            f"user_id = ? AND category_key = ? AND expires_at <= ? {purchased_filter}"
+        )
+        params = (user_id, category_key, now_utc)
+        try:
+            cursor = self.connection.cursor()
+            if dry_run:
+                cursor.execute(f"SELECT COUNT(*) FROM {table_name} WHERE {where_sql}", params)
+                return int(cursor.fetchone()[0])
             cursor.execute(
                 f"""
-                SELECT id, purchased_at
-                FROM {TABLES.wishes}
-                WHERE user_id = ?
-                  AND {category_sql}
-                  AND is_purchased = 1
+                DELETE FROM {table_name}
+                WHERE id IN (SELECT id FROM {table_name} WHERE {where_sql} LIMIT ?)
                 """,
-                params,
+                (*params, limit),
             )
-            wish_rows = cursor.fetchall()
-            wish_ids: list[int] = []
-            for wish in wish_rows:
-                purchased_at = wish["purchased_at"]
-                if not purchased_at:
-                    continue
-                try:
-                    wish_dt = datetime.fromisoformat(purchased_at)
-                    if wish_dt.tzinfo is None:
-                        wish_dt = wish_dt.replace(tzinfo=ZoneInfo(user_tz))
-                except ValueError:
-                    continue
-                if add_one_month(wish_dt) <= current_time:
-                    wish_ids.append(int(wish["id"]))
-
-            if wish_ids:
-                placeholders = ",".join("?" * len(wish_ids))
-                query = "DELETE FROM {} WHERE id IN ({})".format(
-                    TABLES.wishes,
-                    placeholders,
-                )
-                cursor.execute(
-                    query,
-                    wish_ids,
-                )
-            if ids_to_delete or wish_ids:
-                self.connection.commit()
+            self.connection.commit()
+            return cursor.rowcount
         except sqlite3.Error as error:
-            LOGGER.error("Failed to cleanup old BYT purchases: %s", error)
+            LOGGER.error(
+                "Failed to purge expired BYT %s for user %s: %s", table, user_id, error
+            )
+            return 0
 
     # ------------------------------------------------------------------ #
     #  Scheduled Reminders CRUD                                           #
@@ -3171,6 +4166,8 @@ class FinanceDatabase:
             )
             deleted = cursor.rowcount > 0
             cursor.execute("COMMIT")
+            invalidate_compiled_schedule(reminder_id)
+            self._notify_reminder_listeners(reminder_id)
             return deleted
         except sqlite3.Error as error:
             with contextlib.suppress(sqlite3.Error):
@@ -3198,6 +4195,7 @@ class FinanceDatabase:
                 (new_val, datetime.now().isoformat(), reminder_id, user_id),
             )
             self.connection.commit()
+            self._notify_reminder_listeners(reminder_id)
             return bool(new_val)
         except sqlite3.Error as error:
             LOGGER.error("Failed to toggle reminder %s: %s", reminder_id, error)
@@ -3264,6 +4262,8 @@ class FinanceDatabase:
                  active_from, active_to, timezone),
             )
             self.connection.commit()
+            invalidate_compiled_schedule(reminder_id)
+            self._notify_reminder_listeners(reminder_id)
             return cursor.lastrowid
         except sqlite3.Error as error:
             LOGGER.error(
@@ -3297,6 +4297,7 @@ class FinanceDatabase:
                 (reminder_id,),
             )
             self.connection.commit()
+            invalidate_compiled_schedule(reminder_id)
             return cursor.rowcount > 0
         except sqlite3.Error as error:
             LOGGER.error("Failed to delete schedule for %s: %s", reminder_id, error)
@@ -3334,6 +4335,64 @@ class FinanceDatabase:
             LOGGER.error("Failed to record reminder event: %s", error)
             return None
 
+    def claim_reminder_slot(
+        self,
+        reminder_id: int,
+        user_id: int,
+        shown_at: str,
+        callback_hash: str,
+        category: str,
+        *,
+        slot: tuple[int, str] | None = None,
+    ) -> int | None:
+        """Atomically record a 'shown' event and bump the day's shown_count.
+
+        ``callback_hash`` is unique, so exactly one caller (in any process)
+        wins a slot; everyone else gets None. ``slot`` is an extra
+        ``(reminder_id, callback_hash)`` claimed in the same transaction,
+        e.g. the motivation schedule next to the content item it sent.
+        Returns the id of the ``reminder_id`` event.
+        """
+        insert = f"""
+            INSERT INTO "{TABLES.reminder_events}"
+                (reminder_id, user_id, event_type, shown_at, callback_hash)
+            VALUES (?, ?, 'shown', ?, ?)
+            ON CONFLICT(callback_hash) DO NOTHING
+            RETURNING id
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            claims = [(reminder_id, callback_hash)]
+            if slot is not None and slot[1] != callback_hash:
+                claims.insert(0, slot)
+            event_id = None
+            for claim_reminder_id, claim_hash in claims:
+                cursor.execute(insert, (claim_reminder_id, user_id, shown_at, claim_hash))
+                row = cursor.fetchone()
+                if row is None:
+                    cursor.execute("ROLLBACK")
+                    LOGGER.debug("Reminder slot already claimed hash=%s", claim_hash)
+                    return None
+                event_id = row[0]
+            cursor.execute(
+                f"""
+                INSERT INTO "{TABLES.reminder_stats_daily}"
+                    (user_id, date, category, shown_count)
+                VALUES (?, ?, ?, 1)
+                ON CONFLICT(user_id, date, category)
+                DO UPDATE SET shown_count = shown_count + 1
+                """,
+                (user_id, shown_at[:10], category),
+            )
+            cursor.execute("COMMIT")
+            return event_id
+        except sqlite3.Error as error:
+            with contextlib.suppress(sqlite3.Error):
+                self.connection.execute("ROLLBACK")
+            LOGGER.error("Failed to claim reminder slot %s: %s", reminder_id, error)
+            return None
+
     def get_reminder_event(self, event_id: int) -> dict[str, Any] | None:
         """Get a reminder event by id."""
         try:
@@ -3412,9 +4471,9 @@ class FinanceDatabase:
     # --- Stats ---
 
     def increment_reminder_stat(
-        self, user_id: int, date_str: str, category: str, field: str
+        self, user_id: int, date_str: str, category: str, field: str, delta: int = 1
     ) -> None:
-        """Increment a daily stat counter."""
+        """Increment a daily stat counter (a negative ``delta`` never goes below 0)."""
         allowed_fields = {"shown_count", "done_count", "snooze_count", "skip_count"}
         if field not in allowed_fields:
             return
@@ -3424,11 +4483,11 @@ class FinanceDatabase:
                 f"""
                 INSERT INTO "{TABLES.reminder_stats_daily}"
                     (user_id, date, category, {field})
-                VALUES (?, ?, ?, 1)
+                VALUES (?, ?, ?, MAX(?, 0))
                 ON CONFLICT(user_id, date, category)
-                DO UPDATE SET {field} = {field} + 1
+                DO UPDATE SET {field} = MAX({field} + ?, 0)
                 """,
-                (user_id, date_str, category),
+                (user_id, date_str, category, delta, delta),
             )
             self.connection.commit()
         except sqlite3.Error as error:
@@ -3472,6 +4531,241 @@ class FinanceDatabase:
             LOGGER.error("Failed to get users with active reminders: %s", error)
             return []
 
+    def list_scheduled_reminders(
+        self, reminder_id: int | None = None, user_id: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Return reminders joined with their schedule and the owner's timezone.
+
+        One row per scheduled reminder (the earliest schedule row wins, as in
+        ``get_reminder_schedule``); optionally narrowed to one reminder or user.
+        """
+        conditions = []
+        params: list[Any] = []
+        if reminder_id is not None:
+            conditions.append("r.id = ?")
+            params.append(reminder_id)
+        if user_id is not None:
+            conditions.append("r.user_id = ?")
+            params.append(user_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f"""
+                SELECT
+                    r.id AS reminder_id,
+                    r.user_id,
+                    r.category,
+                    r.title,
+                    r.is_enabled,
+                    s.schedule_type,
+                    s.interval_minutes,
+                    s.times_json,
+                    s.active_from,
+                    s.active_to,
+                    us.timezone AS user_timezone
+                FROM "{TABLES.reminders}" r
+                JOIN "{TABLES.reminder_schedules}" s ON s.id = (
+                    SELECT MIN(s2.id) FROM "{TABLES.reminder_schedules}" s2
+                    WHERE s2.reminder_id = r.id
+                )
+                LEFT JOIN "{TABLES.user_settings}" us ON us.user_id = r.user_id
+                {where}
+                """,
+                params,
+            )
+            return [dict(r) for r in cursor.fetchall()]
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to list scheduled reminders: %s", error)
+            return []
+
+    def get_reminder_change_seq(self) -> int | None:
+        """Return the newest ``seq`` of the reminder change log (0 when empty)."""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(f'SELECT COALESCE(MAX(seq), 0) FROM "{TABLES.reminder_changes}"')
+            return int(cursor.fetchone()[0])
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to read reminder change seq: %s", error)
+            return None
+
+    def list_reminder_changes(self, after_seq: int, limit: int) -> list[dict[str, Any]]:
+        """Return up to ``limit`` reminder changes logged after ``after_seq``, oldest first."""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f"""
+                SELECT seq, reminder_id, user_id
+                FROM "{TABLES.reminder_changes}"
+                WHERE seq > ?
+                ORDER BY seq
+                LIMIT ?
+                """,
+                (after_seq, limit),
+            )
+            return [dict(r) for r in cursor.fetchall()]
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to list reminder changes after %s: %s", after_seq, error)
+            return []
+
+    def prune_reminder_changes(self, before: str) -> int:
+        """Delete reminder changes logged before the UTC timestamp ``before``."""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f'DELETE FROM "{TABLES.reminder_changes}" WHERE changed_at < ?', (before,)
+            )
+            self.connection.commit()
+            return cursor.rowcount
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to prune reminder changes: %s", error)
+            return 0
+
+    def get_users_with_pending_snoozes(self) -> list[int]:
+        """Return user ids that have at least one snoozed reminder event."""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f'SELECT DISTINCT user_id FROM "{TABLES.reminder_events}"'
+                f" WHERE event_type = 'snooze' AND snooze_until IS NOT NULL",
+            )
+            return [r["user_id"] for r in cursor.fetchall()]
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to get users with pending snoozes: %s", error)
+            return []
+
+    # --- Scheduler leases ---
+
+    def acquire_lease(
+        self,
+        name: str,
+        holder: str,
+        ttl: float,
+        *,
+        now: float | None = None,
+        force: bool = False,
+    ) -> bool:
+        """Take or renew lease ``name`` for ``ttl`` seconds; True if ``holder`` has it.
+
+        A lease held by someone else is only taken once it has expired,
+        unless ``force`` is set (a worker reclaiming its own shard).
+        """
+        now = time.time() if now is None else now
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f"""
+                INSERT INTO "{TABLES.scheduler_leases}" (name, holder, expires_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    holder = excluded.holder,
+                    expires_at = excluded.expires_at
+                WHERE ? OR holder = excluded.holder OR expires_at <= ?
+                """,
+                (name, holder, now + ttl, int(force), now),
+            )
+            self.connection.commit()
+            return cursor.rowcount > 0
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to acquire lease %s: %s", name, error)
+            return False
+
+    def get_scheduler_cursors(self, names: Iterable[str]) -> dict[str, str]:
+        """Last processed UTC minute (``UTC_TIMESTAMP_FORMAT``) per scheduler cursor."""
+        names = list(names)
+        if not names:
+            return {}
+        try:
+            cursor = self.connection.cursor()
+            placeholders = ", ".join("?" for _ in names)
+            cursor.execute(
+                f'SELECT name, last_minute FROM "{TABLES.scheduler_cursors}"'
+                f" WHERE name IN ({placeholders})",
+                names,
+            )
+            return {row["name"]: row["last_minute"] for row in cursor.fetchall()}
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to read scheduler cursors: %s", error)
+            return {}
+
+    def advance_scheduler_cursors(self, names: Iterable[str], last_minute: str) -> None:
+        """Move cursors forward to ``last_minute``; they never go backwards."""
+        try:
+            cursor = self.connection.cursor()
+            cursor.executemany(
+                f"""
+                INSERT INTO "{TABLES.scheduler_cursors}" (name, last_minute)
+                VALUES (?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    last_minute = MAX(last_minute, excluded.last_minute)
+                """,
+                [(name, last_minute) for name in names],
+            )
+            self.connection.commit()
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to advance scheduler cursors: %s", error)
+
+    def claim_byt_reminder_slot(
+        self, user_id: int, category_id: int, slot: str, prune_before: str
+    ) -> bool:
+        """Claim the BYT checklist of ``category_id`` for the UTC minute ``slot``.
+
+        True for exactly one caller in any process, so a shard hand-over
+        cannot send the same checklist twice. The winner drops the
+        category's claims older than ``prune_before``.
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(
+                f"""
+                INSERT INTO "{TABLES.byt_reminder_slots}" (user_id, category_id, slot)
+                VALUES (?, ?, ?)
+                ON CONFLICT(user_id, category_id, slot) DO NOTHING
+                RETURNING user_id
+                """,
+                (user_id, category_id, slot),
+            )
+            if cursor.fetchone() is None:
+                cursor.execute("ROLLBACK")
+                LOGGER.debug(
+                    "BYT slot already claimed user=%s category=%s slot=%s",
+                    user_id,
+                    category_id,
+                    slot,
+                )
+                return False
+            cursor.execute(
+                f"""
+                DELETE FROM "{TABLES.byt_reminder_slots}"
+                WHERE user_id = ? AND category_id = ? AND slot < ?
+                """,
+                (user_id, category_id, prune_before),
+            )
+            cursor.execute("COMMIT")
+            return True
+        except sqlite3.Error as error:
+            with contextlib.suppress(sqlite3.Error):
+                self.connection.execute("ROLLBACK")
+            LOGGER.error(
+                "Failed to claim BYT slot user=%s category=%s: %s", user_id, category_id, error
+            )
+            return False
+
+    def release_lease(self, name: str, holder: str) -> bool:
+        """Give up lease ``name`` if ``holder`` still holds it."""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f'DELETE FROM "{TABLES.scheduler_leases}" WHERE name = ? AND holder = ?',
+                (name, holder),
+            )
+            self.connection.commit()
+            return cursor.rowcount > 0
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to release lease %s: %s", name, error)
+            return False
+
     # ── Recurring payments ────────────────────────────────
 
     def add_recurring_payment(
@@ -3575,6 +4869,83 @@ class FinanceDatabase:
         except sqlite3.Error as error:
             LOGGER.error("Failed to advance recurring payment %s: %s", payment_id, error)
 
+    def post_due_recurring_payments(self, today: date, limit: int) -> Dict[str, int]:
+        """Post one batch of due recurring payments across all users.
+
+        Up to ``limit`` active payments with ``next_due_date <= today`` are
+        read in one range query over ``idx_recurring_payments_active_due``.
+        Every missed period is logged as an expense dated on its due day and
+        ``next_due_date`` is moved past ``today``, all in one transaction, so
+        a crash never posts a period without advancing it (or the reverse).
+        Rows whose ``next_due_date`` is not shaped like ``YYYY-MM-DD`` are
+        left out in SQL: they would sort first and fill every batch.
+        """
+
+        result = {"selected": 0, "payments": 0, "expenses": 0}
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(
+                f"""
+                SELECT id, user_id, title, amount, category, next_due_date
+                FROM "{TABLES.recurring_payments}"
+                WHERE is_active = 1 AND next_due_date <= ?
+                  AND next_due_date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*'
+                ORDER BY next_due_date, id
+                LIMIT ?
+                """,
+                (today.isoformat(), limit),
+            )
+            rows = cursor.fetchall()
+            result["selected"] = len(rows)
+            expenses: list[tuple[Any, ...]] = []
+            advances: list[tuple[str, int, str]] = []
+            for row in rows:
+                try:
+                    due = date.fromisoformat(str(row["next_due_date"])[:10])
+                except ValueError:
+                    LOGGER.warning(
+                        "Recurring payment %s has invalid next_due_date %r",
+                        row["id"],
+                        row["next_due_date"],
+                    )
+                    continue
+                while due <= today:
+                    expenses.append(
+                        (
+                            row["user_id"],
+                            self._to_float(row["amount"]),
+                            row["category"],
+                            row["title"],
+                            datetime.combine(due, datetime.min.time()).isoformat(),
+                        )
+                    )
+                    due = add_one_month(due)
+                advances.append((due.isoformat(), row["id"], row["next_due_date"]))
+            cursor.executemany(
+                f"""
+                INSERT INTO {TABLES.income_log} (user_id, amount, category, type, note, created_at)
+                VALUES (?, ?, ?, 'expense', ?, ?)
+                """,
+                expenses,
+            )
+            cursor.executemany(
+                f"""
+                UPDATE "{TABLES.recurring_payments}" SET next_due_date = ?
+                WHERE id = ? AND next_due_date = ?
+                """,
+                advances,
+            )
+            cursor.execute("COMMIT")
+            result["payments"] = len(advances)
+            result["expenses"] = len(expenses)
+            return result
+        except sqlite3.Error as error:
+            with contextlib.suppress(sqlite3.Error):
+                self.connection.execute("ROLLBACK")
+            LOGGER.error("Failed to post due recurring payments: %s", error)
+            return result
+
     # ── Income log (for reports) ──────────────────────────
 
     def log_income(self, user_id: int, amount: float, category: str, entry_type: str = "income", note: str = "") -> None:
@@ -3613,17 +4984,18 @@ class FinanceDatabase:
 
     def list_expenses(self, user_id: int, year: int, month: int) -> List[Dict[str, Any]]:
         """Return expense entries for a given month ordered by date descending."""
-        month_prefix = f"{year:04d}-{month:02d}"
+        month_start, month_end = _month_range(year, month)
         try:
             cursor = self.connection.cursor()
             cursor.execute(
                 f"""
                 SELECT id, amount, category, note, created_at
                 FROM {TABLES.income_log}
-                WHERE user_id = ? AND type = 'expense' AND created_at LIKE ?
+                WHERE user_id = ? AND type = 'expense'
+                  AND created_at >= ? AND created_at < ?
                 ORDER BY created_at DESC
                 """,
-                (user_id, f"{month_prefix}%"),
+                (user_id, month_start, month_end),
             )
             return [dict(row) for row in cursor.fetchall()]
         except sqlite3.Error as error:
@@ -3661,35 +5033,17 @@ class FinanceDatabase:
         }
         try:
             cursor = self.connection.cursor()
-            # Income from log
-            cursor.execute(
-                f"""
-                SELECT category, SUM(amount) as total
-                FROM {TABLES.income_log}
-                WHERE user_id = ? AND type = 'income' AND created_at LIKE ?
-                GROUP BY category
-                """,
-                (user_id, f"{month_prefix}%"),
-            )
-            for row in cursor.fetchall():
-                cat_total = float(row["total"])
-                result["income_by_category"].append({"category": row["category"], "amount": cat_total})
-                result["total_income"] += cat_total
-
-            # Expenses from log
-            cursor.execute(
-                f"""
-                SELECT category, SUM(amount) as total
-                FROM {TABLES.income_log}
-                WHERE user_id = ? AND type = 'expense' AND created_at LIKE ?
-                GROUP BY category
-                """,
-                (user_id, f"{month_prefix}%"),
-            )
-            for row in cursor.fetchall():
+            # Income, expenses and purchases from the monthly rollup
+            for row in self.get_monthly_totals(user_id, month_prefix):
                 cat_total = float(row["total"])
-                result["expense_by_category"].append({"category": row["category"], "amount": cat_total})
-                result["total_expense"] += cat_total
+                if row["kind"] == "income":
+                    result["income_by_category"].append({"category": row["category"], "amount": cat_total})
+                    result["total_income"] += cat_total
+                elif row["kind"] == "expense":
+                    result["expense_by_category"].append({"category": row["category"], "amount": cat_total})
+                    result["total_expense"] += cat_total
+                elif row["kind"] == "purchase":
+                    result["total_expense"] += cat_total
 
             # Household payments for the month
             cursor.execute(
@@ -3708,19 +5062,6 @@ class FinanceDatabase:
                 if int(row["is_paid"]):
                     result["household_paid"] += amt
 
-            # Purchases in the month
-            cursor.execute(
-                f"""
-                SELECT SUM(price) as total
-                FROM {TABLES.purchases}
-                WHERE user_id = ? AND purchased_at LIKE ?
-                """,
-                (user_id, f"{month_prefix}%"),
-            )
-            row = cursor.fetchone()
-            if row and row["total"]:
-                result["total_expense"] += float(row["total"])
-
         except sqlite3.Error as error:
             LOGGER.error("Failed to generate report for user %s: %s", user_id, error)
         return result
@@ -3750,9 +5091,83 @@ class FinanceDatabase:
                 (day, user_id),
             )
             self.connection.commit()
+            self.settings_cache.invalidate(user_id)
         except sqlite3.Error as error:
             LOGGER.error("Failed to set report day for user %s: %s", user_id, error)
 
+    def list_report_candidates(
+        self, month: str, max_day: int, after_user_id: int, limit: int
+    ) -> List[Dict[str, Any]]:
+        """Users with ``report_day <= max_day`` whose ``month`` report is not done.
+
+        Keyset-paginated by user_id; rows still only claimed are included so
+        an abandoned claim can be taken over once it is stale.
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f"""
+                SELECT us.user_id, COALESCE(us.report_day, 1) AS report_day
+                FROM "{TABLES.user_settings}" us
+                WHERE us.user_id > ? AND COALESCE(us.report_day, 1) <= ?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM "{TABLES.report_deliveries}" d
+                      WHERE d.user_id = us.user_id AND d.month = ? AND d.status <> 'claimed'
+                  )
+                ORDER BY us.user_id
+                LIMIT ?
+                """,
+                (after_user_id, max_day, month, limit),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to list report candidates for %s: %s", month, error)
+            return []
+
+    def claim_report_delivery(
+        self, user_id: int, month: str, claimed_at: str, stale_before: str
+    ) -> bool:
+        """Claim the ``month`` report of ``user_id``; True for exactly one caller.
+
+        A claim older than ``stale_before`` that was never finished (the
+        sender crashed) can be claimed again.
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f"""
+                INSERT INTO "{TABLES.report_deliveries}" (user_id, month, status, claimed_at)
+                VALUES (?, ?, 'claimed', ?)
+                ON CONFLICT(user_id, month) DO UPDATE SET claimed_at = excluded.claimed_at
+                WHERE status = 'claimed' AND claimed_at < ?
+                RETURNING user_id
+                """,
+                (user_id, month, claimed_at, stale_before),
+            )
+            claimed = cursor.fetchone() is not None
+            self.connection.commit()
+            return claimed
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to claim %s report for user %s: %s", month, user_id, error)
+            return False
+
+    def finish_report_delivery(
+        self, user_id: int, month: str, status: str, finished_at: str
+    ) -> None:
+        """Mark a claimed report as done (``'sent'``, ``'empty'`` or ``'failed'``)."""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f"""
+                UPDATE "{TABLES.report_deliveries}" SET status = ?, finished_at = ?
+                WHERE user_id = ? AND month = ?
+                """,
+                (status, finished_at, user_id, month),
+            )
+            self.connection.commit()
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to finish %s report for user %s: %s", month, user_id, error)
+
     # ── Savings snapshot for export ───────────────────────
 
     def get_all_savings_list(self, user_id: int) -> List[Dict[str, Any]]:
@@ -3909,14 +5324,67 @@ class FinanceDatabase:
                 (sheets_id, user_id),
             )
             self.connection.commit()
+            self.settings_cache.invalidate(user_id)
         except sqlite3.Error as error:
             LOGGER.error("Failed to set google_sheets_id for user %s: %s", user_id, error)
 
+    def get_sheet_snapshots(self, user_id: int, spreadsheet_id: str) -> Dict[str, Dict[str, Any]]:
+        """Return ``{sheet: {"width", "row_hashes"}}`` from the last successful sync."""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f"""
+                SELECT sheet, width, row_hashes FROM "{TABLES.sheet_snapshots}"
+                WHERE user_id = ? AND spreadsheet_id = ?
+                """,
+                (user_id, spreadsheet_id),
+            )
+            return {
+                row["sheet"]: {
+                    "width": int(row["width"]),
+                    "row_hashes": json.loads(row["row_hashes"]),
+                }
+                for row in cursor.fetchall()
+            }
+        except (sqlite3.Error, ValueError) as error:
+            LOGGER.error("Failed to get sheet snapshots for user %s: %s", user_id, error)
+            return {}
+
+    def save_sheet_snapshots(
+        self, user_id: int, spreadsheet_id: str, snapshots: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Replace the sync snapshots of ``user_id``; other spreadsheets are forgotten."""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f'DELETE FROM "{TABLES.sheet_snapshots}" WHERE user_id = ?', (user_id,)
+            )
+            cursor.executemany(
+                f"""
+                INSERT INTO "{TABLES.sheet_snapshots}"
+                    (user_id, spreadsheet_id, sheet, width, row_hashes)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        user_id,
+                        spreadsheet_id,
+                        sheet,
+                        int(snapshot["width"]),
+                        json.dumps(snapshot["row_hashes"]),
+                    )
+                    for sheet, snapshot in snapshots.items()
+                ],
+            )
+            self.connection.commit()
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to save sheet snapshots for user %s: %s", user_id, error)
+
     def close(self) -> None:
         """Close database connection."""
 
         try:
-            self.connection.close()
+            self._connection.close()
             LOGGER.info("Database connection closed")
         except sqlite3.Error as error:
             LOGGER.error("Failed to close database connection: %s", error)
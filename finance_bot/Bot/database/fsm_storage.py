@@ -0,0 +1,189 @@
+"""SQLite-backed aiogram FSM storage with a bounded in-memory hot cache.
+
+States and data are written through to the ``состояния_диалогов`` table of
+the finance database, so multi-step flows survive a restart. Recently used
+keys are kept in an LRU cache; entries idle longer than ``cache_ttl`` or
+beyond ``cache_size`` are dropped from memory only. Rows not written for
+``state_ttl`` are removed from the table by :meth:`SQLiteStorage.purge_idle`.
+Keys whose state is cleared and data emptied are deleted rather than stored.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Mapping
+
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+from Bot.database.crud import TABLES
+
+LOGGER = logging.getLogger(__name__)
+
+FSM_CACHE_SIZE = 10_000
+FSM_CACHE_TTL = 15 * 60
+FSM_STATE_TTL = 30 * 24 * 3600
+
+
+def storage_key_id(key: StorageKey) -> str:
+    """Compact, stable text id for a StorageKey."""
+
+    return ":".join(
+        (
+            str(key.bot_id),
+            str(key.chat_id),
+            str(key.user_id),
+            "" if key.thread_id is None else str(key.thread_id),
+            key.business_connection_id or "",
+            key.destiny,
+        )
+    )
+
+
+def _dump_data(data: Mapping[str, Any]) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")) if data else ""
+
+
+def _load_data(raw: str | None) -> dict[str, Any]:
+    return json.loads(raw) if raw else {}
+
+
+class _Entry:
+    __slots__ = ("state", "data", "touched")
+
+    def __init__(self, state: str | None, data: dict[str, Any], touched: float) -> None:
+        self.state = state
+        self.data = data
+        self.touched = touched
+
+
+class SQLiteStorage(BaseStorage):
+    """FSM storage persisted in the finance database (``db.connection``)."""
+
+    def __init__(
+        self,
+        db,
+        *,
+        cache_size: int = FSM_CACHE_SIZE,
+        cache_ttl: float = FSM_CACHE_TTL,
+        state_ttl: float = FSM_STATE_TTL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._db = db
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.state_ttl = state_ttl
+        self._clock = clock
+        self._cache: OrderedDict[str, _Entry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # ── cache ─────────────────────────────────────────────
+
+    def _evict(self, now: float) -> None:
+        cutoff = now - self.cache_ttl
+        while self._cache:
+            oldest = next(iter(self._cache.values()))
+            if len(self._cache) <= self.cache_size and oldest.touched >= cutoff:
+                break
+            self._cache.popitem(last=False)
+
+    def _entry(self, key: StorageKey) -> _Entry:
+        key_id = storage_key_id(key)
+        now = self._clock()
+        entry = self._cache.get(key_id)
+        if entry is not None:
+            self.hits += 1
+            entry.touched = now
+            self._cache.move_to_end(key_id)
+            self._evict(now)
+            return entry
+        self.misses += 1
+        state, data = None, {}
+        try:
+            cursor = self._db.connection.cursor()
+            cursor.execute(
+                f'SELECT state, data FROM "{TABLES.fsm_states}" WHERE key = ?', (key_id,)
+            )
+            row = cursor.fetchone()
+            if row is not None:
+                state, data = row[0], _load_data(row[1])
+        except (sqlite3.Error, ValueError) as error:
+            LOGGER.error("Failed to load FSM state %s: %s", key_id, error)
+        entry = _Entry(state, data, now)
+        self._cache[key_id] = entry
+        self._evict(now)
+        return entry
+
+    def _persist(self, key: StorageKey, entry: _Entry) -> None:
+        key_id = storage_key_id(key)
+        try:
+            cursor = self._db.connection.cursor()
+            if entry.state is None and not entry.data:
+                cursor.execute(f'DELETE FROM "{TABLES.fsm_states}" WHERE key = ?', (key_id,))
+            else:
+                cursor.execute(
+                    f"""
+                    INSERT INTO "{TABLES.fsm_states}" (key, state, data, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        state = excluded.state,
+                        data = excluded.data,
+                        updated_at = excluded.updated_at
+                    """,
+                    (key_id, entry.state, _dump_data(entry.data), int(entry.touched)),
+                )
+            self._db.connection.commit()
+        except (sqlite3.Error, TypeError, ValueError) as error:
+            # The cached copy stays authoritative until the key is evicted.
+            LOGGER.error("Failed to persist FSM state %s: %s", key_id, error)
+
+    # ── BaseStorage ───────────────────────────────────────
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        entry = self._entry(key)
+        entry.state = state.state if isinstance(state, State) else state
+        self._persist(key, entry)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        return self._entry(key).state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            msg = f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            raise DataNotDictLikeError(msg)
+        entry = self._entry(key)
+        entry.data = data.copy()
+        self._persist(key, entry)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        return self._entry(key).data.copy()
+
+    async def close(self) -> None:
+        self._cache.clear()
+
+    # ── maintenance ───────────────────────────────────────
+
+    def purge_idle(self, now: float | None = None) -> int:
+        """Delete rows not written for ``state_ttl`` seconds; returns how many."""
+
+        now = self._clock() if now is None else now
+        cutoff = int(now - self.state_ttl)
+        try:
+            cursor = self._db.connection.cursor()
+            cursor.execute(f'DELETE FROM "{TABLES.fsm_states}" WHERE updated_at < ?', (cutoff,))
+            self._db.connection.commit()
+        except sqlite3.Error as error:
+            LOGGER.error("Failed to purge idle FSM states: %s", error)
+            return 0
+        stale = [key_id for key_id, entry in self._cache.items() if entry.touched < cutoff]
+        for key_id in stale:
+            del self._cache[key_id]
+        return cursor.rowcount
+
+    def stats(self) -> dict[str, int]:
+        return {"cached": len(self._cache), "hits": self.hits, "misses": self.misses}
@@ -1,9 +1,11 @@
 """Database accessor for a shared FinanceDatabase instance."""
 from __future__ import annotations
 
+from Bot.database.async_db import AsyncFinanceDatabase
 from Bot.database.crud import FinanceDatabase
 
 _DB_INSTANCE: FinanceDatabase | None = None
+_ASYNC_DB_INSTANCE: AsyncFinanceDatabase | None = None
 
 
 def get_db() -> FinanceDatabase:
@@ -11,3 +13,17 @@ def get_db() -> FinanceDatabase:
     if _DB_INSTANCE is None:
         _DB_INSTANCE = FinanceDatabase()
     return _DB_INSTANCE
+
+
+def get_async_db() -> AsyncFinanceDatabase:
+    global _ASYNC_DB_INSTANCE
+    if _ASYNC_DB_INSTANCE is None:
+        _ASYNC_DB_INSTANCE = AsyncFinanceDatabase(get_db())
+    return _ASYNC_DB_INSTANCE
+
+
+async def close_async_db() -> None:
+    global _ASYNC_DB_INSTANCE
+    if _ASYNC_DB_INSTANCE is not None:
+        await _ASYNC_DB_INSTANCE.close()
+        _ASYNC_DB_INSTANCE = None
@@ -0,0 +1,79 @@
+"""Offline maintenance commands for the finance database.
+
+Usage (from ``finance_bot``)::
+
+    python -m Bot.database.maintenance rebuild-totals [--user-id ID]
+    python -m Bot.database.maintenance purge-byt [--dry-run] [--batch-size N]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+
+from Bot.database.get_db import get_db
+from Bot.services.retention_service import PURGE_BATCH_SIZE, purge_expired_byt
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _rebuild_totals(args: argparse.Namespace) -> int:
+    db = get_db()
+    started = time.perf_counter()
+    rows = db.rebuild_monthly_totals(args.user_id)
+    if rows < 0:
+        print("rebuild failed, see log", file=sys.stderr)
+        return 1
+    scope = "all users" if args.user_id is None else f"user {args.user_id}"
+    print(f"rebuilt {rows} monthly total rows for {scope} in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+def _purge_byt(args: argparse.Namespace) -> int:
+    result = asyncio.run(
+        purge_expired_byt(
+            get_db(),
+            datetime.now(timezone.utc),
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+            pause=0,
+        )
+    )
+    verb = "would delete" if result.dry_run else "deleted"
+    print(
+        f"{verb} {result.purchases} purchases and {result.wishes} wishes "
+        f"across {result.targets} BYT categories in {result.duration:.2f}s"
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Finance database maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser(
+        "rebuild-totals", help="recompute the monthly rollup from history"
+    )
+    rebuild.add_argument("--user-id", type=int, default=None)
+    rebuild.set_defaults(handler=_rebuild_totals)
+
+    purge = commands.add_parser(
+        "purge-byt", help="delete expired BYT purchases and purchased wishes"
+    )
+    purge.add_argument("--dry-run", action="store_true", help="only count expired rows")
+    purge.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+    purge.set_defaults(handler=_purge_byt)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -519,18 +519,9 @@ async def handle_category_confirmation(query: CallbackQuery, state: FSMContext)
         await state.clear()
         return
 
-    current = allocations[index]
-
     # --- Пользователь нажал "Да" ---
     if query.data == "confirm_yes":
-        # Обновляем накопления
-        get_db().update_saving(
-            user_id=query.from_user.id if query.from_user else None,
-            category=current["category"],
-            amount_delta=current["amount"],
-        )
-
-        # Переходим к следующей категории
+        # Накопления зачисляются одной транзакцией после последней категории
         index += 1
 
     # --- Пользователь нажал "Нет" ---
@@ -549,6 +540,10 @@ async def handle_category_confirmation(query: CallbackQuery, state: FSMContext)
             allocation=next_allocation,
         )
     else:
+        get_db().distribute_income(
+            query.from_user.id if query.from_user else None,
+            [(item["category"], item["amount"]) for item in allocations],
+        )
         try:
             await query.message.edit_reply_markup(reply_markup=None)
         except Exception:
@@ -5,6 +5,8 @@ from __future__ import annotations
 import logging
 import random
 from datetime import datetime
+from functools import partial
+from typing import Awaitable, Callable
 
 from aiogram import Bot, F, Router
 from aiogram.fsm.context import FSMContext
@@ -30,7 +32,9 @@ from Bot.services.reminder_service import (
     schedule_snooze,
     should_fire_at,
 )
+from Bot.services.reminder_index import ReminderIndex
 from Bot.services.types import ServiceError
+from Bot.utils.send_queue import OutboundSender
 from Bot.utils.telegram_safe import (
     safe_callback_answer,
     safe_edit_message_text,
@@ -217,11 +221,51 @@ async def handle_snooze_back(callback: CallbackQuery, state: FSMContext) -> None
 # ------------------------------------------------------------------ #
 
 
-async def _send_motivation_content(
-    bot: Bot, db, user_id: int, reminder: dict, event_id: int,
+async def _deliver(
+    bot: Bot,
+    user_id: int,
+    text: str,
+    keyboard,
+    on_failure: Callable[[], None],
+    *,
+    sender: OutboundSender | None = None,
+    media_call: Callable[[], Awaitable] | None = None,
 ) -> bool:
-    """Send a motivation content item (text/photo/video/animation) with Seen button."""
-    keyboard = reminder_action_keyboard_motivation(event_id)
+    """Send now, or enqueue on ``sender``; ``on_failure`` runs if it is not delivered.
+
+    The slot was already claimed (and counted as shown) by
+    ``claim_reminder_slot``; ``on_failure`` takes the count back. With a
+    sender the result only means "queued" and ``on_failure`` runs in the
+    sender's worker once it gives up.
+    """
+    if sender is not None:
+        if media_call is not None:
+            await sender.submit(user_id, media_call, on_failure=on_failure)
+        else:
+            await sender.send_message(
+                user_id, text, reply_markup=keyboard, on_failure=on_failure,
+            )
+        return True
+
+    if media_call is not None:
+        try:
+            sent = await media_call()
+        except Exception:
+            on_failure()
+            raise
+    else:
+        sent = await safe_send_message(
+            bot, user_id, text, reply_markup=keyboard, logger=LOGGER,
+        )
+    if not sent:
+        on_failure()
+    return bool(sent)
+
+
+def _motivation_media_call(
+    bot: Bot, user_id: int, reminder: dict, keyboard,
+) -> Callable[[], Awaitable] | None:
+    """Return a deferred media send for a motivation item, or None for text."""
     media_type = reminder.get("media_type")
     media_ref = reminder.get("media_ref")
     caption = reminder.get("title", "")
@@ -229,28 +273,44 @@ async def _send_motivation_content(
     if body_text and body_text != "__meta__":
         caption = body_text
 
+    if media_type == "photo" and media_ref:
+        return lambda: bot.send_photo(
+            user_id, photo=media_ref, caption=caption,
+            reply_markup=keyboard, parse_mode="HTML",
+        )
+    if media_type == "video" and media_ref:
+        return lambda: bot.send_video(
+            user_id, video=media_ref, caption=caption,
+            reply_markup=keyboard, parse_mode="HTML",
+        )
+    if media_type == "animation" and media_ref:
+        return lambda: bot.send_animation(
+            user_id, animation=media_ref, caption=caption,
+            reply_markup=keyboard, parse_mode="HTML",
+        )
+    return None
+
+
+def _unshown_stat(db, user_id: int, now_dt: datetime, category: str) -> Callable[[], None]:
+    """Compensation for a claimed slot whose message was never delivered."""
+    return partial(
+        db.increment_reminder_stat,
+        user_id, now_dt.date().isoformat(), category, "shown_count", -1,
+    )
+
+
+async def _send_motivation_content(
+    bot: Bot, db, user_id: int, reminder: dict, event_id: int,
+    on_failure: Callable[[], None], *, sender: OutboundSender | None = None,
+) -> bool:
+    """Send a motivation content item (text/photo/video/animation) with Seen button."""
+    keyboard = reminder_action_keyboard_motivation(event_id)
     try:
-        if media_type == "photo" and media_ref:
-            sent = await bot.send_photo(
-                user_id, photo=media_ref, caption=caption,
-                reply_markup=keyboard, parse_mode="HTML",
-            )
-        elif media_type == "video" and media_ref:
-            sent = await bot.send_video(
-                user_id, video=media_ref, caption=caption,
-                reply_markup=keyboard, parse_mode="HTML",
-            )
-        elif media_type == "animation" and media_ref:
-            sent = await bot.send_animation(
-                user_id, animation=media_ref, caption=caption,
-                reply_markup=keyboard, parse_mode="HTML",
-            )
-        else:
-            text = format_reminder_text(reminder)
-            sent = await safe_send_message(
-                bot, user_id, text, reply_markup=keyboard, logger=LOGGER,
-            )
-        return bool(sent)
+        return await _deliver(
+            bot, user_id, format_reminder_text(reminder), keyboard, on_failure,
+            sender=sender,
+            media_call=_motivation_media_call(bot, user_id, reminder, keyboard),
+        )
     except Exception as exc:  # noqa: BLE001
         LOGGER.error(
             "USER=%s ACTION=MOTIVATION_SEND_ERROR META=reminder_id=%s error=%s",
@@ -282,45 +342,92 @@ async def run_reminder_check(
         if not should_fire_at(schedule, time_label, now_dt):
             continue
 
-        callback_hash = build_callback_hash(
-            reminder["id"], user_id, now_dt.isoformat()
-        )
-        existing = db.get_reminder_event_by_hash(callback_hash)
-        if existing:
-            continue
+        await _fire_reminder(bot, db, user_id, reminder, now_dt)
 
-        event_id = db.record_reminder_event(
-            reminder["id"], user_id, "shown", now_dt.isoformat(),
-            callback_hash=callback_hash,
-        )
-        if not event_id:
-            continue
 
-        LOGGER.info(
-            "USER=%s ACTION=REMINDER_SHOWN META=reminder_id=%s event_id=%s cat=%s",
-            user_id, reminder["id"], event_id, category,
+async def _fire_reminder(
+    bot: Bot, db, user_id: int, reminder: dict, now_dt: datetime,
+    *, sender: OutboundSender | None = None,
+) -> bool:
+    """Record and send one due (non-motivation) reminder. Returns True if sent or queued."""
+    category = reminder.get("category", "habits")
+    callback_hash = build_callback_hash(
+        reminder["id"], user_id, now_dt.isoformat()
+    )
+    event_id = db.claim_reminder_slot(
+        reminder["id"], user_id, now_dt.isoformat(), callback_hash, category,
+    )
+    if not event_id:
+        return False
+
+    LOGGER.info(
+        "USER=%s ACTION=REMINDER_SHOWN META=reminder_id=%s event_id=%s cat=%s",
+        user_id, reminder["id"], event_id, category,
+    )
+
+    text = format_reminder_text(reminder)
+    keyboard = reminder_action_keyboard_habits(event_id)
+
+    try:
+        return await _deliver(
+            bot, user_id, text, keyboard,
+            _unshown_stat(db, user_id, now_dt, category), sender=sender,
         )
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.error(
+            "USER=%s ACTION=REMINDER_SEND_ERROR META=reminder_id=%s error=%s",
+            user_id, reminder["id"], exc,
+        )
+        return False
 
-        text = format_reminder_text(reminder)
-        keyboard = reminder_action_keyboard_habits(event_id)
 
-        try:
-            sent = await safe_send_message(
-                bot, user_id, text, reply_markup=keyboard, logger=LOGGER,
+async def run_due_reminders(
+    bot: Bot, db, index: ReminderIndex, now_utc: datetime,
+    *, sender: OutboundSender | None = None,
+    owns: Callable[[int], bool] | None = None,
+    not_before: datetime | None = None,
+    on_missed: Callable[[], None] | None = None,
+) -> int:
+    """Fire every reminder the index reports as due. Returns how many were handled.
+
+    ``fire_at`` (the scheduled slot in the user's timezone) is used as the
+    reminder time, so a slightly late tick still records the intended slot.
+    With a ``sender`` the messages are queued, so the tick does not wait on
+    Telegram round-trips. ``owns`` restricts dispatch to this process's shards.
+    Slots older than ``not_before`` (outside the catch-up window) are dropped
+    and reported through ``on_missed``.
+    """
+    handled = 0
+    for due in index.pop_due(now_utc):
+        if owns is not None and not owns(due.user_id):
+            continue  # another scheduler process holds this user's shard
+        if not_before is not None and due.fire_at < not_before:
+            LOGGER.warning(
+                "REMINDER_SLOT_MISSED reminder_id=%s user_id=%s fire_at=%s",
+                due.reminder_id, due.user_id, due.fire_at.isoformat(),
             )
-            if sent:
-                db.increment_reminder_stat(
-                    user_id, now_dt.date().isoformat(), category, "shown_count"
-                )
-        except Exception as exc:  # noqa: BLE001
-            LOGGER.error(
-                "USER=%s ACTION=REMINDER_SEND_ERROR META=reminder_id=%s error=%s",
-                user_id, reminder["id"], exc,
+            if on_missed is not None:
+                on_missed()
+            continue
+        if due.category == "motivation":
+            await _run_motivation_check(
+                bot, db, due.user_id, due.fire_at, due.fire_at.strftime("%H:%M"),
+                sender=sender,
             )
+            handled += 1
+            continue
+
+        reminder = db.get_reminder(due.reminder_id)
+        if not reminder or not reminder.get("is_enabled"):
+            continue
+        await _fire_reminder(bot, db, due.user_id, reminder, due.fire_at, sender=sender)
+        handled += 1
+    return handled
 
 
 async def _run_motivation_check(
-    bot: Bot, db, user_id: int, now_dt: datetime, time_label: str
+    bot: Bot, db, user_id: int, now_dt: datetime, time_label: str,
+    *, sender: OutboundSender | None = None,
 ) -> None:
     """Check and send motivation content on schedule."""
     all_items = db.list_reminders_by_category(user_id, "motivation")
@@ -337,10 +444,7 @@ async def _run_motivation_check(
     if not should_fire_at(schedule, time_label, now_dt):
         return
 
-    # Idempotency: check if we already fired for this time slot
     sched_hash = build_callback_hash(meta["id"], user_id, now_dt.isoformat())
-    if db.get_reminder_event_by_hash(sched_hash):
-        return
 
     # Pick a random enabled content item
     content_items = [
@@ -352,41 +456,30 @@ async def _run_motivation_check(
 
     chosen = random.choice(content_items)
 
-    # Record event against the chosen content item
+    # Claim the schedule-level slot and the chosen item's event together;
+    # whoever loses either hash (another tick or process) sends nothing.
     callback_hash = build_callback_hash(chosen["id"], user_id, now_dt.isoformat())
-    event_id = db.record_reminder_event(
-        chosen["id"], user_id, "shown", now_dt.isoformat(),
-        callback_hash=callback_hash,
+    event_id = db.claim_reminder_slot(
+        chosen["id"], user_id, now_dt.isoformat(), callback_hash, "motivation",
+        slot=(meta["id"], sched_hash),
     )
     if not event_id:
-        # If hash collision (already sent this content at this time), record on meta for idempotency
-        db.record_reminder_event(
-            meta["id"], user_id, "shown", now_dt.isoformat(),
-            callback_hash=sched_hash,
-        )
         return
 
-    # Also record the schedule-level hash to prevent double-firing
-    if sched_hash != callback_hash:
-        db.record_reminder_event(
-            meta["id"], user_id, "shown", now_dt.isoformat(),
-            callback_hash=sched_hash,
-        )
-
     LOGGER.info(
         "USER=%s ACTION=MOTIVATION_SHOWN META=reminder_id=%s event_id=%s",
         user_id, chosen["id"], event_id,
     )
 
-    ok = await _send_motivation_content(bot, db, user_id, chosen, event_id)
-    if ok:
-        db.increment_reminder_stat(
-            user_id, now_dt.date().isoformat(), "motivation", "shown_count"
-        )
+    await _send_motivation_content(
+        bot, db, user_id, chosen, event_id,
+        _unshown_stat(db, user_id, now_dt, "motivation"), sender=sender,
+    )
 
 
 async def run_snooze_check(
-    bot: Bot, db, user_id: int, now_dt: datetime
+    bot: Bot, db, user_id: int, now_dt: datetime,
+    *, sender: OutboundSender | None = None,
 ) -> None:
     """Re-send reminders whose snooze has expired."""
     events = db.get_pending_snooze_events(user_id, now_dt.isoformat())
@@ -400,10 +493,10 @@ async def run_snooze_check(
         if not reminder or not reminder.get("is_enabled"):
             continue
 
+        category = reminder.get("category", "habits")
         new_hash = build_callback_hash(reminder_id, user_id, now_dt.isoformat())
-        new_event_id = db.record_reminder_event(
-            reminder_id, user_id, "shown", now_dt.isoformat(),
-            callback_hash=new_hash,
+        new_event_id = db.claim_reminder_slot(
+            reminder_id, user_id, now_dt.isoformat(), new_hash, category,
         )
         if not new_event_id:
             continue
@@ -413,22 +506,19 @@ async def run_snooze_check(
             user_id, reminder_id, new_event_id,
         )
 
-        category = reminder.get("category", "habits")
+        on_failure = _unshown_stat(db, user_id, now_dt, category)
 
         try:
             if category == "motivation":
-                sent = await _send_motivation_content(
-                    bot, db, user_id, reminder, new_event_id,
+                await _send_motivation_content(
+                    bot, db, user_id, reminder, new_event_id, on_failure,
+                    sender=sender,
                 )
             else:
                 text = format_reminder_text(reminder)
                 keyboard = reminder_action_keyboard_habits(new_event_id)
-                sent = await safe_send_message(
-                    bot, user_id, text, reply_markup=keyboard, logger=LOGGER,
-                )
-            if sent:
-                db.increment_reminder_stat(
-                    user_id, now_dt.date().isoformat(), category, "shown_count"
+                await _deliver(
+                    bot, user_id, text, keyboard, on_failure, sender=sender,
                 )
         except Exception as exc:  # noqa: BLE001
             LOGGER.error(
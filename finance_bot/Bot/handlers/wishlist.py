@@ -3,7 +3,7 @@
 import asyncio
 import logging
 from collections import defaultdict
-from datetime import datetime, time, timedelta
+from datetime import datetime, time, timedelta, timezone
 from typing import Optional
 
 from aiogram import Bot, F, Router
@@ -18,7 +18,7 @@ from aiogram.types import (
 )
 
 from Bot.config.settings import get_settings
-from Bot.database.crud import FinanceDatabase
+from Bot.database.crud import UTC_TIMESTAMP_FORMAT, FinanceDatabase
 from Bot.database.get_db import get_db
 from Bot.handlers.common import build_main_menu_for_user
 from Bot.constants.ui_labels import NAV_BACK, NAV_HOME
@@ -44,6 +44,7 @@ from Bot.utils.byt_render import (
 )
 from Bot.utils.messages import ERR_INVALID_INPUT
 from Bot.utils.number_input import parse_positive_int
+from Bot.utils.send_queue import OutboundSender
 from Bot.utils.telegram_safe import (
     safe_answer,
     safe_callback_answer,
@@ -61,6 +62,8 @@ DEFAULT_TZ = (
     if hasattr(get_settings().timezone, "key")
     else str(get_settings().timezone)
 )
+# Claimed BYT slots are kept this long; well past any scheduler catch-up window.
+BYT_SLOT_RETENTION = timedelta(days=2)
 
 
 async def _push_wl_step(state: FSMContext, step: str) -> None:
@@ -733,8 +736,14 @@ async def run_byt_timer_check(
     user_id: int | None = None,
     simulated_time: time | None = None,
     run_time: datetime | None = None,
+    sender: OutboundSender | None = None,
 ) -> None:
-    """Run BYT reminders using timer configuration for the user."""
+    """Run BYT reminders using timer configuration for the user.
+
+    With a ``sender`` the checklist is queued instead of sent inline.
+    Scheduled (non-simulated) runs claim each (user, category, minute)
+    slot first, so two schedulers processing the same minute send once.
+    """
 
     await asyncio.sleep(0)
     trigger_dt = run_time or now_for_user(db, user_id, DEFAULT_TZ)
@@ -789,7 +798,6 @@ async def run_byt_timer_check(
             if not should_run:
                 continue
 
-            db.cleanup_old_byt_purchases(uid, category_title, trigger_dt)
             total_items = db.get_active_byt_wishes(uid, category_title)
             due_items, deferred_items = get_byt_category_items(
                 db, uid, category_title, trigger_dt
@@ -815,6 +823,22 @@ async def run_byt_timer_check(
                 )
                 continue
 
+            if not simulated:
+                slot_utc = trigger_dt.astimezone(timezone.utc).replace(second=0, microsecond=0)
+                if not db.claim_byt_reminder_slot(
+                    uid,
+                    category_id,
+                    slot_utc.strftime(UTC_TIMESTAMP_FORMAT),
+                    (slot_utc - BYT_SLOT_RETENTION).strftime(UTC_TIMESTAMP_FORMAT),
+                ):
+                    LOGGER.info(
+                        "BYT timer: slot already sent category_id=%s user_id=%s time=%s",
+                        category_id,
+                        uid,
+                        trigger_label,
+                    )
+                    continue
+
             allow_defer = bool(settings_row.get("byt_defer_enabled", 1))
             text = format_byt_category_checklist_text(
                 category_title, due_items, deferred_items
@@ -822,7 +846,10 @@ async def run_byt_timer_check(
             keyboard = _build_byt_items_keyboard(
                 due_items, allow_defer=allow_defer, category_id=category_id
             )
-            await bot.send_message(uid, text, reply_markup=keyboard)
+            if sender is not None:
+                await sender.send_message(uid, text, reply_markup=keyboard)
+            else:
+                await bot.send_message(uid, text, reply_markup=keyboard)
             LOGGER.info(
                 "BYT timer: category_id=%s items=%s due=%s deferred=%s user_id=%s",
                 category_id,
@@ -3,7 +3,6 @@ import asyncio
 import contextlib
 import logging
 import sys
-from datetime import datetime
 from pathlib import Path
 
 project_root = Path(__file__).resolve().parent.parent
@@ -16,6 +15,7 @@ from aiogram.exceptions import TelegramUnauthorizedError
 from aiogram.types import BotCommand, MenuButtonWebApp, WebAppInfo
 
 from Bot.config.settings import get_settings
+from Bot.database.fsm_storage import SQLiteStorage
 from Bot.database.get_db import get_db
 from Bot.handlers import (
     callbacks,
@@ -29,10 +29,15 @@ from Bot.handlers import (
     voice_expense,
     wishlist,
 )
-from Bot.handlers.reminders import run_reminder_check, run_snooze_check
-from Bot.handlers.wishlist import run_byt_timer_check
+from Bot.scheduler import run_byt_scheduler, run_reminder_scheduler
+from Bot.services.recurring_service import run_recurring_loop
+from Bot.services.report_delivery import run_report_loop
+from Bot.services.retention_service import run_retention_loop
+from Bot.services.scheduler_leases import ShardLeases
 from Bot.utils.logging import init_logging
-from Bot.utils.time import now_for_user
+from Bot.utils.message_cleanup import configure_message_cleaner
+from Bot.utils.send_queue import OutboundSender
+from Bot.utils.ui_state import UiStateMiddleware
 
 
 def register_routers(dispatcher: Dispatcher) -> None:
@@ -76,40 +81,6 @@ def _format_token_context(token_source: str, fingerprint: str, env_path: Path) -
     return f"token_source={token_source}, fingerprint={fingerprint}"
 
 
-async def _run_byt_scheduler(bot: Bot, db, default_tz: str) -> None:
-    """Background scheduler for BYT reminders."""
-
-    while True:
-        user_ids = set(db.get_users_with_byt_reminder_times()) | set(
-            db.get_users_with_active_byt_wishes()
-        )
-        now_values: dict[int, datetime] = {}
-        for uid in user_ids:
-            now_values[uid] = now_for_user(db, uid, default_tz)
-            await run_byt_timer_check(bot, db, user_id=uid, run_time=now_values[uid])
-        reference = now_values[min(now_values)] if now_values else now_for_user(db, 0, default_tz)
-        sleep_for = 60 - reference.second - reference.microsecond / 1_000_000
-        await asyncio.sleep(max(sleep_for, 1))
-
-
-async def _run_reminder_scheduler(bot: Bot, db, default_tz: str) -> None:
-    """Background scheduler for scheduled reminders (habits, food, motivation)."""
-
-    while True:
-        try:
-            user_ids = db.get_users_with_active_reminders()
-            for uid in user_ids:
-                now_dt = now_for_user(db, uid, default_tz)
-                for category in ("habits", "food", "motivation", "wishlist"):
-                    await run_reminder_check(bot, db, uid, category, now_dt)
-                await run_snooze_check(bot, db, uid, now_dt)
-        except Exception as exc:  # noqa: BLE001
-            logging.getLogger(__name__).error("Reminder scheduler error: %s", exc)
-        reference = now_for_user(db, 0, default_tz)
-        sleep_for = 60 - reference.second - reference.microsecond / 1_000_000
-        await asyncio.sleep(max(sleep_for, 1))
-
-
 async def main() -> None:
     """Run bot polling."""
 
@@ -131,9 +102,11 @@ async def main() -> None:
         token=token,
         default=DefaultBotProperties(parse_mode="HTML"),
     )
-    dp = Dispatcher()
-
     db = get_db()
+    fsm_storage = SQLiteStorage(db)
+    dp = Dispatcher(storage=fsm_storage)
+    # Registered after aiogram's FSM middleware, so it wraps the resolved state.
+    dp.update.outer_middleware(UiStateMiddleware())
     register_routers(dp)
 
     try:
@@ -168,12 +141,21 @@ async def main() -> None:
             logger.info("Menu button set to Mini App: %s", settings.webapp_url)
         except Exception as exc:  # noqa: BLE001
             logger.warning("Failed to set menu button: %s", exc)
+    sender = OutboundSender(bot)
+    sender.start()
+    # UI cleanups share the sender's global rate limit.
+    configure_message_cleaner(sender.bucket)
+    # Standby: dispatches only shards no ``python -m Bot.scheduler`` worker holds.
+    leases = ShardLeases(db, shards=settings.scheduler_shards)
     reminder_task = asyncio.create_task(
-        _run_byt_scheduler(bot, db, tz_str)
+        run_byt_scheduler(bot, db, tz_str, sender, leases)
     )
     general_reminder_task = asyncio.create_task(
-        _run_reminder_scheduler(bot, db, tz_str)
+        run_reminder_scheduler(bot, db, tz_str, sender, leases)
     )
+    retention_task = asyncio.create_task(run_retention_loop(db, fsm_storage=fsm_storage))
+    recurring_task = asyncio.create_task(run_recurring_loop(db, leases=leases))
+    report_task = asyncio.create_task(run_report_loop(db, sender, tz_str, leases=leases))
     try:
         logger.info(
             "Starting bot polling (%s)",
@@ -192,10 +174,21 @@ async def main() -> None:
     finally:
         reminder_task.cancel()
         general_reminder_task.cancel()
+        retention_task.cancel()
+        recurring_task.cancel()
+        report_task.cancel()
         with contextlib.suppress(asyncio.CancelledError):
             await reminder_task
         with contextlib.suppress(asyncio.CancelledError):
             await general_reminder_task
+        with contextlib.suppress(asyncio.CancelledError):
+            await retention_task
+        with contextlib.suppress(asyncio.CancelledError):
+            await recurring_task
+        with contextlib.suppress(asyncio.CancelledError):
+            await report_task
+        leases.release()
+        await sender.stop(drain=False)
         await bot.session.close()
         logger.info("Bot shutdown complete")
 
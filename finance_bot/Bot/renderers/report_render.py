@@ -0,0 +1,50 @@
+"""Rendering helpers for monthly reports."""
+
+from __future__ import annotations
+
+import html
+
+
+def _format_amount(value: float) -> str:
+    return f"{float(value):,.2f}".replace(",", " ")
+
+
+def _category_lines(items: list[dict]) -> list[str]:
+    ordered = sorted(items, key=lambda item: -float(item.get("amount", 0)))
+    return [
+        f"• {html.escape(str(item.get('category') or '—'))}: {_format_amount(item.get('amount', 0))}"
+        for item in ordered
+    ]
+
+
+def is_empty_monthly_report(data: dict) -> bool:
+    """True when a month has no income, expenses or household payments."""
+    return not (
+        data.get("total_income")
+        or data.get("total_expense")
+        or data.get("household_total")
+    )
+
+
+def format_monthly_report(data: dict) -> str:
+    """Format ``get_monthly_report_data`` output as a chat message."""
+    income = float(data.get("total_income", 0))
+    expense = float(data.get("total_expense", 0))
+    lines = [
+        f"📊 <b>Отчёт за {html.escape(str(data.get('month', '')))}</b>",
+        "",
+        f"Доход: {_format_amount(income)}",
+        f"Расходы: {_format_amount(expense)}",
+        f"Баланс: {_format_amount(income - expense)}",
+    ]
+    if data.get("income_by_category"):
+        lines += ["", "<b>Доходы по категориям</b>", *_category_lines(data["income_by_category"])]
+    if data.get("expense_by_category"):
+        lines += ["", "<b>Расходы по категориям</b>", *_category_lines(data["expense_by_category"])]
+    if data.get("household_total"):
+        lines += [
+            "",
+            f"Бытовые платежи: {_format_amount(data.get('household_paid', 0))}"
+            f" из {_format_amount(data['household_total'])}",
+        ]
+    return "\n".join(lines)
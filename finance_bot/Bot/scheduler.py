@@ -0,0 +1,265 @@
+"""Reminder schedulers, in the bot process or as dedicated worker processes.
+
+The polling bot runs both loops as a standby: it only takes shards whose
+lease has expired. ``python -m Bot.scheduler --workers N`` starts N worker
+processes that reclaim their own shards (see ``scheduler_leases``), so
+dispatch scales across cores and carries on while the bot restarts.
+Duplicate sends during a hand-over, while the previous holder still acts
+on its cached shard set, are prevented by per-slot claims: the unique
+reminder event hash (``claim_reminder_slot``) and the BYT
+(user, category, minute) claim (``claim_byt_reminder_slot``).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import sys
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+
+from Bot.config.settings import get_settings
+from Bot.database.get_db import get_db
+from Bot.handlers.reminders import run_due_reminders, run_snooze_check
+from Bot.handlers.wishlist import run_byt_timer_check
+from Bot.services.recurring_service import run_recurring_loop
+from Bot.services.reminder_index import ReminderIndex
+from Bot.services.report_delivery import run_report_loop
+from Bot.services.scheduler_leases import ShardLeases, shard_of
+from Bot.services.tick_clock import TickClock
+from Bot.utils.logging import init_logging
+from Bot.utils.send_queue import OutboundSender
+from Bot.utils.time import get_user_timezone, now_for_user
+
+LOGGER = logging.getLogger(__name__)
+
+
+async def run_byt_scheduler(
+    bot: Bot,
+    db,
+    default_tz: str,
+    sender: OutboundSender | None = None,
+    leases: ShardLeases | None = None,
+    clock: TickClock | None = None,
+) -> None:
+    """Background scheduler for BYT reminders.
+
+    Every minute since the last processed one (within the catch-up window)
+    is checked, so a slow tick or a restart does not skip a timer slot.
+    """
+
+    shards = leases.shards if leases is not None else 1
+    clock = clock or TickClock(
+        "byt",
+        db,
+        shards=shards,
+        catch_up_minutes=get_settings().scheduler_catch_up_minutes,
+    )
+    while True:
+        try:
+            owned = None
+            if leases is not None:
+                owned = leases.refresh()
+            pending = clock.pending(owned)
+            user_ids: set[int] = set()
+            if pending:
+                user_ids = set(db.get_users_with_byt_reminder_times()) | set(
+                    db.get_users_with_active_byt_wishes()
+                )
+                if leases is not None:
+                    # Drop other workers' users before any per-user work.
+                    user_ids = {uid for uid in user_ids if shard_of(uid, shards) in owned}
+            zones: dict[int, ZoneInfo] = {}
+            for minute_utc, due_shards in pending:
+                for uid in user_ids:
+                    if leases is not None and shard_of(uid, shards) not in due_shards:
+                        continue
+                    if uid not in zones:
+                        zones[uid] = ZoneInfo(get_user_timezone(db, uid, default_tz))
+                    await run_byt_timer_check(
+                        bot,
+                        db,
+                        user_id=uid,
+                        run_time=minute_utc.astimezone(zones[uid]),
+                        sender=sender,
+                    )
+                clock.mark(minute_utc, due_shards)
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.error("BYT scheduler error: %s", exc)
+        await clock.sleep_until_next_minute()
+
+
+async def run_reminder_scheduler(
+    bot: Bot,
+    db,
+    default_tz: str,
+    sender: OutboundSender | None = None,
+    leases: ShardLeases | None = None,
+    clock: TickClock | None = None,
+) -> None:
+    """Background scheduler for scheduled reminders (habits, food, motivation).
+
+    Due reminders come from a ReminderIndex kept in sync through database
+    listeners and, for writes from other processes, the reminder change log
+    read at the start of every tick, so a tick only touches reminders whose
+    slot has arrived.
+    Messages go through ``sender`` so a large fan-out does not stall the tick.
+    With ``leases`` the index only holds users of the held shards and is
+    rebuilt whenever that set changes. Minutes missed since the last tick
+    (or the last run) are replayed by rebuilding the index from the oldest
+    unprocessed minute.
+    """
+
+    shards = leases.shards if leases is not None else 1
+    clock = clock or TickClock(
+        "reminders",
+        db,
+        shards=shards,
+        catch_up_minutes=get_settings().scheduler_catch_up_minutes,
+    )
+    index = ReminderIndex(db, default_tz)
+    db.add_reminder_listener(index.on_change)
+    popped_through: datetime | None = None
+    indexed_shards: frozenset[int] | None = None
+    try:
+        while True:
+            try:
+                owned = None
+                if leases is not None:
+                    owned = leases.refresh()
+                    if owned != indexed_shards:
+                        indexed_shards = owned
+                        index.owns = lambda uid, held=owned: shard_of(uid, shards) in held
+                        popped_through = None  # forces a rebuild
+                pending = clock.pending(owned)
+                if pending and (
+                    index.needs_rebuild()
+                    or popped_through is None
+                    or pending[0][0] <= popped_through
+                ):
+                    index.rebuild(pending[0][0])
+                elif pending:
+                    index.apply_changes(pending[0][0])
+                for minute_utc, due_shards in pending:
+                    owns = None
+                    if leases is not None:
+                        owns = lambda uid, due=due_shards: shard_of(uid, shards) in due
+                    await run_due_reminders(
+                        bot,
+                        db,
+                        index,
+                        minute_utc,
+                        sender=sender,
+                        owns=owns,
+                        not_before=clock.earliest(),
+                        on_missed=clock.missed_slot,
+                    )
+                    clock.mark(minute_utc, due_shards)
+                    popped_through = minute_utc
+                for uid in db.get_users_with_pending_snoozes():
+                    if leases is not None and not leases.owns(uid):
+                        continue
+                    now_dt = now_for_user(db, uid, default_tz)
+                    await run_snooze_check(bot, db, uid, now_dt, sender=sender)
+            except Exception as exc:  # noqa: BLE001
+                LOGGER.error("Reminder scheduler error: %s", exc)
+            await clock.sleep_until_next_minute()
+    finally:
+        db.remove_reminder_listener(index.on_change)
+
+
+async def run_worker(worker_index: int, workers: int, shards: int) -> None:
+    """Run the scheduler loops for the shards owned by ``worker_index``."""
+
+    init_logging()
+    settings = get_settings()
+    token = (settings.bot_token or "").strip()
+    if not token:
+        LOGGER.error("BOT_TOKEN пустой или не загружен, планировщик не запущен")
+        return
+    tz_str = settings.timezone.key if hasattr(settings.timezone, "key") else str(settings.timezone)
+
+    bot = Bot(token=token, default=DefaultBotProperties(parse_mode="HTML"))
+    db = get_db()
+    leases = ShardLeases(db, shards=shards, workers=workers, worker_index=worker_index)
+    leases.refresh(force=True)
+    sender = OutboundSender(bot)
+    sender.start()
+    tasks = [
+        asyncio.create_task(run_byt_scheduler(bot, db, tz_str, sender, leases)),
+        asyncio.create_task(run_reminder_scheduler(bot, db, tz_str, sender, leases)),
+        asyncio.create_task(run_recurring_loop(db, leases=leases)),
+        asyncio.create_task(run_report_loop(db, sender, tz_str, leases=leases)),
+    ]
+    LOGGER.info("Scheduler worker %s/%s started (shards=%s)", worker_index, workers, shards)
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        leases.release()
+        await sender.stop(drain=False)
+        await bot.session.close()
+        LOGGER.info("Scheduler worker %s stopped", worker_index)
+
+
+def _worker_entry(worker_index: int, workers: int, shards: int) -> None:
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(run_worker(worker_index, workers, shards))
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run reminder scheduler workers.")
+    parser.add_argument("--workers", type=int, default=settings.scheduler_shards)
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=settings.scheduler_shards,
+        help="user partitions; must match SCHEDULER_SHARDS of the bot",
+    )
+    parser.add_argument(
+        "--worker-index", type=int, default=None, help="run only this worker in-process"
+    )
+    args = parser.parse_args()
+    workers = max(1, args.workers)
+    shards = max(1, args.shards)
+    if workers > shards:
+        parser.error("--workers cannot exceed --shards")
+
+    if args.worker_index is not None:
+        _worker_entry(args.worker_index, workers, shards)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=_worker_entry, args=(index, workers, shards), name=f"scheduler-{index}"
+        )
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
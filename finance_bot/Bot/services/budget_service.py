@@ -0,0 +1,83 @@
+"""Budget period resolution for budget status queries."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+from Bot.services.types import ServiceError
+
+BUDGET_PERIODS = ("month", "week", "rolling30", "custom")
+ROLLING_DAYS = 30
+
+
+@dataclass(frozen=True)
+class BudgetPeriod:
+    """Half-open ``[start, end)`` window; ``month`` is set for calendar months."""
+
+    start: date
+    end: date
+    month: tuple[int, int] | None = None
+
+    @property
+    def limit_factor(self) -> float:
+        """Monthly budget limits covered by the window, prorated per calendar month.
+
+        A whole month counts 1; a partial one counts its share of days, so
+        a week in March is 7/31 and three whole months are 3.
+        """
+
+        factor = 0.0
+        cursor = self.start
+        while cursor < self.end:
+            following = date(cursor.year + cursor.month // 12, cursor.month % 12 + 1, 1)
+            month_days = (following - date(cursor.year, cursor.month, 1)).days
+            factor += (min(following, self.end) - cursor).days / month_days
+            cursor = following
+        return factor
+
+    @property
+    def start_iso(self) -> str:
+        return datetime.combine(self.start, time.min).isoformat()
+
+    @property
+    def end_iso(self) -> str:
+        return datetime.combine(self.end, time.min).isoformat()
+
+
+def resolve_budget_period(
+    period: str,
+    today: date,
+    *,
+    year: int | None = None,
+    month: int | None = None,
+    start: date | None = None,
+    end: date | None = None,
+) -> BudgetPeriod | ServiceError:
+    """Turn a period name into a date window.
+
+    ``month`` uses ``year``/``month`` (default: the month of ``today``),
+    ``week`` is the Monday-based week containing ``today``, ``rolling30``
+    is the last 30 days including today and ``custom`` needs ``start`` and
+    ``end`` (both inclusive).
+    """
+
+    if period == "month":
+        year = year or today.year
+        month = month or today.month
+        if not 1 <= month <= 12:
+            return ServiceError(code="invalid_period", message="Month must be 1-12")
+        first = date(year, month, 1)
+        following = date(year + month // 12, month % 12 + 1, 1)
+        return BudgetPeriod(first, following, month=(year, month))
+    if period == "week":
+        monday = today - timedelta(days=today.weekday())
+        return BudgetPeriod(monday, monday + timedelta(days=7))
+    if period == "rolling30":
+        return BudgetPeriod(today - timedelta(days=ROLLING_DAYS - 1), today + timedelta(days=1))
+    if period == "custom":
+        if start is None or end is None:
+            return ServiceError(code="invalid_period", message="Custom period needs start and end")
+        if end < start:
+            return ServiceError(code="invalid_period", message="Period end is before start")
+        return BudgetPeriod(start, end + timedelta(days=1))
+    return ServiceError(code="invalid_period", message=f"Unknown period: {period}")
@@ -41,7 +41,6 @@ def build_manual_check_summary(
         title = str(category.get("title", ""))
         if not title:
             continue
-        db.cleanup_old_byt_purchases(user_id, title, trigger_dt)
         due_items, deferred_items = get_byt_category_items(db, user_id, title, trigger_dt)
         categories.append(title)
         total += len(due_items) + len(deferred_items)
@@ -0,0 +1,120 @@
+"""Background posting of due recurring payments.
+
+Each pass reads due rows across all users from the (is_active,
+next_due_date) index in batches, so its cost follows the number of due
+payments rather than the number of users. A batch logs one expense per
+missed period and advances ``next_due_date`` in the same transaction,
+which makes catching up after downtime safe to interrupt and to run from
+several processes.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timezone
+
+LOGGER = logging.getLogger(__name__)
+
+RECURRING_BATCH_SIZE = 200
+RECURRING_BATCH_PAUSE = 0.05
+RECURRING_INTERVAL_SECONDS = 600
+# Only the process holding this shard runs the pass; the rest stay idle.
+RECURRING_SHARD = 0
+
+
+@dataclass
+class RecurringResult:
+    """Payments advanced and expenses posted by one pass."""
+
+    payments: int = 0
+    expenses: int = 0
+    batches: int = 0
+    duration: float = 0.0
+
+
+@dataclass
+class RecurringMetrics:
+    """Running totals of the recurring payments job since process start."""
+
+    runs: int = 0
+    failures: int = 0
+    payments: int = 0
+    expenses: int = 0
+    last_run_at: str | None = None
+    last_duration: float = 0.0
+
+    def record(self, result: RecurringResult, finished_at: datetime) -> None:
+        self.runs += 1
+        self.last_run_at = finished_at.isoformat()
+        self.last_duration = result.duration
+        self.payments += result.payments
+        self.expenses += result.expenses
+
+    def snapshot(self) -> dict:
+        return asdict(self)
+
+
+RECURRING_METRICS = RecurringMetrics()
+
+
+async def post_due_recurring(
+    db,
+    today: date,
+    *,
+    batch_size: int = RECURRING_BATCH_SIZE,
+    pause: float = RECURRING_BATCH_PAUSE,
+) -> RecurringResult:
+    """Post every recurring payment due on or before ``today``."""
+
+    started = time.perf_counter()
+    result = RecurringResult()
+    while True:
+        batch = db.post_due_recurring_payments(today, batch_size)
+        if batch["payments"]:
+            result.batches += 1
+        result.payments += batch["payments"]
+        result.expenses += batch["expenses"]
+        # A short batch drained the range; an empty one holds only rows
+        # with impossible dates (e.g. 2026-02-31), which would be selected
+        # again forever.
+        if batch["selected"] < batch_size or not batch["payments"]:
+            break
+        await asyncio.sleep(pause)
+    result.duration = time.perf_counter() - started
+    LOGGER.info(
+        "RECURRING_POST today=%s payments=%s expenses=%s batches=%s duration=%.3fs",
+        today.isoformat(),
+        result.payments,
+        result.expenses,
+        result.batches,
+        result.duration,
+    )
+    return result
+
+
+async def run_recurring_loop(
+    db,
+    *,
+    leases=None,
+    interval: float = RECURRING_INTERVAL_SECONDS,
+    batch_size: int = RECURRING_BATCH_SIZE,
+    metrics: RecurringMetrics = RECURRING_METRICS,
+) -> None:
+    """Run :func:`post_due_recurring` every ``interval`` seconds until cancelled.
+
+    With ``leases`` the pass only runs while this process holds
+    ``RECURRING_SHARD``.
+    """
+
+    while True:
+        try:
+            if leases is None or RECURRING_SHARD in leases.refresh():
+                today = datetime.now(timezone.utc).date()
+                result = await post_due_recurring(db, today, batch_size=batch_size)
+                metrics.record(result, datetime.now(timezone.utc))
+        except Exception as exc:  # noqa: BLE001
+            metrics.failures += 1
+            LOGGER.error("Recurring payments pass failed: %s", exc)
+        await asyncio.sleep(interval)
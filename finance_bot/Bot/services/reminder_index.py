@@ -0,0 +1,281 @@
+"""Due-time index for scheduled reminders.
+
+Keeps a min-heap of ``(next_fire_utc, reminder_id, version)`` so that each
+scheduler tick only touches reminders that are actually due instead of
+re-reading every user's reminders and schedules. Writes made by other
+processes reach the index through the ``изменения_напоминаний`` change log,
+which ``apply_changes`` reads once per tick.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Iterable
+from zoneinfo import ZoneInfo
+
+from Bot.database.crud import UTC_TIMESTAMP_FORMAT
+from Bot.services.reminder_service import _MOTIVATION_SCHEDULE_TITLE
+from Bot.utils.schedules import compiled_schedule
+from Bot.utils.time import _resolve_timezone
+
+LOGGER = logging.getLogger(__name__)
+
+SCHEDULED_CATEGORIES = ("habits", "food", "motivation", "wishlist")
+# Backstop only: changes from any process arrive through the change log.
+REBUILD_INTERVAL_SECONDS = 3600
+# A longer backlog of changes is cheaper to handle with a full rebuild.
+CHANGE_BATCH_SIZE = 500
+# Change log rows older than this are pruned on rebuild; far longer than
+# REBUILD_INTERVAL_SECONDS, so no live index can still need them.
+CHANGE_RETENTION = timedelta(days=1)
+
+
+def compile_fire_minutes(schedule: dict) -> tuple[int, ...]:
+    """Return the sorted minutes of day at which ``should_fire_at`` is true."""
+    return compiled_schedule(schedule).minutes
+
+
+def next_fire_time(
+    minutes: tuple[int, ...], zone: ZoneInfo, after_utc: datetime, inclusive: bool = False
+) -> datetime | None:
+    """Return the next local fire time at or after ``after_utc``.
+
+    Wall-clock times that do not exist in ``zone`` (DST gaps) are skipped,
+    the same way a per-minute scan would never see them.
+    """
+    if not minutes:
+        return None
+    local_after = after_utc.astimezone(zone)
+    start_day: date = local_after.date()
+    # Slots earlier in the first day can never qualify; skip them by bisection.
+    first = bisect_left(minutes, local_after.hour * 60 + local_after.minute)
+    for offset in range(3):
+        day = start_day + timedelta(days=offset)
+        for minute in minutes[first if offset == 0 else 0 :]:
+            local = datetime(day.year, day.month, day.day, minute // 60, minute % 60, tzinfo=zone)
+            fire_utc = local.astimezone(timezone.utc)
+            if fire_utc.astimezone(zone).replace(tzinfo=None) != local.replace(tzinfo=None):
+                continue
+            if fire_utc > after_utc or (inclusive and fire_utc == after_utc):
+                return local
+    return None
+
+
+@dataclass
+class IndexedReminder:
+    reminder_id: int
+    user_id: int
+    category: str
+    minutes: tuple[int, ...]
+    zone: ZoneInfo
+    version: int
+
+
+@dataclass(frozen=True)
+class DueReminder:
+    reminder_id: int
+    user_id: int
+    category: str
+    fire_at: datetime  # aware, in the user's timezone
+
+
+class ReminderIndex:
+    """Min-heap of upcoming reminder fire times.
+
+    Heap items are ``(fire_ts, reminder_id, version)``; updating a reminder
+    bumps its version, leaving any older heap item to be discarded lazily.
+    Register ``on_change`` with ``FinanceDatabase.add_reminder_listener`` to
+    see this process's edits at once, and call ``apply_changes`` every tick
+    to pick up edits made by other processes.
+
+    With ``owns`` only reminders of users it accepts are indexed, so a
+    sharded worker schedules just its own users; rebuild after changing it.
+    """
+
+    def __init__(
+        self, db: Any, default_tz: str, owns: Callable[[int], bool] | None = None
+    ) -> None:
+        self.db = db
+        self.default_tz = default_tz
+        self.owns = owns
+        self.built_at: float | None = None
+        self.change_seq: int | None = None
+        self._heap: list[tuple[float, int, int]] = []
+        self._entries: dict[int, IndexedReminder] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- building ---------------------------------------------------------
+
+    def _make_entry(self, row: dict) -> IndexedReminder | None:
+        category = row.get("category")
+        if category not in SCHEDULED_CATEGORIES:
+            return None
+        if category == "motivation":
+            # Only the schedule holder fires; content items are picked at send time.
+            if row.get("title") != _MOTIVATION_SCHEDULE_TITLE:
+                return None
+        elif not row.get("is_enabled"):
+            return None
+        minutes = compile_fire_minutes(row)
+        if not minutes:
+            return None
+        self._version += 1
+        zone = ZoneInfo(_resolve_timezone(row.get("user_timezone"), self.default_tz))
+        return IndexedReminder(
+            reminder_id=int(row["reminder_id"]),
+            user_id=int(row["user_id"]),
+            category=category,
+            minutes=minutes,
+            zone=zone,
+            version=self._version,
+        )
+
+    def _schedule(self, entry: IndexedReminder, after_utc: datetime, inclusive: bool) -> None:
+        fire_at = next_fire_time(entry.minutes, entry.zone, after_utc, inclusive)
+        if fire_at is None:
+            return
+        heapq.heappush(self._heap, (fire_at.timestamp(), entry.reminder_id, entry.version))
+
+    def _load(self, rows: Iterable[dict], after_utc: datetime) -> None:
+        for row in rows:
+            if self.owns is not None and not self.owns(int(row["user_id"])):
+                continue
+            entry = self._make_entry(row)
+            if entry is None:
+                continue
+            self._entries[entry.reminder_id] = entry
+            self._schedule(entry, after_utc, inclusive=True)
+
+    @staticmethod
+    def _minute_start(now_utc: datetime) -> datetime:
+        return now_utc.replace(second=0, microsecond=0)
+
+    def rebuild(self, now_utc: datetime | None = None) -> int:
+        """Reload every scheduled reminder; slots from the current minute on are kept."""
+        now_utc = now_utc or datetime.now(timezone.utc)
+        # Read the log position first: changes racing the load are replayed.
+        change_seq = self.db.get_reminder_change_seq()
+        rows = self.db.list_scheduled_reminders()
+        with self._lock:
+            self._heap = []
+            self._entries = {}
+            self._load(rows, self._minute_start(now_utc))
+            heapq.heapify(self._heap)
+            self.built_at = time.monotonic()
+            self.change_seq = change_seq
+            size = len(self._entries)
+        LOGGER.info("ACTION=REMINDER_INDEX_BUILT META=reminders=%s", size)
+        if change_seq is not None:
+            self.db.prune_reminder_changes(
+                (now_utc - CHANGE_RETENTION).astimezone(timezone.utc).strftime(UTC_TIMESTAMP_FORMAT)
+            )
+        return size
+
+    def needs_rebuild(self) -> bool:
+        if self.built_at is None:
+            return True
+        return time.monotonic() - self.built_at >= REBUILD_INTERVAL_SECONDS
+
+    def refresh_reminder(self, reminder_id: int, now_utc: datetime | None = None) -> None:
+        now_utc = now_utc or datetime.now(timezone.utc)
+        rows = self.db.list_scheduled_reminders(reminder_id=reminder_id)
+        with self._lock:
+            self._entries.pop(reminder_id, None)
+            self._load(rows, now_utc)
+
+    def refresh_user(self, user_id: int, now_utc: datetime | None = None) -> None:
+        now_utc = now_utc or datetime.now(timezone.utc)
+        owned = self.owns is None or self.owns(user_id)
+        rows = self.db.list_scheduled_reminders(user_id=user_id) if owned else []
+        with self._lock:
+            stale = [rid for rid, entry in self._entries.items() if entry.user_id == user_id]
+            for rid in stale:
+                del self._entries[rid]
+            self._load(rows, now_utc)
+
+    def apply_changes(self, now_utc: datetime | None = None) -> int:
+        """Refresh reminders changed (in any process) since the last build or call.
+
+        Slots from ``now_utc`` on are re-queued for the affected reminders;
+        a timezone change re-queues all of the user's reminders and drops
+        the user's cached settings. Returns the number of change log rows
+        consumed.
+        """
+        if self.change_seq is None:
+            return 0
+        now_utc = now_utc or datetime.now(timezone.utc)
+        changes = self.db.list_reminder_changes(self.change_seq, CHANGE_BATCH_SIZE)
+        if len(changes) >= CHANGE_BATCH_SIZE:
+            self.rebuild(now_utc)
+            return len(changes)
+        reminder_ids = {c["reminder_id"] for c in changes if c["reminder_id"] is not None}
+        user_ids = {
+            c["user_id"] for c in changes if c["reminder_id"] is None and c["user_id"] is not None
+        }
+        cache = getattr(self.db, "settings_cache", None)
+        for user_id in user_ids:
+            if cache is not None:
+                cache.invalidate(user_id)
+            self.refresh_user(user_id, now_utc)
+        for reminder_id in reminder_ids:
+            self.refresh_reminder(reminder_id, now_utc)
+        if changes:
+            self.change_seq = changes[-1]["seq"]
+            LOGGER.debug(
+                "ACTION=REMINDER_INDEX_CHANGES META=changes=%s reminders=%s users=%s",
+                len(changes),
+                len(reminder_ids),
+                len(user_ids),
+            )
+        return len(changes)
+
+    def on_change(self, reminder_id: int | None, user_id: int | None) -> None:
+        """Listener for ``FinanceDatabase.add_reminder_listener``."""
+        if reminder_id is not None:
+            self.refresh_reminder(reminder_id)
+        elif user_id is not None:
+            self.refresh_user(user_id)
+
+    # -- querying ---------------------------------------------------------
+
+    def next_fire_ts(self) -> float | None:
+        with self._lock:
+            while self._heap:
+                fire_ts, rid, version = self._heap[0]
+                entry = self._entries.get(rid)
+                if entry is not None and entry.version == version:
+                    return fire_ts
+                heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now_utc: datetime) -> list[DueReminder]:
+        """Return reminders due at or before ``now_utc`` and queue their next slot."""
+        now_ts = now_utc.timestamp()
+        due: list[DueReminder] = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now_ts:
+                fire_ts, rid, version = heapq.heappop(self._heap)
+                entry = self._entries.get(rid)
+                if entry is None or entry.version != version:
+                    continue
+                fire_utc = datetime.fromtimestamp(fire_ts, tz=timezone.utc)
+                due.append(
+                    DueReminder(
+                        reminder_id=rid,
+                        user_id=entry.user_id,
+                        category=entry.category,
+                        fire_at=fire_utc.astimezone(entry.zone),
+                    )
+                )
+                self._schedule(entry, fire_utc, inclusive=False)
+        return due
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from typing import Any
 
 from Bot.services.types import ServiceError
+from Bot.utils.schedules import compiled_schedule, label_to_minute
 
 LOGGER = logging.getLogger(__name__)
 
@@ -334,43 +335,10 @@ def should_fire_at(
     schedule: dict, time_label: str, now_dt: datetime
 ) -> bool:
     """Determine if a reminder should fire at the given HH:MM."""
-    active_from = schedule.get("active_from")
-    active_to = schedule.get("active_to")
-    if active_from and active_to:
-        if not (active_from <= time_label <= active_to):
-            return False
-
-    schedule_type = schedule.get("schedule_type", "specific_times")
-
-    if schedule_type == "specific_times":
-        times_json = schedule.get("times_json")
-        if not times_json:
-            return False
-        try:
-            times = json.loads(times_json) if isinstance(times_json, str) else times_json
-        except (json.JSONDecodeError, TypeError):
-            return False
-        return time_label in times
-
-    if schedule_type == "interval":
-        interval = schedule.get("interval_minutes")
-        if not interval or interval < 15:
-            return False
-        start_minutes = 0
-        if active_from:
-            parts = active_from.split(":")
-            if len(parts) == 2:
-                start_minutes = int(parts[0]) * 60 + int(parts[1])
-        current_parts = time_label.split(":")
-        if len(current_parts) != 2:
-            return False
-        current_minutes = int(current_parts[0]) * 60 + int(current_parts[1])
-        elapsed = current_minutes - start_minutes
-        if elapsed < 0:
-            return False
-        return elapsed % interval == 0
-
-    return False
+    minute = label_to_minute(time_label)
+    if minute is None:
+        return False
+    return compiled_schedule(schedule).fires_at(minute)
 
 
 # ------------------------------------------------------------------ #
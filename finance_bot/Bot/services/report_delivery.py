@@ -0,0 +1,213 @@
+"""Monthly report delivery on each user's ``report_day``.
+
+A pass pages through users whose report for the previous month is still
+outstanding (keyset over ``user_settings``), so finished users drop out of
+the scan. Each user gets a stable send time inside a daytime window of
+their own timezone, which spreads the ``report_day=1`` crowd over the day
+instead of a midnight burst. A report is claimed per (user, month) in
+``доставка_отчётов`` before it is built, rendered once from the
+``месячные_итоги`` rollup and queued on the rate-limited sender; the claim
+is finished once the sender reports the outcome. Passes are idempotent,
+and a claim left behind by a crashed process is taken over after
+``REPORT_CLAIM_TTL``.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+
+from Bot.database.crud import UTC_TIMESTAMP_FORMAT
+from Bot.renderers.report_render import format_monthly_report, is_empty_monthly_report
+from Bot.utils.time import get_user_zoneinfo
+
+LOGGER = logging.getLogger(__name__)
+
+REPORT_BATCH_SIZE = 200
+REPORT_INTERVAL_SECONDS = 300
+# Local send window on the report day: [09:00, 21:00).
+REPORT_WINDOW_START_HOUR = 9
+REPORT_WINDOW_MINUTES = 12 * 60
+# Claims not finished within this time belong to a dead process.
+REPORT_CLAIM_TTL = timedelta(minutes=30)
+
+
+@dataclass
+class ReportResult:
+    """Reports queued or skipped by one delivery pass."""
+
+    candidates: int = 0
+    queued: int = 0
+    empty: int = 0
+    duration: float = 0.0
+
+
+@dataclass
+class ReportMetrics:
+    """Running totals of the report delivery job since process start."""
+
+    runs: int = 0
+    failures: int = 0
+    queued: int = 0
+    sent: int = 0
+    failed_sends: int = 0
+    empty: int = 0
+    last_run_at: str | None = None
+    last_duration: float = 0.0
+
+    def record(self, result: ReportResult, finished_at: datetime) -> None:
+        self.runs += 1
+        self.last_run_at = finished_at.isoformat()
+        self.last_duration = result.duration
+        self.queued += result.queued
+        self.empty += result.empty
+
+    def snapshot(self) -> dict:
+        return asdict(self)
+
+
+REPORT_METRICS = ReportMetrics()
+
+
+def previous_month(moment: datetime) -> tuple[int, int]:
+    first = moment.replace(day=1)
+    last_of_previous = first - timedelta(days=1)
+    return last_of_previous.year, last_of_previous.month
+
+
+def send_offset(user_id: int) -> timedelta:
+    """Stable position of ``user_id`` inside the daily send window."""
+
+    return timedelta(
+        hours=REPORT_WINDOW_START_HOUR,
+        minutes=zlib.crc32(str(int(user_id)).encode()) % REPORT_WINDOW_MINUTES,
+    )
+
+
+def report_due_at(local_now: datetime, report_day: int, user_id: int) -> datetime:
+    """Local time the previous month's report of ``user_id`` becomes due."""
+
+    day = local_now.replace(
+        day=min(max(int(report_day), 1), 28), hour=0, minute=0, second=0, microsecond=0
+    )
+    return day + send_offset(user_id)
+
+
+async def deliver_due_reports(
+    db,
+    sender,
+    now_utc: datetime,
+    default_tz: str,
+    *,
+    owns=None,
+    batch_size: int = REPORT_BATCH_SIZE,
+    metrics: ReportMetrics = REPORT_METRICS,
+) -> ReportResult:
+    """Queue every monthly report whose send time has passed.
+
+    Users are checked against the previous month of ``now_utc``; users in a
+    timezone already in the next month wait until UTC catches up.
+    ``owns`` restricts the pass to this process's scheduler shards.
+    """
+
+    started = time.perf_counter()
+    now_utc = now_utc.astimezone(timezone.utc)
+    year, month = previous_month(now_utc)
+    month_key = f"{year:04d}-{month:02d}"
+    claimed_at = now_utc.strftime(UTC_TIMESTAMP_FORMAT)
+    stale_before = (now_utc - REPORT_CLAIM_TTL).strftime(UTC_TIMESTAMP_FORMAT)
+    # Zones ahead of UTC can already be on tomorrow's day of month.
+    max_day = min(now_utc.day + 1, 28)
+    result = ReportResult()
+    after = 0
+    while True:
+        batch = db.list_report_candidates(month_key, max_day, after, batch_size)
+        result.candidates += len(batch)
+        for row in batch:
+            user_id = int(row["user_id"])
+            if owns is not None and not owns(user_id):
+                continue
+            local_now = now_utc.astimezone(get_user_zoneinfo(db, user_id, default_tz))
+            if previous_month(local_now) != (year, month):
+                continue
+            if local_now < report_due_at(local_now, row["report_day"], user_id):
+                continue
+            if not db.claim_report_delivery(user_id, month_key, claimed_at, stale_before):
+                continue
+            data = db.get_monthly_report_data(user_id, year, month)
+            if is_empty_monthly_report(data):
+                db.finish_report_delivery(user_id, month_key, "empty", claimed_at)
+                result.empty += 1
+                continue
+            await sender.send_message(
+                user_id,
+                format_monthly_report(data),
+                on_success=_on_sent(db, metrics, user_id, month_key),
+                on_failure=_on_failed(db, metrics, user_id, month_key),
+            )
+            result.queued += 1
+        if len(batch) < batch_size:
+            break
+        after = int(batch[-1]["user_id"])
+        await asyncio.sleep(0)
+    result.duration = time.perf_counter() - started
+    LOGGER.info(
+        "REPORT_DELIVERY month=%s candidates=%s queued=%s empty=%s duration=%.3fs",
+        month_key,
+        result.candidates,
+        result.queued,
+        result.empty,
+        result.duration,
+    )
+    return result
+
+
+def _on_sent(db, metrics: ReportMetrics, user_id: int, month_key: str):
+    def finish() -> None:
+        metrics.sent += 1
+        db.finish_report_delivery(
+            user_id, month_key, "sent", datetime.now(timezone.utc).strftime(UTC_TIMESTAMP_FORMAT)
+        )
+
+    return finish
+
+
+def _on_failed(db, metrics: ReportMetrics, user_id: int, month_key: str):
+    # The sender already retried; a blocked chat would fail on every pass.
+    def give_up() -> None:
+        metrics.failed_sends += 1
+        db.finish_report_delivery(
+            user_id, month_key, "failed", datetime.now(timezone.utc).strftime(UTC_TIMESTAMP_FORMAT)
+        )
+
+    return give_up
+
+
+async def run_report_loop(
+    db,
+    sender,
+    default_tz: str,
+    *,
+    leases=None,
+    interval: float = REPORT_INTERVAL_SECONDS,
+    metrics: ReportMetrics = REPORT_METRICS,
+) -> None:
+    """Run :func:`deliver_due_reports` every ``interval`` seconds until cancelled."""
+
+    while True:
+        try:
+            owns = None
+            if leases is not None:
+                leases.refresh()
+                owns = leases.owns
+            result = await deliver_due_reports(
+                db, sender, datetime.now(timezone.utc), default_tz, owns=owns, metrics=metrics
+            )
+            metrics.record(result, datetime.now(timezone.utc))
+        except Exception as exc:  # noqa: BLE001
+            metrics.failures += 1
+            LOGGER.error("Report delivery failed: %s", exc)
+        await asyncio.sleep(interval)
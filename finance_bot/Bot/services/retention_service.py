@@ -0,0 +1,138 @@
+"""Background purge of expired BYT purchases and purchased wishes.
+
+Rows carry an ``expires_at`` (UTC, one month after purchase) computed when
+they are written. The job walks every enabled BYT category and deletes
+expired rows in small batches over the (user_id, category_key, expires_at)
+indexes, yielding to the event loop between batches so reminder ticks are
+never held up.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+
+from Bot.database.crud import UTC_TIMESTAMP_FORMAT
+
+LOGGER = logging.getLogger(__name__)
+
+PURGE_TABLES = ("purchases", "wishes")
+PURGE_BATCH_SIZE = 500
+PURGE_BATCH_PAUSE = 0.05
+PURGE_INTERVAL_SECONDS = 3600
+
+
+@dataclass
+class PurgeResult:
+    """Rows removed (or, in dry-run mode, found) by one purge pass."""
+
+    purchases: int = 0
+    wishes: int = 0
+    batches: int = 0
+    targets: int = 0
+    dry_run: bool = False
+    duration: float = 0.0
+
+
+@dataclass
+class RetentionMetrics:
+    """Running totals of the retention job since process start."""
+
+    runs: int = 0
+    failures: int = 0
+    purchases_deleted: int = 0
+    wishes_deleted: int = 0
+    batches: int = 0
+    last_run_at: str | None = None
+    last_duration: float = 0.0
+
+    def record(self, result: PurgeResult, finished_at: datetime) -> None:
+        self.runs += 1
+        self.last_run_at = finished_at.isoformat()
+        self.last_duration = result.duration
+        if not result.dry_run:
+            self.purchases_deleted += result.purchases
+            self.wishes_deleted += result.wishes
+            self.batches += result.batches
+
+    def snapshot(self) -> dict:
+        return asdict(self)
+
+
+RETENTION_METRICS = RetentionMetrics()
+
+
+async def purge_expired_byt(
+    db,
+    now_utc: datetime,
+    *,
+    batch_size: int = PURGE_BATCH_SIZE,
+    dry_run: bool = False,
+    pause: float = PURGE_BATCH_PAUSE,
+) -> PurgeResult:
+    """Delete BYT rows whose ``expires_at`` is at or before ``now_utc``."""
+
+    started = time.perf_counter()
+    cutoff = now_utc.astimezone(timezone.utc).strftime(UTC_TIMESTAMP_FORMAT)
+    result = PurgeResult(dry_run=dry_run)
+    targets = db.list_byt_purge_targets()
+    result.targets = len(targets)
+    for target in targets:
+        for table in PURGE_TABLES:
+            while True:
+                removed = db.purge_expired_byt_rows(
+                    table,
+                    target["user_id"],
+                    target["category_key"],
+                    cutoff,
+                    batch_size,
+                    dry_run=dry_run,
+                )
+                setattr(result, table, getattr(result, table) + removed)
+                if dry_run:
+                    break
+                if removed:
+                    result.batches += 1
+                if removed < batch_size:
+                    break
+                await asyncio.sleep(pause)
+    result.duration = time.perf_counter() - started
+    LOGGER.info(
+        "BYT_PURGE dry_run=%s targets=%s purchases=%s wishes=%s batches=%s duration=%.3fs",
+        dry_run,
+        result.targets,
+        result.purchases,
+        result.wishes,
+        result.batches,
+        result.duration,
+    )
+    return result
+
+
+async def run_retention_loop(
+    db,
+    *,
+    interval: float = PURGE_INTERVAL_SECONDS,
+    batch_size: int = PURGE_BATCH_SIZE,
+    metrics: RetentionMetrics = RETENTION_METRICS,
+    fsm_storage=None,
+) -> None:
+    """Run :func:`purge_expired_byt` every ``interval`` seconds until cancelled.
+
+    When ``fsm_storage`` is given its idle dialog states are purged too.
+    """
+
+    while True:
+        try:
+            now_utc = datetime.now(timezone.utc)
+            result = await purge_expired_byt(db, now_utc, batch_size=batch_size)
+            metrics.record(result, datetime.now(timezone.utc))
+            if fsm_storage is not None:
+                purged = fsm_storage.purge_idle()
+                LOGGER.info("FSM_PURGE idle_states=%s %s", purged, fsm_storage.stats())
+        except Exception as exc:  # noqa: BLE001
+            metrics.failures += 1
+            LOGGER.error("BYT purge failed: %s", exc)
+        await asyncio.sleep(interval)
@@ -0,0 +1,115 @@
+"""Lease-based ownership of scheduler shards.
+
+Users are split into ``shards`` partitions by a stable hash of user_id.
+Every shard is a lease row in ``аренды_планировщика``; a scheduler worker
+only processes users of the shards it currently holds, so several
+processes (the polling bot and ``python -m Bot.scheduler`` workers) can
+run the loops without sending twice.
+
+A worker started with ``worker_index`` *i* of ``workers`` owns the shards
+``s`` with ``s % workers == i`` and reclaims them from whoever holds them.
+Other shards are picked up only once their lease has expired, which is how
+the in-process standby scheduler keeps dispatching while no dedicated
+worker is running, and how a live worker covers for a dead one.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import time
+import zlib
+from typing import Callable
+
+LOGGER = logging.getLogger(__name__)
+
+LEASE_TTL_SECONDS = 180.0
+LEASE_RENEW_SECONDS = 30.0
+LEASE_PREFIX = "scheduler:shard"
+
+
+def shard_of(user_id: int, shards: int) -> int:
+    """Stable shard of ``user_id`` (the same in every process)."""
+
+    if shards <= 1:
+        return 0
+    return zlib.crc32(str(int(user_id)).encode()) % shards
+
+
+def default_holder(role: str) -> str:
+    return f"{role}:{socket.gethostname()}:{os.getpid()}"
+
+
+class ShardLeases:
+    """Shards held by one scheduler process, renewed as it ticks."""
+
+    def __init__(
+        self,
+        db,
+        *,
+        shards: int = 1,
+        workers: int = 1,
+        worker_index: int | None = None,
+        holder: str | None = None,
+        ttl: float = LEASE_TTL_SECONDS,
+        renew_interval: float = LEASE_RENEW_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.db = db
+        self.shards = max(1, shards)
+        self.workers = max(1, workers)
+        self.worker_index = worker_index
+        self.holder = holder or default_holder(
+            "standby" if worker_index is None else f"worker{worker_index}"
+        )
+        self.ttl = ttl
+        self.renew_interval = renew_interval
+        self._clock = clock
+        self.owned: frozenset[int] = frozenset()
+        self._refreshed_at: float | None = None
+
+    def _lease_name(self, shard: int) -> str:
+        return f"{LEASE_PREFIX}:{shard}/{self.shards}"
+
+    def preferred(self, shard: int) -> bool:
+        return self.worker_index is not None and shard % self.workers == self.worker_index
+
+    def refresh(self, *, force: bool = False) -> frozenset[int]:
+        """Renew held shards and pick up free ones; returns the owned set."""
+
+        now = self._clock()
+        if (
+            not force
+            and self._refreshed_at is not None
+            and now - self._refreshed_at < self.renew_interval
+        ):
+            return self.owned
+        owned = set()
+        for shard in range(self.shards):
+            if self.db.acquire_lease(
+                self._lease_name(shard),
+                self.holder,
+                self.ttl,
+                now=now,
+                force=self.preferred(shard),
+            ):
+                owned.add(shard)
+        if owned != self.owned:
+            LOGGER.info(
+                "SCHEDULER_SHARDS holder=%s owned=%s/%s",
+                self.holder,
+                sorted(owned),
+                self.shards,
+            )
+        self.owned = frozenset(owned)
+        self._refreshed_at = now
+        return self.owned
+
+    def owns(self, user_id: int) -> bool:
+        return shard_of(user_id, self.shards) in self.owned
+
+    def release(self) -> None:
+        for shard in self.owned:
+            self.db.release_lease(self._lease_name(shard), self.holder)
+        self.owned = frozenset()
+        self._refreshed_at = None
@@ -0,0 +1,155 @@
+"""Minute tick engine for the schedulers, with catch-up for missed minutes.
+
+Schedules match exact ``HH:MM`` labels, so a minute that is never
+processed is a reminder that is never sent. :class:`TickClock` remembers
+the last processed UTC minute per shard (persisted in
+``курсоры_планировщика``, so it survives restarts and shard hand-overs)
+and hands the loop every minute since then, oldest first. Minutes older
+than the catch-up window are dropped and counted as missed. Sleeps target
+the next minute boundary instead of "60 seconds after the work finished",
+so the schedule does not drift under load.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable
+
+from Bot.database.crud import UTC_TIMESTAMP_FORMAT
+
+LOGGER = logging.getLogger(__name__)
+
+CATCH_UP_MINUTES = 15
+MINUTE = timedelta(minutes=1)
+
+
+@dataclass
+class TickMetrics:
+    """Per-loop tick counters since process start."""
+
+    ticks: int = 0
+    minutes: int = 0
+    caught_up_minutes: int = 0
+    missed_minutes: int = 0
+    missed_slots: int = 0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+
+    def record_minute(self, lag: float) -> None:
+        self.minutes += 1
+        if lag >= 60:
+            self.caught_up_minutes += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+
+    def snapshot(self) -> dict:
+        return asdict(self)
+
+
+TICK_METRICS: dict[str, TickMetrics] = {}
+
+
+def _floor_minute(moment: datetime) -> datetime:
+    return moment.replace(second=0, microsecond=0)
+
+
+class TickClock:
+    """Tracks processed minutes for one scheduler loop."""
+
+    def __init__(
+        self,
+        name: str,
+        db,
+        *,
+        shards: int = 1,
+        catch_up_minutes: int = CATCH_UP_MINUTES,
+        clock: Callable[[], float] = time.time,
+        metrics: TickMetrics | None = None,
+    ) -> None:
+        self.name = name
+        self.db = db
+        self.shards = max(1, shards)
+        self.catch_up_minutes = max(1, catch_up_minutes)
+        self._clock = clock
+        self.metrics = metrics or TICK_METRICS.setdefault(name, TickMetrics())
+        self._last: dict[int, datetime] = {}
+
+    def _cursor_name(self, shard: int) -> str:
+        if self.shards == 1:
+            return self.name
+        return f"{self.name}:{shard}/{self.shards}"
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self._clock(), tz=timezone.utc)
+
+    def earliest(self) -> datetime:
+        """Oldest minute that is still caught up rather than dropped."""
+
+        return _floor_minute(self.now()) - (self.catch_up_minutes - 1) * MINUTE
+
+    def _load(self, shards: Iterable[int]) -> None:
+        missing = [shard for shard in shards if shard not in self._last]
+        if not missing:
+            return
+        stored = self.db.get_scheduler_cursors(self._cursor_name(shard) for shard in missing)
+        for shard in missing:
+            raw = stored.get(self._cursor_name(shard))
+            if raw:
+                self._last[shard] = datetime.strptime(raw, UTC_TIMESTAMP_FORMAT).replace(
+                    tzinfo=timezone.utc
+                )
+
+    def pending(self, shards: Iterable[int] | None = None) -> list[tuple[datetime, frozenset[int]]]:
+        """Unprocessed minutes (oldest first) with the shards each is due for."""
+
+        owned = frozenset(shards) if shards is not None else frozenset({0})
+        for shard in set(self._last) - owned:
+            # Forget shards we no longer hold; reload their cursor if regained.
+            del self._last[shard]
+        self._load(owned)
+        current = _floor_minute(self.now())
+        earliest = current - (self.catch_up_minutes - 1) * MINUTE
+        due: dict[datetime, set[int]] = {}
+        for shard in owned:
+            last = self._last.get(shard)
+            start = current if last is None else last + MINUTE
+            if start < earliest:
+                missed = int((earliest - start) / MINUTE)
+                self.metrics.missed_minutes += missed
+                LOGGER.warning(
+                    "SCHEDULER_MINUTES_MISSED loop=%s shard=%s minutes=%s since=%s",
+                    self.name,
+                    shard,
+                    missed,
+                    start.isoformat(),
+                )
+                start = earliest
+            minute = start
+            while minute <= current:
+                due.setdefault(minute, set()).add(shard)
+                minute += MINUTE
+        return [(minute, frozenset(due[minute])) for minute in sorted(due)]
+
+    def mark(self, minute: datetime, shards: Iterable[int] | None = None) -> None:
+        """Record ``minute`` as processed for ``shards``."""
+
+        shards = list(shards) if shards is not None else [0]
+        for shard in shards:
+            self._last[shard] = minute
+        self.db.advance_scheduler_cursors(
+            (self._cursor_name(shard) for shard in shards),
+            minute.strftime(UTC_TIMESTAMP_FORMAT),
+        )
+        self.metrics.record_minute((self.now() - minute).total_seconds())
+
+    def missed_slot(self) -> None:
+        self.metrics.missed_slots += 1
+
+    async def sleep_until_next_minute(self) -> None:
+        self.metrics.ticks += 1
+        now = self._clock()
+        # A hair past the boundary so the next tick sees the new minute.
+        await asyncio.sleep(60 - now % 60 + 0.01)
@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from typing import Optional
 
-from Bot.database.crud import FinanceDatabase
+from Bot.database.crud import FinanceDatabase, normalize_category_key
 
 LOGGER = logging.getLogger(__name__)
 
@@ -13,10 +13,7 @@ LOGGER = logging.getLogger(__name__)
 def normalize_wishlist_category_title(value: str) -> str:
     """Normalize wishlist category titles for comparison."""
 
-    normalized = str(value or "").strip().casefold()
-    if normalized == "byt":
-        return "быт"
-    return normalized
+    return normalize_category_key(str(value or ""))
 
 
 def wishlist_category_matches(wish_category: str, source_title: str) -> bool:
@@ -23,11 +23,12 @@ def add_one_month(source: datetime) -> datetime:
 
     year = source.year + (source.month // 12)
     month = 1 if source.month == 12 else source.month + 1
+    target_first = source.replace(year=year, month=month, day=1)
     last_day = (
-        (source.replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        (target_first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
     ).day
     day = min(source.day, last_day)
-    return source.replace(year=year, month=month, day=day)
+    return target_first.replace(day=day)
 
 
 def get_next_byt_run_dt(now: datetime, schedule_times: list[time]) -> datetime:
@@ -0,0 +1,110 @@
+"""Bulk deletion of bot messages with Telegram's ``deleteMessages``.
+
+Pending deletions are grouped per chat into batches of up to 100 ids, one
+API call each. Batches run concurrently, every call takes a token from the
+shared rate limiter (the outbound sender's bucket once
+:func:`configure_message_cleaner` has been called), and only the ids of a
+failed batch are retried one by one with ``deleteMessage``.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+
+from Bot.utils.send_queue import TokenBucket
+from Bot.utils.telegram_safe import safe_delete_message, safe_delete_messages
+
+LOGGER = logging.getLogger(__name__)
+
+DELETE_BATCH_SIZE = 100
+
+
+@dataclass
+class DeleteReport:
+    """Outcome of one cleanup; ``saved_calls`` is versus one call per message."""
+
+    requested: int = 0
+    deleted: int = 0
+    batches: int = 0
+    fallback_calls: int = 0
+    api_calls: int = 0
+
+    @property
+    def saved_calls(self) -> int:
+        return self.requested - self.api_calls
+
+
+class MessageCleaner:
+    """Deletes messages in per-chat batches under an optional shared limiter."""
+
+    def __init__(
+        self,
+        limiter: TokenBucket | None = None,
+        *,
+        batch_size: int = DELETE_BATCH_SIZE,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.limiter = limiter
+        self.batch_size = max(1, min(batch_size, DELETE_BATCH_SIZE))
+        self.stats = {"requested": 0, "deleted": 0, "api_calls": 0, "saved_calls": 0}
+        self._log = logger or LOGGER
+
+    async def _acquire(self) -> None:
+        if self.limiter is not None:
+            await self.limiter.acquire()
+
+    async def _delete_one(self, bot, chat_id: int, message_id: int, report: DeleteReport) -> None:
+        await self._acquire()
+        report.api_calls += 1
+        if await safe_delete_message(bot, chat_id=chat_id, message_id=message_id, logger=self._log):
+            report.deleted += 1
+
+    async def _delete_batch(self, bot, chat_id: int, batch: list[int], report: DeleteReport) -> None:
+        if len(batch) == 1:
+            await self._delete_one(bot, chat_id, batch[0], report)
+            return
+        await self._acquire()
+        report.api_calls += 1
+        report.batches += 1
+        if await safe_delete_messages(bot, chat_id, batch, logger=self._log):
+            report.deleted += len(batch)
+            return
+        report.fallback_calls += len(batch)
+        await asyncio.gather(
+            *(self._delete_one(bot, chat_id, message_id, report) for message_id in batch)
+        )
+
+    async def delete(self, bot, pending: Mapping[int, Iterable[int]]) -> DeleteReport:
+        """Delete ``{chat_id: message_ids}`` and report what it cost."""
+
+        report = DeleteReport()
+        jobs = []
+        for chat_id, message_ids in pending.items():
+            ids = list(dict.fromkeys(int(item) for item in message_ids))
+            report.requested += len(ids)
+            for start in range(0, len(ids), self.batch_size):
+                batch = ids[start : start + self.batch_size]
+                jobs.append(self._delete_batch(bot, int(chat_id), batch, report))
+        if jobs:
+            await asyncio.gather(*jobs)
+        self.stats["requested"] += report.requested
+        self.stats["deleted"] += report.deleted
+        self.stats["api_calls"] += report.api_calls
+        self.stats["saved_calls"] += report.saved_calls
+        return report
+
+
+_CLEANER = MessageCleaner()
+
+
+def get_message_cleaner() -> MessageCleaner:
+    return _CLEANER
+
+
+def configure_message_cleaner(limiter: TokenBucket | None) -> MessageCleaner:
+    """Route cleanup calls through ``limiter`` (normally ``OutboundSender.bucket``)."""
+
+    _CLEANER.limiter = limiter
+    return _CLEANER
@@ -0,0 +1,140 @@
+"""Compiled form of reminder schedules.
+
+A ``reminder_schedules`` row (``schedule_type``, ``times_json``,
+``interval_minutes`` and the ``active_from``/``active_to`` window) is turned
+once into the sorted minutes of day it fires at plus a 1440-bit bitset, so
+hot checks are a shift-and-mask instead of JSON parsing and string splits.
+Compiled schedules are cached per reminder; the cache entry is checked
+against the row's fields on lookup and dropped by ``set_reminder_schedule``.
+"""
+from __future__ import annotations
+
+import json
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from threading import Lock
+
+MINUTES_PER_DAY = 24 * 60
+SCHEDULE_CACHE_SIZE = 50_000
+
+
+def minute_label(minute: int) -> str:
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+_LABEL_MINUTES = {minute_label(minute): minute for minute in range(MINUTES_PER_DAY)}
+
+
+def label_to_minute(label: str) -> int | None:
+    """``"HH:MM"`` → minute of day, or None if the label is not canonical."""
+
+    return _LABEL_MINUTES.get(label) if isinstance(label, str) else None
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSchedule:
+    """Fire minutes of a schedule as a sorted tuple and as a bitset."""
+
+    minutes: tuple[int, ...]
+    bits: int
+
+    @classmethod
+    def from_minutes(cls, minutes) -> "CompiledSchedule":
+        ordered = tuple(sorted(set(minutes)))
+        bits = 0
+        for minute in ordered:
+            bits |= 1 << minute
+        return cls(ordered, bits)
+
+    def fires_at(self, minute: int) -> bool:
+        return 0 <= minute < MINUTES_PER_DAY and bool(self.bits >> minute & 1)
+
+    def next_minute(self, minute: int, inclusive: bool = False) -> int | None:
+        """First fire minute after (or at) ``minute`` on the same day."""
+
+        find = bisect_left if inclusive else bisect_right
+        position = find(self.minutes, minute)
+        return self.minutes[position] if position < len(self.minutes) else None
+
+
+EMPTY_SCHEDULE = CompiledSchedule((), 0)
+
+
+def compile_schedule(schedule: dict) -> CompiledSchedule:
+    """Compile a schedule row; invalid or empty schedules never fire.
+
+    The activity window is compared as ``HH:MM`` strings, as it always was.
+    """
+    active_from = schedule.get("active_from")
+    active_to = schedule.get("active_to")
+    schedule_type = schedule.get("schedule_type") or "specific_times"
+
+    if schedule_type == "specific_times":
+        times_json = schedule.get("times_json")
+        if not times_json:
+            return EMPTY_SCHEDULE
+        try:
+            times = json.loads(times_json) if isinstance(times_json, str) else times_json
+        except (json.JSONDecodeError, TypeError):
+            return EMPTY_SCHEDULE
+        if not isinstance(times, (list, tuple)):
+            return EMPTY_SCHEDULE
+        candidates = [
+            minute for minute in (label_to_minute(value) for value in times) if minute is not None
+        ]
+    elif schedule_type == "interval":
+        interval = schedule.get("interval_minutes")
+        if not interval or interval < 15:
+            return EMPTY_SCHEDULE
+        start = 0
+        if active_from:
+            parts = active_from.split(":")
+            if len(parts) == 2:
+                try:
+                    start = int(parts[0]) * 60 + int(parts[1])
+                except ValueError:
+                    return EMPTY_SCHEDULE
+        candidates = list(range(max(start, 0), MINUTES_PER_DAY, int(interval)))
+    else:
+        return EMPTY_SCHEDULE
+
+    if active_from and active_to:
+        candidates = [m for m in candidates if active_from <= minute_label(m) <= active_to]
+    return CompiledSchedule.from_minutes(candidates)
+
+
+_FINGERPRINT_KEYS = ("schedule_type", "interval_minutes", "times_json", "active_from", "active_to")
+
+# Reads are lock-free (single dict lookups); only writes and evictions lock.
+_CACHE: dict[int, tuple[tuple, CompiledSchedule]] = {}
+_CACHE_LOCK = Lock()
+
+
+def compiled_schedule(schedule: dict) -> CompiledSchedule:
+    """Cached :func:`compile_schedule` for rows carrying a ``reminder_id``."""
+
+    reminder_id = schedule.get("reminder_id")
+    if reminder_id is None:
+        return compile_schedule(schedule)
+    fingerprint = tuple(map(schedule.get, _FINGERPRINT_KEYS))
+    cached = _CACHE.get(reminder_id)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    compiled = compile_schedule(schedule)
+    with _CACHE_LOCK:
+        _CACHE.pop(reminder_id, None)
+        _CACHE[reminder_id] = (fingerprint, compiled)
+        while len(_CACHE) > SCHEDULE_CACHE_SIZE:
+            # Oldest compiled first; a re-used schedule is just compiled again.
+            del _CACHE[next(iter(_CACHE))]
+    return compiled
+
+
+def invalidate_compiled_schedule(reminder_id: int | None = None) -> None:
+    """Drop one reminder's compiled schedule, or all of them."""
+
+    with _CACHE_LOCK:
+        if reminder_id is None:
+            _CACHE.clear()
+        else:
+            _CACHE.pop(reminder_id, None)
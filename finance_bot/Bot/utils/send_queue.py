@@ -0,0 +1,254 @@
+"""Rate-limited, concurrent outbound queue for scheduler fan-out."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
+
+from Bot.utils.telegram_safe import DEFAULT_REQUEST_TIMEOUT, _is_network_error
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+DEFAULT_MAX_QUEUE = 10_000
+# Telegram allows about 30 messages per second overall and about one message
+# per second to the same private chat.
+DEFAULT_GLOBAL_RATE = 30.0
+DEFAULT_PER_CHAT_INTERVAL = 1.0
+DEFAULT_MAX_ATTEMPTS = 3
+MAX_FLOOD_WAITS = 5
+
+SendFactory = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class SendOutcome:
+    """Result of one queued send, delivered through the job's future."""
+
+    chat_id: int
+    ok: bool
+    result: Any = None
+    error: str | None = None
+    attempts: int = 0
+
+
+@dataclass
+class _SendJob:
+    chat_id: int
+    factory: SendFactory
+    future: asyncio.Future
+    on_success: Callable[[], None] | None = None
+    on_failure: Callable[[], None] | None = None
+    attempts: int = 0
+    flood_waits: int = 0
+
+
+class TokenBucket:
+    """Async token bucket; ``pause`` blocks every acquirer until a deadline."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class OutboundSender:
+    """Bounded send queue drained by N workers under global and per-chat limits.
+
+    ``submit`` returns a future resolving to a SendOutcome; ``on_success``
+    runs only when the message was actually delivered, ``on_failure`` when
+    it was given up on. ``RetryAfter`` pauses
+    all workers for the requested time and retries the job.
+    """
+
+    def __init__(
+        self,
+        bot,
+        *,
+        workers: int = DEFAULT_WORKERS,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        global_rate: float = DEFAULT_GLOBAL_RATE,
+        per_chat_interval: float = DEFAULT_PER_CHAT_INTERVAL,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = 0.3,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.bot = bot
+        self.workers = max(1, workers)
+        self.per_chat_interval = per_chat_interval
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.bucket = TokenBucket(global_rate)
+        self.stats = {"sent": 0, "failed": 0, "retry_after": 0, "retried": 0}
+        self._log = logger or LOGGER
+        self._queue: asyncio.Queue[_SendJob] = asyncio.Queue(maxsize=max_queue)
+        self._chat_ready_at: dict[int, float] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"outbound-sender-{index}")
+            for index in range(self.workers)
+        ]
+
+    async def stop(self, drain: bool = True) -> None:
+        """Stop the workers, optionally after the queue has been drained."""
+        if drain and self._tasks:
+            await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def submit(
+        self,
+        chat_id: int,
+        factory: SendFactory,
+        *,
+        on_success: Callable[[], None] | None = None,
+        on_failure: Callable[[], None] | None = None,
+    ) -> asyncio.Future:
+        """Queue ``factory()`` for delivery; waits only if the queue is full."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_SendJob(chat_id, factory, future, on_success, on_failure))
+        return future
+
+    async def send_message(
+        self,
+        chat_id: int,
+        text: str,
+        reply_markup=None,
+        *,
+        parse_mode: str | None = None,
+        on_success: Callable[[], None] | None = None,
+        on_failure: Callable[[], None] | None = None,
+    ) -> asyncio.Future:
+        """Queue a text message (same normalisation as ``safe_send_message``)."""
+        normalized = "" if text is None else str(text)
+        if not normalized.strip():
+            normalized = "."
+        return await self.submit(
+            chat_id,
+            lambda: self.bot.send_message(
+                chat_id=chat_id,
+                text=normalized,
+                reply_markup=reply_markup,
+                parse_mode=parse_mode,
+                request_timeout=DEFAULT_REQUEST_TIMEOUT,
+            ),
+            on_success=on_success,
+            on_failure=on_failure,
+        )
+
+    async def _wait_for_chat(self, chat_id: int) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            ready_at = self._chat_ready_at.get(chat_id, 0.0)
+            now = loop.time()
+            if now >= ready_at:
+                self._chat_ready_at[chat_id] = now + self.per_chat_interval
+                return
+            await asyncio.sleep(ready_at - now)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._deliver(job)
+            except asyncio.CancelledError:
+                if not job.future.done():
+                    job.future.cancel()
+                raise
+            except Exception as exc:  # noqa: BLE001
+                self._finish(job, ok=False, error=str(exc))
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, job: _SendJob) -> None:
+        while job.attempts < self.max_attempts:
+            await self._wait_for_chat(job.chat_id)
+            await self.bucket.acquire()
+            job.attempts += 1
+            try:
+                result = await job.factory()
+            except TelegramRetryAfter as exc:
+                self.stats["retry_after"] += 1
+                self._log.warning(
+                    "OUTBOUND_RETRY_AFTER chat_id=%s retry_after=%s", job.chat_id, exc.retry_after
+                )
+                self.bucket.pause(float(exc.retry_after))
+                # Flood control does not count as a failed attempt, but is capped.
+                job.attempts -= 1
+                job.flood_waits += 1
+                if job.flood_waits > MAX_FLOOD_WAITS:
+                    self._finish(job, ok=False, error=f"flood wait: {exc}")
+                    return
+                continue
+            except (TelegramBadRequest, TelegramForbiddenError) as exc:
+                self._finish(job, ok=False, error=str(exc))
+                return
+            except Exception as exc:  # noqa: BLE001
+                if _is_network_error(exc) and job.attempts < self.max_attempts:
+                    self.stats["retried"] += 1
+                    await asyncio.sleep(self.base_delay * 2 ** (job.attempts - 1))
+                    continue
+                self._finish(job, ok=False, error=str(exc))
+                return
+            self._finish(job, ok=bool(result), result=result)
+            return
+        self._finish(job, ok=False, error="max attempts exceeded")
+
+    def _finish(self, job: _SendJob, *, ok: bool, result: Any = None, error: str | None = None) -> None:
+        self.stats["sent" if ok else "failed"] += 1
+        if not ok:
+            self._log.warning("OUTBOUND_SEND_FAILED chat_id=%s error=%s", job.chat_id, error)
+        callback = job.on_success if ok else job.on_failure
+        if callback is not None:
+            try:
+                callback()
+            except Exception:  # noqa: BLE001
+                self._log.exception("OUTBOUND callback failed chat_id=%s ok=%s", job.chat_id, ok)
+        if not job.future.done():
+            job.future.set_result(
+                SendOutcome(job.chat_id, ok, result=result, error=error, attempts=job.attempts)
+            )
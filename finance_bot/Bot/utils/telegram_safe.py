@@ -111,6 +111,54 @@ async def safe_delete_message(
     return False
 
 
+async def safe_delete_messages(
+    bot,
+    chat_id: int,
+    message_ids: list[int],
+    *,
+    retries: int = 2,
+    base_delay: float = 0.3,
+    logger: logging.Logger | None = None,
+    request_timeout: int | None = DEFAULT_REQUEST_TIMEOUT,
+) -> bool:
+    """Safely delete up to 100 messages of one chat with a single deleteMessages call."""
+
+    log = _get_logger(logger)
+    for attempt in range(retries + 1):
+        try:
+            await bot.delete_messages(
+                chat_id=chat_id,
+                message_ids=message_ids,
+                request_timeout=request_timeout,
+            )
+            return True
+        except TelegramBadRequest as exc:
+            log.debug(
+                "Safe bulk delete failed (chat_id=%s, count=%s): %s",
+                chat_id,
+                len(message_ids),
+                exc,
+            )
+            return False
+        except Exception as exc:  # noqa: BLE001
+            if _is_network_error(exc):
+                _log_network_error(log, "delete_messages", exc, attempt + 1, retries)
+                if attempt < retries:
+                    await asyncio.sleep(base_delay * 2**attempt)
+                    continue
+                return False
+            log.warning(
+                "Safe bulk delete unexpected error (chat_id=%s, count=%s): %s",
+                chat_id,
+                len(message_ids),
+                exc,
+            )
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Safe bulk delete unexpected error details", exc_info=True)
+            return False
+    return False
+
+
 async def safe_edit_message_text(
     bot,
     chat_id: int,
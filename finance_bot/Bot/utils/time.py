@@ -27,8 +27,8 @@ def get_user_timezone(db, user_id: int, default_tz: str) -> str:
     return tz
 
 
-def set_user_timezone(db, user_id: int, tz: str, default_tz: str) -> None:
-    """Persist user timezone."""
+def set_user_timezone(db, user_id: int, tz: str, default_tz: str) -> str:
+    """Persist user timezone; returns the zone stored (``default_tz`` if ``tz`` is unknown)."""
 
     resolved = _resolve_timezone(tz, default_tz)
     now_iso = datetime.now(tz=ZoneInfo(resolved)).isoformat()
@@ -51,13 +51,33 @@ def set_user_timezone(db, user_id: int, tz: str, default_tz: str) -> None:
             (user_id, resolved, now_iso, now_iso),
         )
     db.connection.commit()
+    cache = getattr(db, "settings_cache", None)
+    if cache is not None:
+        cache.invalidate(user_id)
+    notify = getattr(db, "notify_user_timezone_changed", None)
+    if notify is not None:
+        notify(user_id)
+    return resolved
+
+
+def get_user_zoneinfo(db, user_id: int, default_tz: str) -> ZoneInfo:
+    """Return the user's resolved ZoneInfo, cached alongside their settings."""
+
+    cache = getattr(db, "settings_cache", None)
+    if cache is not None:
+        zone = cache.get_zone(user_id)
+        if zone is not None:
+            return zone
+    zone = ZoneInfo(get_user_timezone(db, user_id, default_tz))
+    if cache is not None:
+        cache.set_zone(user_id, zone)
+    return zone
 
 
 def now_for_user(db, user_id: int, default_tz: str) -> datetime:
     """Return current datetime in user's timezone."""
 
-    tz = get_user_timezone(db, user_id, default_tz)
-    return datetime.now(tz=ZoneInfo(tz))
+    return datetime.now(tz=get_user_zoneinfo(db, user_id, default_tz))
 
 
 def today_for_user(db, user_id: int, default_tz: str) -> str:
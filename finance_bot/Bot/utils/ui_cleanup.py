@@ -6,11 +6,13 @@ from aiogram.types import ReplyKeyboardMarkup, ReplyKeyboardRemove
 from aiogram.fsm.context import FSMContext
 
 from Bot.database.get_db import get_db
+from Bot.utils.message_cleanup import get_message_cleaner
 from Bot.utils.telegram_safe import (
     safe_delete_message,
     safe_edit_message_text,
     safe_send_message,
 )
+from Bot.utils.ui_state import ui_state
 
 LOGGER = logging.getLogger(__name__)
 
@@ -18,17 +20,8 @@ LOGGER = logging.getLogger(__name__)
 async def ui_register_message(state: FSMContext, chat_id: int, message_id: int) -> None:
     """Track a UI message id for later cleanup."""
 
-    data = await state.get_data()
-    ids: List[int] = list(data.get("ui_tracked_message_ids") or [])
-    if message_id not in ids:
-        ids.append(int(message_id))
-    if len(ids) > 300:
-        ids = ids[-300:]
-    current_chat_id = data.get("ui_chat_id")
-    await state.update_data(
-        ui_chat_id=current_chat_id if current_chat_id is not None else chat_id,
-        ui_tracked_message_ids=ids,
-    )
+    async with ui_state(state) as ui:
+        ui.track(chat_id, message_id)
 
 
 async def ui_register_protected_message(
@@ -36,25 +29,15 @@ async def ui_register_protected_message(
 ) -> None:
     """Track a UI message id that should never be deleted."""
 
-    data = await state.get_data()
-    ids: List[int] = list(data.get("ui_protected_message_ids") or [])
-    if message_id not in ids:
-        ids.append(int(message_id))
-    if len(ids) > 300:
-        ids = ids[-300:]
-    current_chat_id = data.get("ui_chat_id")
-    await state.update_data(
-        ui_chat_id=current_chat_id if current_chat_id is not None else chat_id,
-        ui_protected_message_ids=ids,
-    )
+    async with ui_state(state) as ui:
+        ui.protect(chat_id, message_id)
 
 
 async def ui_register_user_message(state: FSMContext, chat_id: int, message_id: int) -> None:
     """Do not track user messages for later cleanup."""
 
-    data = await state.get_data()
-    if data.get("ui_chat_id") is None:
-        await state.update_data(ui_chat_id=chat_id)
+    async with ui_state(state) as ui:
+        ui.claim_chat(chat_id)
 
 
 async def ui_safe_delete_message(
@@ -78,25 +61,22 @@ async def ui_safe_delete_message(
 
 
 async def ui_get_welcome_id(state: FSMContext) -> int | None:
-    data = await state.get_data()
-    welcome_id = data.get("ui_welcome_message_id")
-    return int(welcome_id) if welcome_id is not None else None
+    async with ui_state(state) as ui:
+        return ui.welcome_id
 
 
 async def ui_get_protected_ids(state: FSMContext) -> set[int]:
-    welcome_id = await ui_get_welcome_id(state)
-    if welcome_id is None:
-        return set()
-    return {int(welcome_id)}
+    async with ui_state(state) as ui:
+        return ui.protected_ids()
 
 
 async def ui_set_welcome_id(
     state: FSMContext, message_id: int, chat_id: int | None = None
 ) -> None:
-    update = {"ui_welcome_message_id": int(message_id)}
-    if chat_id is not None:
-        update["ui_chat_id"] = int(chat_id)
-    await state.update_data(**update)
+    async with ui_state(state) as ui:
+        ui.set_welcome(message_id)
+        if chat_id is not None:
+            ui.set_chat(chat_id)
 
 
 async def ui_set_welcome_message(
@@ -141,8 +121,10 @@ async def ui_set_settings_mode_message(
 async def ui_set_screen_message(
     state: FSMContext, chat_id: int, message_id: int
 ) -> None:
-    await ui_register_message(state, chat_id, message_id)
-    await state.update_data(ui_screen_message_id=int(message_id), ui_chat_id=chat_id)
+    async with ui_state(state) as ui:
+        ui.track(chat_id, message_id)
+        ui.set_screen(message_id)
+        ui.set_chat(chat_id)
 
 
 async def ui_track_message(
@@ -158,55 +140,37 @@ async def ui_cleanup_to_context(
     context_name: str,
     keep_ids: List[int] | None = None,
 ) -> None:
-    data = await state.get_data()
-    tracked_ids: List[int] = list(data.get("ui_tracked_message_ids") or [])
-    protected_ids = await ui_get_protected_ids(state)
-    extra_protected_ids: List[int] = list(data.get("ui_protected_message_ids") or [])
-    keep_id_set = {int(item) for item in (keep_ids or []) if item is not None}
-    for protected_id in extra_protected_ids:
-        protected_ids.add(int(protected_id))
-    keep_id_set.update(protected_ids)
-    delete_ids = []
-    for mid in tracked_ids:
-        mid_int = int(mid)
-        if mid_int in keep_id_set:
-            continue
-        delete_ids.append(mid_int)
-    kept_ids = {mid for mid in (int(item) for item in tracked_ids) if mid in keep_id_set}
-    deleted_count = 0
-    for message_id in delete_ids:
-        deleted = await ui_safe_delete_message(
-            bot,
-            chat_id=chat_id,
-            message_id=message_id,
-            log_context=f"context={context_name}",
-            state=state,
+    async with ui_state(state) as ui:
+        tracked_ids: List[int] = list(ui.tracked)
+        protected_ids = ui.protected_ids()
+        protected_ids.update(ui.protected)
+        keep_id_set = {int(item) for item in (keep_ids or []) if item is not None}
+        keep_id_set.update(protected_ids)
+        delete_ids = [mid for mid in tracked_ids if mid not in keep_id_set]
+        kept_ids = {mid for mid in tracked_ids if mid in keep_id_set}
+        report = await get_message_cleaner().delete(bot, {chat_id: delete_ids})
+
+        LOGGER.info(
+            "UI_CLEANUP context=%s deleted=%s kept=%s welcome_id=%s api_calls=%s saved_calls=%s",
+            context_name,
+            report.deleted,
+            len(kept_ids),
+            ui.welcome_id,
+            report.api_calls,
+            report.saved_calls,
         )
-        if deleted:
-            deleted_count += 1
-
-    LOGGER.info(
-        "UI_CLEANUP context=%s deleted=%s kept=%s welcome_id=%s",
-        context_name,
-        deleted_count,
-        len(kept_ids),
-        await ui_get_welcome_id(state),
-    )
-    await state.update_data(
-        ui_tracked_message_ids=list(
-            {
+        ui.replace_tracked(
+            dict.fromkeys(
                 int(item)
                 for item in (keep_ids or [])
-                if item is not None
-                and int(item) not in protected_ids
-            }
-        ),
-    )
+                if item is not None and int(item) not in protected_ids
+            )
+        )
 
 
 async def ui_cleanup_messages(bot: Bot, state: FSMContext, *args, **kwargs) -> None:
-    data = await state.get_data()
-    chat_id = kwargs.get("chat_id") or data.get("ui_chat_id")
+    async with ui_state(state) as ui:
+        chat_id = kwargs.get("chat_id") or ui.chat_id
     if chat_id is None:
         return
     await ui_cleanup_to_context(bot, state, int(chat_id), "MAIN_MENU")
@@ -220,8 +184,8 @@ async def ui_render_screen(
     reply_markup=None,
     parse_mode: str | None = None,
 ) -> int:
-    data = await state.get_data()
-    screen_id = data.get("ui_screen_message_id")
+    async with ui_state(state) as ui:
+        screen_id = ui.screen_id
     if screen_id is not None and not isinstance(
         reply_markup, (ReplyKeyboardMarkup, ReplyKeyboardRemove)
     ):
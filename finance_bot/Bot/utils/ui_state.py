@@ -0,0 +1,195 @@
+"""Per-update buffering of the UI bookkeeping kept in FSM data.
+
+``UiStateMiddleware`` hands handlers a :class:`UiScopedContext` instead of
+the plain FSMContext. The ``ui_*`` keys are loaded from storage once, the
+first time a ``Bot.utils.ui_cleanup`` helper needs them; registrations and
+cleanups then change the in-memory :class:`UiState`, and everything is
+written back with a single ``update_data`` when the update is done.
+Outside the middleware (tests, schedulers) each helper call loads and
+flushes on its own, as before.
+"""
+from __future__ import annotations
+
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Mapping
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.context import FSMContext
+
+LOGGER = logging.getLogger(__name__)
+
+UI_TRACK_LIMIT = 300
+UI_KEYS = frozenset(
+    {
+        "ui_chat_id",
+        "ui_tracked_message_ids",
+        "ui_protected_message_ids",
+        "ui_welcome_message_id",
+        "ui_screen_message_id",
+    }
+)
+
+
+def _optional_int(value: Any) -> int | None:
+    return int(value) if value is not None else None
+
+
+class UiState:
+    """UI message bookkeeping for one FSM context."""
+
+    def __init__(self, state, data: Mapping[str, Any]) -> None:
+        self._state = state
+        self.chat_id = _optional_int(data.get("ui_chat_id"))
+        self.welcome_id = _optional_int(data.get("ui_welcome_message_id"))
+        self.screen_id = _optional_int(data.get("ui_screen_message_id"))
+        self.tracked: deque[int] = deque(
+            (int(item) for item in data.get("ui_tracked_message_ids") or ()),
+            maxlen=UI_TRACK_LIMIT,
+        )
+        self.protected: deque[int] = deque(
+            (int(item) for item in data.get("ui_protected_message_ids") or ()),
+            maxlen=UI_TRACK_LIMIT,
+        )
+        self._dirty: set[str] = set()
+
+    @classmethod
+    async def load(cls, state) -> "UiState":
+        return cls(state, await state.get_data())
+
+    def claim_chat(self, chat_id: int) -> None:
+        if self.chat_id is None:
+            self.chat_id = int(chat_id)
+            self._dirty.add("ui_chat_id")
+
+    def set_chat(self, chat_id: int) -> None:
+        if self.chat_id != int(chat_id):
+            self.chat_id = int(chat_id)
+            self._dirty.add("ui_chat_id")
+
+    def track(self, chat_id: int, message_id: int) -> None:
+        self.claim_chat(chat_id)
+        if int(message_id) not in self.tracked:
+            self.tracked.append(int(message_id))
+            self._dirty.add("ui_tracked_message_ids")
+
+    def protect(self, chat_id: int, message_id: int) -> None:
+        self.claim_chat(chat_id)
+        if int(message_id) not in self.protected:
+            self.protected.append(int(message_id))
+            self._dirty.add("ui_protected_message_ids")
+
+    def replace_tracked(self, message_ids: Iterable[int]) -> None:
+        self.tracked = deque((int(item) for item in message_ids), maxlen=UI_TRACK_LIMIT)
+        self._dirty.add("ui_tracked_message_ids")
+
+    def set_welcome(self, message_id: int) -> None:
+        self.welcome_id = int(message_id)
+        self._dirty.add("ui_welcome_message_id")
+
+    def set_screen(self, message_id: int) -> None:
+        self.screen_id = int(message_id)
+        self._dirty.add("ui_screen_message_id")
+
+    def protected_ids(self) -> set[int]:
+        """Ids that must never be deleted (the welcome message)."""
+
+        return {self.welcome_id} if self.welcome_id is not None else set()
+
+    def pending(self) -> dict[str, Any]:
+        values = {
+            "ui_chat_id": self.chat_id,
+            "ui_tracked_message_ids": list(self.tracked),
+            "ui_protected_message_ids": list(self.protected),
+            "ui_welcome_message_id": self.welcome_id,
+            "ui_screen_message_id": self.screen_id,
+        }
+        return {key: values[key] for key in self._dirty}
+
+    async def flush(self) -> None:
+        if not self._dirty:
+            return
+        changes = self.pending()
+        self._dirty.clear()
+        await self._state.update_data(**changes)
+
+
+class UiScopedContext(FSMContext):
+    """FSMContext that buffers UI bookkeeping for the lifetime of one update."""
+
+    def __init__(self, storage, key) -> None:
+        super().__init__(storage=storage, key=key)
+        self.ui: UiState | None = None
+
+    async def ui_state(self) -> UiState:
+        if self.ui is None:
+            self.ui = await UiState.load(self)
+        return self.ui
+
+    async def get_data(self) -> dict[str, Any]:
+        data = await super().get_data()
+        if self.ui is not None:
+            data.update(self.ui.pending())
+        return data
+
+    async def set_data(self, data: Mapping[str, Any]) -> None:
+        await super().set_data(data)
+        # clear() goes through here too; pending UI changes are dropped with it.
+        if self.ui is not None:
+            self.ui = UiState(self, data)
+
+    async def update_data(
+        self, data: Mapping[str, Any] | None = None, **kwargs: Any
+    ) -> dict[str, Any]:
+        if data:
+            kwargs.update(data)
+        result = await super().update_data(**kwargs)
+        if self.ui is not None and UI_KEYS.intersection(kwargs):
+            pending = self.ui.pending()
+            self.ui = UiState(self, {**result, **pending})
+            self.ui._dirty.update(pending)
+        return result
+
+    async def flush_ui(self) -> None:
+        if self.ui is not None:
+            await self.ui.flush()
+
+
+@asynccontextmanager
+async def ui_state(state) -> AsyncIterator[UiState]:
+    """Yield the UI state of ``state``; writes it back when not update-scoped."""
+
+    if isinstance(state, UiScopedContext):
+        yield await state.ui_state()
+        return
+    current = await UiState.load(state)
+    yield current
+    await current.flush()
+
+
+class UiStateMiddleware(BaseMiddleware):
+    """Outer update middleware giving handlers an update-scoped FSM context.
+
+    Must be registered after aiogram's FSM middleware so ``data["state"]``
+    is already resolved.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[Any, dict[str, Any]], Awaitable[Any]],
+        event: Any,
+        data: dict[str, Any],
+    ) -> Any:
+        state = data.get("state")
+        if state is None or isinstance(state, UiScopedContext):
+            return await handler(event, data)
+        scoped = UiScopedContext(state.storage, state.key)
+        data["state"] = scoped
+        try:
+            return await handler(event, data)
+        finally:
+            try:
+                await scoped.flush_ui()
+            except Exception as exc:  # noqa: BLE001
+                LOGGER.error("Failed to flush UI state for %s: %s", scoped.key, exc)
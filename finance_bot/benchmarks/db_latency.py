@@ -0,0 +1,165 @@
+"""Concurrent-user latency benchmark for FinanceDatabase access.
+
+Simulates many users issuing cheap requests (debt summary) while a few
+users run the heavy monthly report, and compares per-request latency when
+queries run directly on the event loop against AsyncFinanceDatabase.
+
+Usage (from ``finance_bot``)::
+
+    python -m benchmarks.db_latency --users 200 --requests 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from Bot.database import crud  # noqa: E402
+from Bot.database.async_db import AsyncFinanceDatabase  # noqa: E402
+
+LOOP_PROBE_INTERVAL = 0.005
+
+
+def _seed(db: crud.FinanceDatabase, users: int, rows_per_user: int) -> None:
+    cursor = db.connection.cursor()
+    rows = []
+    for user_id in range(1, users + 1):
+        for index in range(rows_per_user):
+            rows.append(
+                (
+                    user_id,
+                    round(random.uniform(10, 5000), 2),
+                    random.choice(["food", "transport", "fun", "home"]),
+                    random.choice(["income", "expense"]),
+                    "",
+                    f"2026-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}T12:00:00",
+                )
+            )
+    cursor.executemany(
+        f'INSERT INTO "{db.tables.income_log}" (user_id, amount, category, type, note, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+        rows,
+    )
+    db.connection.commit()
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def _run_load(
+    light: Callable[[int], Awaitable[object]],
+    heavy: Callable[[int], Awaitable[object]],
+    users: int,
+    requests: int,
+    heavy_users: int,
+    rate: float,
+) -> Tuple[List[float], List[float]]:
+    """Open-loop load: requests arrive on a fixed schedule per user.
+
+    Latency is measured from the scheduled arrival time, so time spent
+    waiting for a blocked event loop counts against the request. A probe
+    task also records how late the event loop wakes up (loop stall).
+    """
+
+    latencies: List[float] = []
+    loop = asyncio.get_running_loop()
+    origin = loop.time()
+    done = asyncio.Event()
+    stalls: List[float] = []
+
+    async def watch_loop() -> None:
+        while not done.is_set():
+            expected = loop.time() + LOOP_PROBE_INTERVAL
+            await asyncio.sleep(LOOP_PROBE_INTERVAL)
+            stalls.append(max(0.0, loop.time() - expected) * 1000)
+
+    async def user_session(user_id: int) -> None:
+        call = heavy if user_id <= heavy_users else light
+        offset = random.uniform(0, 1 / rate)
+        for index in range(requests):
+            arrival = origin + offset + index / rate
+            delay = arrival - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await call(user_id)
+            latencies.append((loop.time() - arrival) * 1000)
+
+    watcher = asyncio.create_task(watch_loop())
+    await asyncio.gather(*(user_session(uid) for uid in range(1, users + 1)))
+    done.set()
+    await watcher
+    return latencies, stalls
+
+
+def _report(label: str, result: Tuple[List[float], List[float]], elapsed: float) -> None:
+    latencies, stalls = result
+    print(
+        f"{label:<8} n={len(latencies):<6} "
+        f"p50={statistics.median(latencies):8.2f}ms "
+        f"p99={_percentile(latencies, 99):8.2f}ms "
+        f"max={max(latencies):8.2f}ms "
+        f"loop_stall_p99={_percentile(stalls or [0.0], 99):8.2f}ms "
+        f"wall={elapsed:6.2f}s"
+    )
+
+
+async def _benchmark(args: argparse.Namespace) -> None:
+    db = crud.FinanceDatabase()
+    _seed(db, args.users, args.rows)
+
+    async def sync_light(user_id: int) -> object:
+        return db.get_debt_summary(user_id)
+
+    async def sync_heavy(user_id: int) -> object:
+        return db.get_monthly_report_data(user_id, 2026, 6)
+
+    started = time.perf_counter()
+    result = await _run_load(sync_light, sync_heavy, args.users, args.requests, args.heavy_users, args.rate)
+    _report("sync", result, time.perf_counter() - started)
+
+    adb = AsyncFinanceDatabase(db, read_pool_size=args.pool)
+
+    async def async_light(user_id: int) -> object:
+        return await adb.get_debt_summary(user_id)
+
+    async def async_heavy(user_id: int) -> object:
+        return await adb.get_monthly_report_data(user_id, 2026, 6)
+
+    started = time.perf_counter()
+    result = await _run_load(async_light, async_heavy, args.users, args.requests, args.heavy_users, args.rate)
+    _report("async", result, time.perf_counter() - started)
+
+    await adb.close()
+    db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--heavy-users", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=500, help="income log rows per user")
+    parser.add_argument("--rate", type=float, default=20.0, help="requests per second per user")
+    parser.add_argument("--pool", type=int, default=4, help="read pool size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        crud.DB_PATH = Path(tmp) / "finance.db"
+        crud.FinanceDatabase._instance = None
+        asyncio.run(_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""FSM storage memory: aiogram MemoryStorage vs. SQLiteStorage.
+
+Simulates ``--users`` users who each went through a flow once (a state,
+a list of tracked UI message ids and a settings navigation stack) and
+then went idle, and reports the Python heap held by each storage with
+tracemalloc. SQLiteStorage keeps at most ``--cache-size`` users in memory;
+the rest live only in the database file.
+
+Usage (from ``finance_bot``)::
+
+    python -m benchmarks.fsm_memory --users 100000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from aiogram.fsm.storage.base import StorageKey  # noqa: E402
+from aiogram.fsm.storage.memory import MemoryStorage  # noqa: E402
+
+from Bot.database import crud  # noqa: E402
+from Bot.database.fsm_storage import SQLiteStorage  # noqa: E402
+
+
+def _payload(user_id: int, tracked: int) -> dict:
+    return {
+        "ui_tracked_message_ids": list(range(user_id * 1000, user_id * 1000 + tracked)),
+        "settings_nav_stack": ["st:home", "st:wishlist", "st:byt"],
+        "settings_current_screen": "st:byt",
+        "in_settings": True,
+    }
+
+
+async def _fill(storage, users: int, tracked: int) -> float:
+    started = time.perf_counter()
+    for user_id in range(1, users + 1):
+        key = StorageKey(bot_id=1, chat_id=user_id, user_id=user_id)
+        await storage.set_state(key, "SettingsStates:byt")
+        await storage.set_data(key, _payload(user_id, tracked))
+    return time.perf_counter() - started
+
+
+def _measure(factory, users: int, tracked: int) -> tuple[int, float, object]:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    storage = factory()
+    elapsed = asyncio.run(_fill(storage, users, tracked))
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return held, elapsed, storage
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--tracked", type=int, default=30, help="tracked message ids per user")
+    parser.add_argument("--cache-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    held, elapsed, memory_storage = _measure(MemoryStorage, args.users, args.tracked)
+    print(f"MemoryStorage: {held / 2**20:8.1f} MiB held, fill {elapsed:6.2f}s")
+    del memory_storage
+
+    with tempfile.TemporaryDirectory() as tmp:
+        crud.DB_PATH = Path(tmp) / "finance.db"
+        crud.FinanceDatabase._instance = None
+        db = crud.FinanceDatabase()
+        held, elapsed, storage = _measure(
+            lambda: SQLiteStorage(db, cache_size=args.cache_size), args.users, args.tracked
+        )
+        size = crud.DB_PATH.stat().st_size + Path(f"{crud.DB_PATH}-wal").stat().st_size
+        print(
+            f"SQLiteStorage: {held / 2**20:8.1f} MiB held, fill {elapsed:6.2f}s,"
+            f" {storage.stats()['cached']} cached, {size / 2**20:.1f} MiB on disk"
+        )
+
+        restarted = SQLiteStorage(db, cache_size=args.cache_size)
+        key = StorageKey(bot_id=1, chat_id=args.users // 2, user_id=args.users // 2)
+        started = time.perf_counter()
+        data = asyncio.run(restarted.get_data(key))
+        print(
+            f"after restart: {len(data['ui_tracked_message_ids'])} tracked ids restored"
+            f" in {(time.perf_counter() - started) * 1000:.2f}ms"
+        )
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
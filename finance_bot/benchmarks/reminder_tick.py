@@ -0,0 +1,130 @@
+"""Reminder scheduler tick cost: full per-user scan vs. due-time index.
+
+Seeds a temporary database with ``--reminders`` reminders spread over
+users (``--per-user`` each) with random daily times, then measures one
+scheduler tick both ways. Sending is left out; only the work needed to
+decide what is due is timed.
+
+Usage (from ``finance_bot``)::
+
+    python -m benchmarks.reminder_tick --reminders 100000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from Bot.database import crud  # noqa: E402
+from Bot.services.reminder_index import ReminderIndex  # noqa: E402
+from Bot.services.reminder_service import should_fire_at  # noqa: E402
+
+CATEGORIES = ("habits", "food", "motivation", "wishlist")
+
+
+def _seed(db: crud.FinanceDatabase, reminders: int, per_user: int) -> int:
+    users = max(1, reminders // per_user)
+    cursor = db.connection.cursor()
+    now_iso = datetime.now().isoformat()
+    cursor.executemany(
+        f'INSERT INTO "{db.tables.user_settings}" (user_id, timezone, created_at, updated_at) VALUES (?, ?, ?, ?)',
+        [(uid, "UTC", now_iso, now_iso) for uid in range(1, users + 1)],
+    )
+    reminder_rows = []
+    schedule_rows = []
+    for rid in range(1, reminders + 1):
+        uid = (rid - 1) // per_user + 1
+        category = random.choice(("habits", "food", "wishlist"))
+        reminder_rows.append((rid, uid, category, f"r{rid}", 1, 0, now_iso, now_iso))
+        times = sorted({f"{random.randint(0, 23):02d}:{random.randint(0, 59):02d}" for _ in range(2)})
+        schedule_rows.append((rid, "specific_times", json.dumps(times)))
+    cursor.executemany(
+        f'INSERT INTO "{db.tables.reminders}" (id, user_id, category, title, is_enabled, position, created_at, updated_at)'
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        reminder_rows,
+    )
+    cursor.executemany(
+        f'INSERT INTO "{db.tables.reminder_schedules}" (reminder_id, schedule_type, times_json) VALUES (?, ?, ?)',
+        schedule_rows,
+    )
+    db.connection.commit()
+    return users
+
+
+def _legacy_tick(db: crud.FinanceDatabase, now_dt: datetime) -> int:
+    """What the old scheduler did per tick, minus sending."""
+    label = now_dt.strftime("%H:%M")
+    due = 0
+    for uid in db.get_users_with_active_reminders():
+        for category in CATEGORIES:
+            for reminder in db.list_reminders_by_category(uid, category):
+                if not reminder.get("is_enabled"):
+                    continue
+                schedule = db.get_reminder_schedule(reminder["id"])
+                if schedule and should_fire_at(schedule, label, now_dt):
+                    due += 1
+    return due
+
+
+def _index_tick(db: crud.FinanceDatabase, index: ReminderIndex, now_dt: datetime) -> int:
+    due = 0
+    for item in index.pop_due(now_dt):
+        if db.get_reminder(item.reminder_id):
+            due += 1
+    return due
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reminders", type=int, default=100_000)
+    parser.add_argument("--per-user", type=int, default=5)
+    parser.add_argument("--ticks", type=int, default=5, help="index ticks to average")
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        crud.DB_PATH = Path(tmp) / "finance.db"
+        crud.FinanceDatabase._instance = None
+        db = crud.FinanceDatabase()
+        started = time.perf_counter()
+        users = _seed(db, args.reminders, args.per_user)
+        print(f"seeded {args.reminders} reminders for {users} users in {time.perf_counter() - started:.1f}s")
+
+        tick = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+        index = ReminderIndex(db, "UTC")
+        started = time.perf_counter()
+        index.rebuild(tick)
+        print(f"index build: {time.perf_counter() - started:8.3f}s ({len(index)} entries)")
+
+        total = 0.0
+        due_total = 0
+        for offset in range(args.ticks):
+            now_dt = tick + timedelta(minutes=offset)
+            started = time.perf_counter()
+            due_total += _index_tick(db, index, now_dt)
+            total += time.perf_counter() - started
+        print(
+            f"index tick:  {total / args.ticks * 1000:8.2f}ms avg over {args.ticks} ticks"
+            f" ({due_total / args.ticks:.1f} due per tick)"
+        )
+
+        if not args.skip_legacy:
+            started = time.perf_counter()
+            due = _legacy_tick(db, tick)
+            print(f"legacy tick: {(time.perf_counter() - started) * 1000:8.2f}ms ({due} due)")
+
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
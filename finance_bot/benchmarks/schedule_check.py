@@ -0,0 +1,144 @@
+"""Schedule checks: per-call string parsing vs. compiled schedules.
+
+Builds ``--schedules`` random reminder schedules (specific times and
+intervals with activity windows) and times ``should_fire_at`` for every
+schedule at ``--labels`` minutes of the day, once with the previous
+implementation (``json.loads`` and ``HH:MM`` splitting on every call) and
+once with the compiled bitset. Also times the "next fire minute" lookup.
+
+Usage (from ``finance_bot``)::
+
+    python -m benchmarks.schedule_check --schedules 10000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from Bot.services.reminder_service import should_fire_at  # noqa: E402
+from Bot.utils.schedules import compiled_schedule, invalidate_compiled_schedule  # noqa: E402
+
+
+def _string_should_fire_at(schedule: dict, time_label: str, now_dt: datetime) -> bool:
+    """``should_fire_at`` as it was before schedules were compiled."""
+    active_from = schedule.get("active_from")
+    active_to = schedule.get("active_to")
+    if active_from and active_to:
+        if not (active_from <= time_label <= active_to):
+            return False
+    schedule_type = schedule.get("schedule_type", "specific_times")
+    if schedule_type == "specific_times":
+        times_json = schedule.get("times_json")
+        if not times_json:
+            return False
+        try:
+            times = json.loads(times_json) if isinstance(times_json, str) else times_json
+        except (json.JSONDecodeError, TypeError):
+            return False
+        return time_label in times
+    if schedule_type == "interval":
+        interval = schedule.get("interval_minutes")
+        if not interval or interval < 15:
+            return False
+        start_minutes = 0
+        if active_from:
+            parts = active_from.split(":")
+            if len(parts) == 2:
+                start_minutes = int(parts[0]) * 60 + int(parts[1])
+        current_parts = time_label.split(":")
+        if len(current_parts) != 2:
+            return False
+        elapsed = int(current_parts[0]) * 60 + int(current_parts[1]) - start_minutes
+        if elapsed < 0:
+            return False
+        return elapsed % interval == 0
+    return False
+
+
+def _string_next_minute(schedule: dict, minute: int, now_dt: datetime) -> int | None:
+    for candidate in range(minute + 1, 24 * 60):
+        if _string_should_fire_at(schedule, f"{candidate // 60:02d}:{candidate % 60:02d}", now_dt):
+            return candidate
+    return None
+
+
+def _schedules(count: int) -> list[dict]:
+    rows = []
+    for reminder_id in range(1, count + 1):
+        window = {"active_from": "08:00", "active_to": "22:00"} if reminder_id % 2 else {}
+        if reminder_id % 3:
+            times = sorted(
+                {f"{random.randint(0, 23):02d}:{random.randint(0, 59):02d}" for _ in range(4)}
+            )
+            rows.append(
+                {"reminder_id": reminder_id, "schedule_type": "specific_times",
+                 "times_json": json.dumps(times), **window}
+            )
+        else:
+            rows.append(
+                {"reminder_id": reminder_id, "schedule_type": "interval",
+                 "interval_minutes": random.choice((15, 30, 60, 90)), **window}
+            )
+    return rows
+
+
+def _timed(label: str, func, *args) -> float:
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<22} {elapsed * 1000:9.2f}ms ({result} hits)")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schedules", type=int, default=10_000)
+    parser.add_argument("--labels", type=int, default=60, help="minutes of the day to check")
+    args = parser.parse_args()
+
+    random.seed(17)
+    rows = _schedules(args.schedules)
+    now_dt = datetime(2026, 1, 1, 12, 0)
+    minutes = random.sample(range(24 * 60), min(args.labels, 24 * 60))
+    labels = [f"{m // 60:02d}:{m % 60:02d}" for m in minutes]
+
+    def check(func) -> int:
+        return sum(1 for label in labels for row in rows if func(row, label, now_dt))
+
+    def next_lookups(compiled: bool) -> int:
+        found = 0
+        for row in rows[: max(1, len(rows) // 10)]:
+            for minute in minutes[:10]:
+                if compiled:
+                    hit = compiled_schedule(row).next_minute(minute)
+                else:
+                    hit = _string_next_minute(row, minute, now_dt)
+                found += hit is not None
+        return found
+
+    checks = args.schedules * len(labels)
+    print(f"{args.schedules} schedules x {len(labels)} labels = {checks} checks")
+    string_time = _timed("string should_fire_at", check, _string_should_fire_at)
+    invalidate_compiled_schedule()
+    started = time.perf_counter()
+    for row in rows:
+        compiled_schedule(row)
+    print(f"{'compile (cold)':<22} {(time.perf_counter() - started) * 1000:9.2f}ms")
+    compiled_time = _timed("compiled should_fire_at", check, should_fire_at)
+    print(f"speedup: {string_time / compiled_time:.1f}x")
+    string_next = _timed("string next minute", next_lookups, False)
+    compiled_next = _timed("compiled next minute", next_lookups, True)
+    print(f"speedup: {string_next / compiled_next:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
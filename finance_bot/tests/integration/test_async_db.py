@@ -0,0 +1,141 @@
+"""Integration tests for the pooled async database facade."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from Bot.database import crud
+from Bot.database.async_db import READ_METHODS, AsyncFinanceDatabase
+
+
+def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
+    monkeypatch.setattr(crud, "DB_PATH", tmp_path / "finance.db")
+    crud.FinanceDatabase._instance = None
+    return crud.FinanceDatabase()
+
+
+def test_read_methods_exist_on_finance_database() -> None:
+    missing = [name for name in READ_METHODS if not hasattr(crud.FinanceDatabase, name)]
+    assert missing == []
+
+
+def test_async_db_round_trip(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    adb = AsyncFinanceDatabase(db, read_pool_size=2)
+
+    async def run_test() -> None:
+        expense_id = await adb.add_expense(1, 250.0, "food", "lunch")
+        assert expense_id
+        debt_id = await adb.add_debt(1, "Ivan", 100.0, "owe", "")
+        assert debt_id
+        results = await asyncio.gather(
+            *(adb.get_debt_summary(1) for _ in range(8))
+        )
+        assert all(item["i_owe"] == 100.0 for item in results)
+        assert await adb.household_status_exists(1, "2026-01") is False
+        assert await adb.get_household_payment_status_map(1, "2026-01") == {}
+        await adb.close()
+
+    try:
+        asyncio.run(run_test())
+    finally:
+        adb.shutdown()
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_read_pool_connections_are_read_only(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    adb = AsyncFinanceDatabase(db, read_pool_size=1)
+
+    def write_from_reader() -> None:
+        db.connection.execute(
+            f'DELETE FROM "{db.tables.debts}" WHERE user_id = ?', (1,)
+        )
+
+    async def run_test() -> None:
+        loop = asyncio.get_running_loop()
+        with pytest.raises(sqlite3.OperationalError):
+            await loop.run_in_executor(adb._read_executor, write_from_reader)
+        await adb.close()
+
+    try:
+        asyncio.run(run_test())
+    finally:
+        adb.shutdown()
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_pragmas_enable_wal(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        mode = db.connection.execute("PRAGMA journal_mode").fetchone()[0]
+        sync = db.connection.execute("PRAGMA synchronous").fetchone()[0]
+        assert mode.lower() == "wal"
+        assert sync == 1  # NORMAL
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_group_commit_batches_small_writes(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    adb = AsyncFinanceDatabase(db, commit_window=0.05)
+
+    async def run_test() -> None:
+        await asyncio.gather(
+            *(
+                adb.increment_reminder_stat(1, "2026-01-01", "habits", "shown_count")
+                for _ in range(50)
+            )
+        )
+        stats = await adb.get_reminder_stats(1, "2026-01-01", "habits")
+        assert sum(row["shown_count"] for row in stats) == 50
+        assert adb.writer.jobs == 50
+        assert adb.writer.batches < 50
+        await adb.close()
+
+    try:
+        asyncio.run(run_test())
+    finally:
+        adb.shutdown()
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_group_commit_isolates_failing_job(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    adb = AsyncFinanceDatabase(db, commit_window=0.05)
+
+    def failing(db_: crud.FinanceDatabase) -> None:
+        db_.log_income(1, 999.0, "broken", "income")
+        raise ValueError("boom")
+
+    async def run_test() -> None:
+        writer = adb.writer
+        ok_first = asyncio.wrap_future(
+            writer.submit(db.log_income, (1, 10.0, "food", "income"), {}, True)
+        )
+        bad = asyncio.wrap_future(writer.submit(failing, (db,), {}, True))
+        ok_second = asyncio.wrap_future(
+            writer.submit(db.log_income, (1, 20.0, "food", "income"), {}, True)
+        )
+        await ok_first
+        with pytest.raises(ValueError):
+            await bad
+        await ok_second
+        await adb.flush()
+        rows = db.connection.execute(
+            f'SELECT amount FROM "{db.tables.income_log}" WHERE user_id = 1 ORDER BY amount'
+        ).fetchall()
+        assert [row["amount"] for row in rows] == [10.0, 20.0]
+        await adb.close()
+
+    try:
+        asyncio.run(run_test())
+    finally:
+        adb.shutdown()
+        db.close()
+        crud.FinanceDatabase._instance = None
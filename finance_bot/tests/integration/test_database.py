@@ -33,3 +33,32 @@ def test_update_saving_and_purchase() -> None:
     db.add_purchase(1, "Test", 10.0, "Инструменты")
     purchases = db.get_purchases_by_user(1)
     assert len(purchases) == 1
+
+
+def test_household_items_with_status() -> None:
+    """Items come back in position order with the month's paid flag."""
+
+    db = FinanceDatabase()
+    user_id = 77701
+    db.connection.execute(
+        f"DELETE FROM {TABLES.household_payment_items} WHERE user_id = ?", (user_id,)
+    )
+    db.connection.execute(
+        f"DELETE FROM {TABLES.household_payments} WHERE user_id = ?", (user_id,)
+    )
+    db.connection.commit()
+    db.add_household_payment_item(user_id, "rent", "Аренда", 30000, 2)
+    db.add_household_payment_item(user_id, "phone", "Связь", 500, 1)
+    db.add_household_payment_item(user_id, "gym", "Зал", 2000, 3)
+    db.deactivate_household_payment_item(user_id, "gym")
+
+    rows = db.list_household_items_with_status(user_id, "2026-03")
+    assert [(row["code"], row["is_paid"]) for row in rows] == [("phone", 0), ("rent", 0)]
+
+    db.apply_household_payment_answer(
+        user_id=user_id, month="2026-03", question_code="rent", amount=None, answer="yes"
+    )
+    rows = db.list_household_items_with_status(user_id, "2026-03")
+    assert [(row["code"], row["is_paid"]) for row in rows] == [("phone", 0), ("rent", 1)]
+    assert rows[1]["amount"] == 30000
+    assert all(not row["is_paid"] for row in db.list_household_items_with_status(user_id, "2026-04"))
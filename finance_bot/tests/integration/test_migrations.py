@@ -25,3 +25,56 @@ def test_migrations_create_user_settings_and_indexes(tmp_path, monkeypatch) -> N
     finally:
         db.close()
         crud.FinanceDatabase._instance = None
+
+
+def test_unique_savings_migration_folds_duplicates(tmp_path) -> None:
+    connection = crud.sqlite3.connect(tmp_path / "legacy.db")
+    cursor = connection.cursor()
+    cursor.execute(
+        f'CREATE TABLE "{crud.TABLES.savings}" ('
+        "id INTEGER PRIMARY KEY, user_id INTEGER, category TEXT,"
+        " current REAL, goal REAL, purpose TEXT)"
+    )
+    cursor.executemany(
+        f'INSERT INTO "{crud.TABLES.savings}" (user_id, category, current, goal, purpose)'
+        " VALUES (?, ?, ?, ?, ?)",
+        [(1, "быт", 100.0, 0, ""), (1, "быт", 50.0, 300.0, "чайник"), (1, "еда", 10.0, 0, "")],
+    )
+    cursor.execute("PRAGMA user_version = 5")
+    connection.commit()
+
+    crud.migrate_schema(connection)
+
+    cursor.execute(
+        f'SELECT category, current, goal, purpose FROM "{crud.TABLES.savings}" ORDER BY category'
+    )
+    assert cursor.fetchall() == [("быт", 150.0, 300.0, "чайник"), ("еда", 10.0, 0, "")]
+    cursor.execute(f'PRAGMA index_list("{crud.TABLES.savings}")')
+    assert "uniq_savings_user_category" in {row[1] for row in cursor.fetchall()}
+    connection.close()
+
+
+def test_distribute_income_is_one_transaction(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(crud, "DB_PATH", tmp_path / "finance.db")
+    crud.FinanceDatabase._instance = None
+    db = crud.FinanceDatabase()
+    try:
+        db.update_saving(7, "быт", 100.0)
+        assert db.distribute_income(7, [("быт", 25.0), ("еда", 75.0)])
+        savings = db.get_user_savings(7)
+        assert savings["быт"]["current"] == 125.0
+        assert savings["еда"]["current"] == 75.0
+        cursor = db.connection.cursor()
+        cursor.execute(
+            f'SELECT category, amount FROM "{crud.TABLES.income_log}"'
+            " WHERE user_id = 7 ORDER BY category"
+        )
+        assert [tuple(row) for row in cursor.fetchall()] == [("быт", 25.0), ("еда", 75.0)]
+
+        cursor.execute(f'DROP TABLE "{crud.TABLES.income_log}"')
+        db.connection.commit()
+        assert not db.distribute_income(7, [("быт", 1.0)])
+        assert db.get_user_savings(7)["быт"]["current"] == 125.0
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
@@ -0,0 +1,106 @@
+"""Tests for the materialized monthly totals rollup."""
+from datetime import datetime
+
+from Bot.database import crud
+from Bot.database.crud import TABLES
+
+
+def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
+    db_path = tmp_path / "finance.db"
+    monkeypatch.setattr(crud, "DB_PATH", db_path)
+    crud.FinanceDatabase._instance = None
+    return crud.FinanceDatabase()
+
+
+def _snapshot(db: crud.FinanceDatabase) -> list[tuple]:
+    cursor = db.connection.cursor()
+    cursor.execute(
+        f'SELECT user_id, month, kind, category, ROUND(total, 6), entries'
+        f' FROM "{TABLES.monthly_totals}" ORDER BY 1, 2, 3, 4'
+    )
+    return [tuple(row) for row in cursor.fetchall()]
+
+
+def test_writes_keep_rollup_in_step(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        month = datetime.utcnow().strftime("%Y-%m")
+        year, mon = (int(part) for part in month.split("-"))
+        db.log_income(1, 1000.0, "Зарплата")
+        db.log_income(1, 250.0, "Зарплата")
+        food = db.add_expense(1, 300.0, "Еда")
+        db.add_expense(1, 50.0, "Еда")
+        db.add_expense(1, 20.0, None)
+        wish_id = db.add_wish(1, "Книга", 80.0, None, "Хобби")
+        db.purchase_wish(1, wish_id, None)
+        assert db.delete_expense(1, food)
+
+        totals = {
+            (row["kind"], row["category"]): (row["total"], row["entries"])
+            for row in db.get_monthly_totals(1, month)
+        }
+        assert totals == {
+            ("income", "Зарплата"): (1250.0, 2),
+            ("expense", "Еда"): (50.0, 1),
+            ("expense", ""): (20.0, 1),
+            ("purchase", "Хобби"): (80.0, 1),
+        }
+
+        incremental = _snapshot(db)
+        assert db.rebuild_monthly_totals() == len(incremental)
+        assert _snapshot(db) == incremental
+
+        report = db.get_monthly_report_data(1, year, mon)
+        assert report["total_income"] == 1250.0
+        assert report["total_expense"] == 150.0
+        assert {c["category"]: c["amount"] for c in report["expense_by_category"]} == {
+            "": 20.0,
+            "Еда": 50.0,
+        }
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_deleting_last_entry_drops_rollup_row(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        expense_id = db.add_expense(3, 10.0, "Такси")
+        assert len(db.get_monthly_totals(3, datetime.utcnow().strftime("%Y-%m"))) == 1
+        db.delete_expense(3, expense_id)
+        assert _snapshot(db) == []
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_existing_history_is_backfilled(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        cursor = db.connection.cursor()
+        # Simulate a database created before the rollup existed.
+        for name in ("income_log", "purchases"):
+            for event in ("insert", "delete", "update"):
+                cursor.execute(f"DROP TRIGGER trg_{name}_totals_{event}")
+        cursor.execute(f'DROP TABLE "{TABLES.monthly_totals}"')
+        cursor.executemany(
+            f'INSERT INTO "{TABLES.income_log}" (user_id, amount, category, type, note, created_at)'
+            " VALUES (?, ?, ?, ?, '', ?)",
+            [
+                (5, 100.0, "Еда", "expense", "2025-01-03T10:00:00"),
+                (5, 40.0, "Еда", "expense", "2025-01-20T10:00:00"),
+                (5, 7.0, "Еда", "expense", "2025-02-01T00:00:00"),
+            ],
+        )
+        db.connection.commit()
+        db.close()
+
+        crud.FinanceDatabase._instance = None
+        db = crud.FinanceDatabase()
+        expense_id = db.create_expense_category(5, "Еда")
+        db.set_budget_limit(5, expense_id, 200.0)
+        status = db.get_budget_status(5, 2025, 1)
+        assert [(s["category"], s["spent"]) for s in status] == [("Еда", 140.0)]
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
@@ -0,0 +1,133 @@
+"""Integration tests for SQL-side purchase retention and keyset pages."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from Bot.database import crud
+from Bot.database.crud import TABLES
+
+
+def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
+    db_path = tmp_path / "finance.db"
+    monkeypatch.setattr(crud, "DB_PATH", db_path)
+    crud.FinanceDatabase._instance = None
+    return crud.FinanceDatabase()
+
+
+def test_purchases_respect_per_category_retention(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        now = datetime.now(timezone.utc)
+        short = db.create_wishlist_category(1, "Быстрые")
+        db.update_wishlist_category_purchased_days(1, short, 3)
+        forever = db.create_wishlist_category(1, "Навсегда")
+        db.update_wishlist_category_purchased_mode(1, forever, "always")
+
+        db.add_purchase(1, "свежая", 10.0, "Быстрые", now - timedelta(days=1))
+        db.add_purchase(1, "старая", 10.0, "Быстрые", now - timedelta(days=5))
+        db.add_purchase(1, "вечная", 10.0, "Навсегда", now - timedelta(days=400))
+        db.add_purchase(1, "обычная", 10.0, "Прочее", now - timedelta(days=20))
+        db.add_purchase(1, "истёкшая", 10.0, "Прочее", now - timedelta(days=40))
+        db.add_purchase(2, "чужая", 10.0, "Прочее", now)
+
+        names = [row["wish_name"] for row in db.get_purchases_by_user(1)]
+        assert names == ["свежая", "обычная", "вечная"]
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_purchases_keyset_pages(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        moment = datetime.now(timezone.utc) - timedelta(hours=1)
+        for index in range(5):
+            # Two purchases share each timestamp, so ties are broken by id.
+            db.add_purchase(1, f"p{index}", 1.0, "Прочее", moment - timedelta(minutes=index // 2))
+
+        pages: list[list[str]] = []
+        after = None
+        while True:
+            page = db.get_purchases_by_user(1, limit=2, after=after)
+            if not page:
+                break
+            pages.append([row["wish_name"] for row in page])
+            after = (page[-1]["purchased_at_utc"], page[-1]["id"])
+        assert pages == [["p1", "p0"], ["p3", "p2"], ["p4"]]
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_naive_purchase_timestamps_use_user_timezone(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        db.ensure_user_settings(1)
+        cursor = db.connection.cursor()
+        cursor.execute(
+            f"UPDATE {TABLES.user_settings} SET timezone = 'Asia/Tokyo' WHERE user_id = 1"
+        )
+        db.connection.commit()
+        db.settings_cache.invalidate(1)
+
+        db.add_purchase(1, "чайник", 10.0, "Прочее", datetime(2026, 3, 1, 9, 0))
+        cursor.execute(f"SELECT purchased_at_utc FROM {TABLES.purchases} WHERE user_id = 1")
+        assert cursor.fetchone()[0] == "2026-03-01T00:00:00"
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_purchases_without_timestamp_are_kept(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        now = datetime.now(timezone.utc)
+        forever = db.create_wishlist_category(1, "Навсегда")
+        db.update_wishlist_category_purchased_mode(1, forever, "always")
+        db.add_purchase(1, "свежая", 10.0, "Прочее", now - timedelta(days=1))
+        # Rows the UTC backfill could not parse keep purchased_at_utc = ''.
+        db.connection.executemany(
+            f"""
+            INSERT INTO "{TABLES.purchases}"
+                (user_id, wish_name, price, category, purchased_at, purchased_at_utc)
+            VALUES (1, ?, 10.0, ?, ?, '')
+            """,
+            [("без даты", "Прочее", None), ("вечная без даты", "Навсегда", "")],
+        )
+        db.connection.commit()
+
+        names = [row["wish_name"] for row in db.get_purchases_by_user(1)]
+        assert names == ["свежая", "вечная без даты", "без даты"]
+
+        first = db.get_purchases_by_user(1, limit=2)
+        after = (first[-1]["purchased_at_utc"], first[-1]["id"])
+        assert [row["wish_name"] for row in db.get_purchases_by_user(1, after=after)] == ["без даты"]
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_unparsable_purchase_timestamps_follow_category_retention(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        forever = db.create_wishlist_category(1, "Навсегда")
+        db.update_wishlist_category_purchased_mode(1, forever, "always")
+        stored = crud._utc_timestamp("вчера", ZoneInfo("UTC"))
+        assert stored == crud.UNPARSABLE_TIMESTAMP
+        db.connection.executemany(
+            f"""
+            INSERT INTO "{TABLES.purchases}"
+                (user_id, wish_name, price, category, purchased_at, purchased_at_utc)
+            VALUES (1, ?, 10.0, ?, 'вчера', ?)
+            """,
+            [("битая", "Прочее", stored), ("вечная битая", "Навсегда", stored)],
+        )
+        db.connection.commit()
+
+        # Like before the SQL filter: hidden in day-limited categories only.
+        names = [row["wish_name"] for row in db.get_purchases_by_user(1)]
+        assert names == ["вечная битая"]
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
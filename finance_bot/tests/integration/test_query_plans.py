@@ -0,0 +1,109 @@
+"""Query-plan regression tests for hot FinanceDatabase queries.
+
+Every statement issued by the listed methods is captured through the
+connection's trace callback and re-run under ``EXPLAIN QUERY PLAN``; a
+plain ``SCAN <table>`` (no index) on any of them fails the test.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from datetime import date, datetime
+
+import pytest
+
+from Bot.database import crud
+
+USER_ID = 42
+_FULL_SCAN = re.compile(r"^SCAN (\S+)$")
+
+
+def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
+    db_path = tmp_path / "finance.db"
+    monkeypatch.setattr(crud, "DB_PATH", db_path)
+    crud.FinanceDatabase._instance = None
+    return crud.FinanceDatabase()
+
+
+def _run(result):
+    return asyncio.run(result) if asyncio.iscoroutine(result) else result
+
+
+HOT_QUERIES = {
+    "get_monthly_report_data": lambda db: db.get_monthly_report_data(USER_ID, 2026, 3),
+    "get_monthly_totals": lambda db: db.get_monthly_totals(USER_ID, "2026-03"),
+    "get_budget_status": lambda db: db.get_budget_status(USER_ID, 2026, 3),
+    "get_budget_status_between": lambda db: db.get_budget_status_between(
+        USER_ID, "2026-03-01T00:00:00", "2026-03-08T00:00:00"
+    ),
+    "list_expenses": lambda db: db.list_expenses(USER_ID, 2026, 3),
+    "get_wishes_by_user": lambda db: db.get_wishes_by_user(USER_ID),
+    "get_active_byt_wishes": lambda db: db.get_active_byt_wishes(USER_ID, "быт"),
+    "list_active_byt_items_for_reminder": lambda db: db.list_active_byt_items_for_reminder(
+        USER_ID, datetime(2026, 3, 1), "быт"
+    ),
+    "get_purchases_by_user": lambda db: db.get_purchases_by_user(USER_ID),
+    "purge_expired_byt_rows[purchases]": lambda db: db.purge_expired_byt_rows(
+        "purchases", USER_ID, "быт", "2026-03-01T00:00:00", 500
+    ),
+    "purge_expired_byt_rows[wishes]": lambda db: db.purge_expired_byt_rows(
+        "wishes", USER_ID, "быт", "2026-03-01T00:00:00", 500, dry_run=True
+    ),
+    "get_user_savings": lambda db: db.get_user_savings(USER_ID),
+    "get_unpaid_household_questions": lambda db: db.get_unpaid_household_questions(
+        USER_ID, "2026-03"
+    ),
+    "get_household_payment_status_map": lambda db: db.get_household_payment_status_map(
+        USER_ID, "2026-03"
+    ),
+    "list_household_items_with_status": lambda db: db.list_household_items_with_status(
+        USER_ID, "2026-03"
+    ),
+    "list_reminder_changes": lambda db: db.list_reminder_changes(0, 500),
+    "household_status_exists": lambda db: db.household_status_exists(USER_ID, "2026-03"),
+    "list_debts": lambda db: db.list_debts(USER_ID),
+    "get_debt_summary": lambda db: db.get_debt_summary(USER_ID),
+    "list_recurring_payments": lambda db: db.list_recurring_payments(USER_ID),
+    "get_due_recurring_payments": lambda db: db.get_due_recurring_payments(USER_ID, "2026-03-01"),
+    "post_due_recurring_payments": lambda db: db.post_due_recurring_payments(date(2026, 3, 1), 200),
+    "list_report_candidates": lambda db: db.list_report_candidates("2026-02", 2, 0, 200),
+    "list_reminders_by_category": lambda db: db.list_reminders_by_category(USER_ID, "habits"),
+    "get_pending_snooze_events": lambda db: db.get_pending_snooze_events(
+        USER_ID, "2026-03-01T09:00:00"
+    ),
+    "list_scheduled_reminders": lambda db: db.list_scheduled_reminders(user_id=USER_ID),
+}
+
+
+def _captured_statements(db: crud.FinanceDatabase, call) -> list[str]:
+    statements: list[str] = []
+    db.connection.set_trace_callback(statements.append)
+    try:
+        _run(call(db))
+    finally:
+        db.connection.set_trace_callback(None)
+    return [
+        sql
+        for sql in statements
+        if sql.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH"))
+    ]
+
+
+def _full_scans(db: crud.FinanceDatabase, sql: str) -> list[str]:
+    cursor = db.connection.cursor()
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+    return [row[3] for row in cursor.fetchall() if _FULL_SCAN.match(row[3])]
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_an_index(name, tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        db.add_expense(USER_ID, 10.0, "Еда")
+        statements = _captured_statements(db, HOT_QUERIES[name])
+        assert statements, f"{name} issued no queries"
+        for sql in statements:
+            assert not _full_scans(db, sql), f"{name} full scan in: {sql}"
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
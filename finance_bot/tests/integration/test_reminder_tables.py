@@ -108,6 +108,36 @@ def test_event_idempotency_via_hash(tmp_path, monkeypatch) -> None:
         crud.FinanceDatabase._instance = None
 
 
+def test_claim_reminder_slot_once_with_stat(tmp_path, monkeypatch) -> None:
+    """Only the first claim of a slot wins, and it counts as shown in one go."""
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        rid = db.create_reminder(1, "habits", "Вода")
+        meta = db.create_reminder(1, "motivation", "Расписание")
+        shown_at = "2026-01-01T12:00:00"
+
+        eid = db.claim_reminder_slot(rid, 1, shown_at, "slot_a", "habits")
+        assert eid is not None
+        assert db.claim_reminder_slot(rid, 1, shown_at, "slot_a", "habits") is None
+        assert db.get_reminder_event(eid)["event_type"] == "shown"
+
+        # A lost schedule-level slot rolls the item's event back too.
+        assert db.claim_reminder_slot(meta, 1, shown_at, "sched", "motivation") is not None
+        assert (
+            db.claim_reminder_slot(rid, 1, shown_at, "item_b", "motivation", slot=(meta, "sched"))
+            is None
+        )
+        assert db.get_reminder_event_by_hash("item_b") is None
+
+        db.increment_reminder_stat(1, "2026-01-01", "habits", "shown_count", -1)
+        db.increment_reminder_stat(1, "2026-01-01", "habits", "shown_count", -1)
+        stats = {row["category"]: row["shown_count"] for row in db.get_reminder_stats(1, "2026-01-01")}
+        assert stats == {"habits": 0, "motivation": 1}
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
 def test_event_action_idempotency(tmp_path, monkeypatch) -> None:
     """action_at check prevents double-acting on same event."""
     db = _fresh_db(tmp_path, monkeypatch)
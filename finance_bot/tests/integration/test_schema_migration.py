@@ -111,11 +111,16 @@ def test_schema_migration_renames_tables(tmp_path: Path) -> None:
     savings_row = cursor.fetchone()
     assert savings_row == ("БЫТ", 500.0)
 
-    cursor.execute(f"SELECT name FROM {TABLES.wishes}")
-    assert cursor.fetchone()[0] == "Чайник"
+    cursor.execute(f"SELECT name, category_key FROM {TABLES.wishes}")
+    assert cursor.fetchone() == ("Чайник", "быт")
 
-    cursor.execute(f"SELECT wish_name FROM {TABLES.purchases}")
-    assert cursor.fetchone()[0] == "Тест"
+    cursor.execute(
+        f"SELECT wish_name, category_key, purchased_at_utc, expires_at FROM {TABLES.purchases}"
+    )
+    name, category_key, purchased_at_utc, expires_at = cursor.fetchone()
+    assert (name, category_key) == ("Тест", "быт")
+    assert purchased_at_utc[:10] in ("2024-12-31", "2025-01-01")
+    assert expires_at[:10] in ("2025-01-31", "2025-02-01")
 
     cursor.execute(f"SELECT code FROM {TABLES.household_payment_items}")
     assert cursor.fetchone()[0] == "rent"
@@ -0,0 +1,103 @@
+"""Tests for budget periods and range-based budget status."""
+from datetime import date
+
+from Bot.database import crud
+from Bot.database.crud import TABLES
+from Bot.services.budget_service import resolve_budget_period
+from Bot.services.types import ServiceError
+
+
+def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
+    db_path = tmp_path / "finance.db"
+    monkeypatch.setattr(crud, "DB_PATH", db_path)
+    crud.FinanceDatabase._instance = None
+    return crud.FinanceDatabase()
+
+
+def test_resolve_budget_periods() -> None:
+    today = date(2026, 12, 17)  # Thursday
+
+    december = resolve_budget_period("month", today)
+    assert (december.start, december.end, december.month) == (
+        date(2026, 12, 1), date(2027, 1, 1), (2026, 12),
+    )
+    week = resolve_budget_period("week", today)
+    assert (week.start, week.end) == (date(2026, 12, 14), date(2026, 12, 21))
+    rolling = resolve_budget_period("rolling30", today)
+    assert (rolling.start, rolling.end) == (date(2026, 11, 18), date(2026, 12, 18))
+    custom = resolve_budget_period("custom", today, start=date(2026, 1, 5), end=date(2026, 1, 5))
+    assert (custom.start_iso, custom.end_iso) == ("2026-01-05T00:00:00", "2026-01-06T00:00:00")
+
+    assert december.limit_factor == 1.0
+    assert week.limit_factor == 7 / 31
+    assert abs(rolling.limit_factor - (13 / 30 + 17 / 31)) < 1e-9
+    quarter = resolve_budget_period("custom", today, start=date(2026, 1, 1), end=date(2026, 3, 31))
+    assert abs(quarter.limit_factor - 3.0) < 1e-9
+
+    assert isinstance(resolve_budget_period("custom", today), ServiceError)
+    assert isinstance(resolve_budget_period("quarter", today), ServiceError)
+
+
+def test_budget_status_between_groups_in_one_pass(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        food = db.create_expense_category(1, "Еда")
+        taxi = db.create_expense_category(1, "Такси")
+        db.create_expense_category(1, "Без лимита")
+        db.set_budget_limit(1, food, 1000.0)
+        db.set_budget_limit(1, taxi, 200.0)
+        cursor = db.connection.cursor()
+        cursor.executemany(
+            f'INSERT INTO "{TABLES.income_log}" (user_id, amount, category, type, note, created_at)'
+            " VALUES (?, ?, ?, ?, '', ?)",
+            [
+                (1, 300.0, "Еда", "expense", "2026-03-02T09:00:00"),
+                (1, 100.0, "Еда", "expense", "2026-03-08T23:59:59"),
+                (1, 50.0, "Еда", "expense", "2026-03-09T00:00:00"),
+                (1, 70.0, "Такси", "income", "2026-03-03T00:00:00"),
+                (2, 999.0, "Еда", "expense", "2026-03-03T00:00:00"),
+            ],
+        )
+        db.connection.commit()
+
+        week = resolve_budget_period("week", date(2026, 3, 4))
+        status = db.get_budget_status_between(1, week.start_iso, week.end_iso)
+        assert [(row["category"], row["spent"]) for row in status] == [("Еда", 400.0), ("Такси", 0.0)]
+        assert [row["budget_limit"] for row in status] == [1000.0, 200.0]
+
+        march = resolve_budget_period("month", date(2026, 3, 4))
+        assert db.get_budget_status_between(1, march.start_iso, march.end_iso) == (
+            db.get_budget_status(1, 2026, 3)
+        )
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_budget_status_prorates_monthly_limit_to_week(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        food = db.create_expense_category(1, "Еда")
+        db.set_budget_limit(1, food, 3100.0)
+        db.connection.execute(
+            f'INSERT INTO "{TABLES.income_log}" (user_id, amount, category, type, note, created_at)'
+            " VALUES (1, 500.0, 'Еда', 'expense', '', '2026-03-03T12:00:00')"
+        )
+        db.connection.commit()
+
+        week = resolve_budget_period("week", date(2026, 3, 4))
+        status = db.get_budget_status_between(1, week.start_iso, week.end_iso, week.limit_factor)
+        assert status == [
+            {
+                "category_id": food,
+                "category": "Еда",
+                "budget_limit": 700.0,
+                "monthly_limit": 3100.0,
+                "spent": 500.0,
+                "remaining": 200.0,
+                "percent_used": 71,
+            },
+        ]
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
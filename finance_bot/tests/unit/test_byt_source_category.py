@@ -66,3 +66,19 @@ def test_byt_query_filters_by_category(tmp_path, monkeypatch) -> None:
     finally:
         db.close()
         crud.FinanceDatabase._instance = None
+
+
+def test_byt_query_matches_normalized_category_key(tmp_path, monkeypatch) -> None:
+    """Case, padding and the legacy 'byt' alias all resolve to one key."""
+
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        db.add_wish(1, "Швабра", 100, None, " БЫТ ")
+        db.add_wish(1, "Ведро", 150, None, "byt")
+        db.add_wish(1, "Подарок", 200, None, "Подарки")
+        names = {item["name"] for item in db.get_active_byt_wishes(1, "Быт")}
+        assert names == {"Швабра", "Ведро"}
+        assert [item["name"] for item in db.get_active_byt_wishes(1, "подарки")] == ["Подарок"]
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
@@ -0,0 +1,94 @@
+"""Tests for the SQLite-backed FSM storage."""
+import asyncio
+
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.base import StorageKey
+
+from Bot.database import crud
+from Bot.database.crud import TABLES
+from Bot.database.fsm_storage import SQLiteStorage
+
+
+class Flow(StatesGroup):
+    amount = State()
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
+    db_path = tmp_path / "finance.db"
+    monkeypatch.setattr(crud, "DB_PATH", db_path)
+    crud.FinanceDatabase._instance = None
+    return crud.FinanceDatabase()
+
+
+def _key(user_id: int) -> StorageKey:
+    return StorageKey(bot_id=1, chat_id=user_id, user_id=user_id)
+
+
+def _rows(db) -> int:
+    cursor = db.connection.cursor()
+    cursor.execute(f'SELECT COUNT(*) FROM "{TABLES.fsm_states}"')
+    return int(cursor.fetchone()[0])
+
+
+def test_state_and_data_survive_restart(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        async def scenario() -> None:
+            storage = SQLiteStorage(db)
+            await storage.set_state(_key(7), Flow.amount)
+            await storage.update_data(_key(7), {"ui_tracked_message_ids": [1, 2, 3], "note": "чай"})
+            await storage.close()
+
+            restarted = SQLiteStorage(db)
+            assert await restarted.get_state(_key(7)) == Flow.amount.state
+            assert await restarted.get_data(_key(7)) == {
+                "ui_tracked_message_ids": [1, 2, 3],
+                "note": "чай",
+            }
+            assert await restarted.get_state(_key(8)) is None
+
+            await restarted.set_state(_key(7), None)
+            await restarted.set_data(_key(7), {})
+            assert _rows(db) == 0
+
+        asyncio.run(scenario())
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_hot_cache_is_bounded_by_size_and_ttl(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        clock = FakeClock()
+        storage = SQLiteStorage(db, cache_size=3, cache_ttl=60, state_ttl=3600, clock=clock)
+
+        async def scenario() -> None:
+            for user_id in range(5):
+                await storage.set_data(_key(user_id), {"n": user_id})
+            assert storage.stats()["cached"] == 3
+
+            clock.now += 120
+            await storage.get_data(_key(4))
+            assert storage.stats()["cached"] == 1
+            # Evicted keys reload from the table.
+            assert await storage.get_data(_key(0)) == {"n": 0}
+
+            await storage.set_data(_key(4), {"n": 44})
+            clock.now += 3500
+            assert storage.purge_idle() == 4
+            assert _rows(db) == 1
+            assert await storage.get_data(_key(1)) == {}
+
+        asyncio.run(scenario())
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
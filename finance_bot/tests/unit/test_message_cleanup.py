@@ -0,0 +1,51 @@
+"""Tests for batched Telegram message cleanup."""
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+pytest.importorskip("aiogram")
+
+from aiogram.exceptions import TelegramBadRequest  # noqa: E402
+
+from Bot.utils.message_cleanup import MessageCleaner  # noqa: E402
+
+
+def test_deletes_in_batches_of_100_per_chat() -> None:
+    bot = AsyncMock()
+    cleaner = MessageCleaner()
+
+    report = asyncio.run(cleaner.delete(bot, {1: range(1, 251), 2: [7]}))
+
+    batches = [call.kwargs for call in bot.delete_messages.await_args_list]
+    assert sorted(len(call["message_ids"]) for call in batches) == [50, 100, 100]
+    assert {call["chat_id"] for call in batches} == {1}
+    bot.delete_message.assert_awaited_once()
+    assert report.requested == 251
+    assert report.deleted == 251
+    assert report.api_calls == 4
+    assert report.saved_calls == 247
+    assert cleaner.stats["saved_calls"] == 247
+
+
+def test_failed_batch_falls_back_to_single_deletes() -> None:
+    bot = AsyncMock()
+    bot.delete_messages.side_effect = TelegramBadRequest(
+        method=AsyncMock(), message="Bad Request: message can't be deleted for everyone"
+    )
+    bot.delete_message.side_effect = [
+        True,
+        TelegramBadRequest(method=AsyncMock(), message="Bad Request: message to delete not found"),
+        True,
+    ]
+
+    report = asyncio.run(MessageCleaner().delete(bot, {1: [10, 11, 12]}))
+
+    assert {call.kwargs["message_id"] for call in bot.delete_message.await_args_list} == {
+        10,
+        11,
+        12,
+    }
+    assert report.fallback_calls == 3
+    assert report.deleted == 2
+    assert report.api_calls == 4
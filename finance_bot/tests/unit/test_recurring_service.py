@@ -0,0 +1,82 @@
+"""Tests for the background recurring payments job."""
+import asyncio
+from datetime import date, datetime
+
+from Bot.database import crud
+from Bot.database.crud import TABLES
+from Bot.services.recurring_service import RecurringMetrics, post_due_recurring
+
+
+def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
+    db_path = tmp_path / "finance.db"
+    monkeypatch.setattr(crud, "DB_PATH", db_path)
+    crud.FinanceDatabase._instance = None
+    return crud.FinanceDatabase()
+
+
+def _set_due(db, payment_id: int, due: str) -> None:
+    cursor = db.connection.cursor()
+    cursor.execute(
+        f"UPDATE {TABLES.recurring_payments} SET next_due_date = ? WHERE id = ?",
+        (due, payment_id),
+    )
+    db.connection.commit()
+
+
+def test_post_due_recurring_catches_up_missed_periods(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        today = date(2026, 3, 10)
+        rent = db.add_recurring_payment(1, "Квартплата", 4000.0, "жилье", "monthly", 5)
+        _set_due(db, rent, "2026-01-05")
+        phone = db.add_recurring_payment(2, "Телефон", 600.0, None, "monthly", 10)
+        _set_due(db, phone, "2026-03-10")
+        later = db.add_recurring_payment(2, "VPN", 100.0, None, "monthly", 20)
+        _set_due(db, later, "2026-03-20")
+        paused = db.add_recurring_payment(3, "GPT", 2000.0, None, "monthly", 1)
+        _set_due(db, paused, "2026-03-01")
+        db.deactivate_recurring_payment(3, paused)
+
+        result = asyncio.run(post_due_recurring(db, today, batch_size=1, pause=0))
+        assert (result.payments, result.expenses, result.batches) == (2, 4, 2)
+
+        assert [e["note"] for e in db.list_expenses(1, 2026, 1)] == ["Квартплата"]
+        assert len(db.list_expenses(1, 2026, 3)) == 1
+        assert [e["amount"] for e in db.list_expenses(2, 2026, 3)] == [600.0]
+        due_dates = {p["id"]: p["next_due_date"] for p in db.list_recurring_payments(1)}
+        assert due_dates[rent] == "2026-04-05"
+        due_dates = {p["id"]: p["next_due_date"] for p in db.list_recurring_payments(2)}
+        assert due_dates == {phone: "2026-04-10", later: "2026-03-20"}
+
+        rerun = asyncio.run(post_due_recurring(db, today, pause=0))
+        assert (rerun.payments, rerun.expenses) == (0, 0)
+
+        metrics = RecurringMetrics()
+        metrics.record(result, datetime(2026, 3, 10))
+        assert metrics.snapshot()["expenses"] == 4
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_malformed_due_dates_do_not_block_batches(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        broken = []
+        for due in ("", "0", "1 марта"):
+            payment_id = db.add_recurring_payment(1, "Битый", 1.0, None, "monthly", 1)
+            _set_due(db, payment_id, due)
+            broken.append(payment_id)
+        rent = db.add_recurring_payment(1, "Квартплата", 4000.0, None, "monthly", 5)
+        _set_due(db, rent, "2026-03-05")
+
+        # Each batch could hold nothing but the broken rows, which sort first.
+        result = asyncio.run(post_due_recurring(db, date(2026, 3, 10), batch_size=2, pause=0))
+        assert (result.payments, result.expenses) == (1, 1)
+
+        due_dates = {p["id"]: p["next_due_date"] for p in db.list_recurring_payments(1)}
+        assert due_dates[rent] == "2026-04-05"
+        assert [due_dates[payment_id] for payment_id in broken] == ["", "0", "1 марта"]
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
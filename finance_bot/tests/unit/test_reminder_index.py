@@ -0,0 +1,250 @@
+"""Tests for the reminder due-time index."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from Bot.database import crud
+from Bot.services.reminder_index import (
+    ReminderIndex,
+    compile_fire_minutes,
+    next_fire_time,
+)
+from Bot.services.reminder_service import (
+    create_habit,
+    ensure_motivation_schedule,
+    set_motivation_schedule,
+    should_fire_at,
+)
+from Bot.utils.time import set_user_timezone
+
+
+def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
+    db_path = tmp_path / "finance.db"
+    monkeypatch.setattr(crud, "DB_PATH", db_path)
+    crud.FinanceDatabase._instance = None
+    return crud.FinanceDatabase()
+
+
+def _labels(minutes):
+    return [f"{m // 60:02d}:{m % 60:02d}" for m in minutes]
+
+
+def test_compile_fire_minutes_matches_should_fire_at() -> None:
+    schedules = [
+        {"schedule_type": "specific_times", "times_json": json.dumps(["21:00", "09:00", "9:30"])},
+        {"schedule_type": "interval", "interval_minutes": 45, "active_from": "08:10", "active_to": "12:00"},
+        {"schedule_type": "interval", "interval_minutes": 10},
+        {"schedule_type": "specific_times", "times_json": "not json"},
+        {
+            "schedule_type": "specific_times",
+            "times_json": json.dumps(["07:00", "13:00"]),
+            "active_from": "08:00",
+            "active_to": "22:00",
+        },
+    ]
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for schedule in schedules:
+        expected = [
+            label
+            for label in _labels(range(24 * 60))
+            if should_fire_at(schedule, label, now)
+        ]
+        assert _labels(compile_fire_minutes(schedule)) == expected
+
+
+def test_next_fire_time_uses_zone_and_rolls_over() -> None:
+    zone = ZoneInfo("Asia/Tokyo")
+    minutes = (9 * 60,)
+    after = datetime(2026, 3, 1, 1, 0, tzinfo=timezone.utc)  # 10:00 in Tokyo
+    fire = next_fire_time(minutes, zone, after)
+    assert fire == datetime(2026, 3, 2, 9, 0, tzinfo=zone)
+    assert next_fire_time(minutes, zone, fire.astimezone(timezone.utc), inclusive=True) == fire
+
+
+def test_next_fire_time_skips_dst_gap() -> None:
+    zone = ZoneInfo("Europe/Berlin")
+    minutes = (2 * 60 + 30,)  # 02:30 does not exist on 2026-03-29
+    after = datetime(2026, 3, 28, 12, 0, tzinfo=timezone.utc)
+    fire = next_fire_time(minutes, zone, after)
+    assert fire == datetime(2026, 3, 30, 2, 30, tzinfo=zone)
+
+
+def test_index_pops_only_due_reminders(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        set_user_timezone(db, 1, "UTC", "UTC")
+        first = create_habit(db, 1, "Бег", times=["09:00"])
+        second = create_habit(db, 1, "Чтение", times=["10:00"])
+        index = ReminderIndex(db, "UTC")
+        assert index.rebuild(datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)) == 2
+
+        assert index.pop_due(datetime(2026, 1, 1, 8, 59, tzinfo=timezone.utc)) == []
+        due = index.pop_due(datetime(2026, 1, 1, 9, 0, 5, tzinfo=timezone.utc))
+        assert [d.reminder_id for d in due] == [first["id"]]
+        assert due[0].fire_at == datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+        due = index.pop_due(datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc))
+        assert [d.reminder_id for d in due] == [second["id"]]
+        # Each reminder is re-queued for the next day.
+        due = index.pop_due(datetime(2026, 1, 2, 10, 0, tzinfo=timezone.utc))
+        assert sorted(d.reminder_id for d in due) == sorted([first["id"], second["id"]])
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_index_follows_database_changes(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    index = ReminderIndex(db, "UTC")
+    db.add_reminder_listener(index.on_change)
+    try:
+        set_user_timezone(db, 1, "UTC", "UTC")
+        habit = create_habit(db, 1, "Бег", times=["09:00"])
+        index.rebuild(datetime.now(timezone.utc))
+        assert len(index) == 1
+
+        db.toggle_reminder_enabled(habit["id"], 1)
+        assert len(index) == 0
+        db.toggle_reminder_enabled(habit["id"], 1)
+        assert len(index) == 1
+
+        db.set_reminder_schedule(habit["id"], "specific_times", times_json=json.dumps([]))
+        assert len(index) == 0
+        db.set_reminder_schedule(habit["id"], "specific_times", times_json=json.dumps(["07:15"]))
+        assert len(index) == 1
+
+        db.delete_reminder(habit["id"], 1)
+        assert len(index) == 0
+    finally:
+        db.remove_reminder_listener(index.on_change)
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_index_reschedules_on_timezone_change(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    index = ReminderIndex(db, "UTC")
+    db.add_reminder_listener(index.on_change)
+    try:
+        set_user_timezone(db, 1, "UTC", "UTC")
+        create_habit(db, 1, "Бег", times=["09:00"])
+        index.rebuild(datetime.now(timezone.utc))
+        set_user_timezone(db, 1, "Asia/Tokyo", "UTC")
+        next_ts = index.next_fire_ts()
+        fire = datetime.fromtimestamp(next_ts, tz=ZoneInfo("Asia/Tokyo"))
+        assert fire.strftime("%H:%M") == "09:00"
+    finally:
+        db.remove_reminder_listener(index.on_change)
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_index_includes_motivation_schedule_only(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        set_user_timezone(db, 1, "UTC", "UTC")
+        ensure_motivation_schedule(db, 1)
+        set_motivation_schedule(db, 1, "specific_times", times_json=json.dumps(["12:00"]))
+        index = ReminderIndex(db, "UTC")
+        index.rebuild(datetime(2026, 1, 1, 11, 0, tzinfo=timezone.utc))
+        due = index.pop_due(datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc) + timedelta(seconds=1))
+        assert [d.category for d in due] == ["motivation"]
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_index_applies_changes_from_another_connection(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    crud.FinanceDatabase._instance = None
+    other = crud.FinanceDatabase()
+    assert other.connection is not db.connection
+    try:
+        set_user_timezone(db, 1, "UTC", "UTC")
+        habit = create_habit(db, 1, "Бег", times=["09:00"])
+        index = ReminderIndex(db, "UTC")
+        db.add_reminder_listener(index.on_change)
+        tick = datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)
+        index.rebuild(tick)
+
+        # Written by "another process": no listener of ``db`` fires.
+        added = create_habit(other, 1, "Чтение", times=["08:30"])
+        other.set_reminder_schedule(habit["id"], "specific_times", times_json=json.dumps(["08:45"]))
+        assert len(index) == 1
+        assert index.pop_due(datetime(2026, 1, 1, 8, 30, tzinfo=timezone.utc)) == []
+
+        tick = datetime(2026, 1, 1, 8, 31, tzinfo=timezone.utc)
+        assert index.apply_changes(tick) > 0
+        assert len(index) == 2
+        due = index.pop_due(datetime(2026, 1, 1, 8, 45, tzinfo=timezone.utc))
+        assert [d.reminder_id for d in due] == [habit["id"]]
+        assert index.pop_due(datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc)) == []
+        due = index.pop_due(datetime(2026, 1, 2, 8, 30, tzinfo=timezone.utc))
+        assert [d.reminder_id for d in due] == [added["id"]]
+
+        other.toggle_reminder_enabled(added["id"], 1)
+        index.apply_changes(datetime(2026, 1, 2, 8, 31, tzinfo=timezone.utc))
+        assert len(index) == 1
+        assert index.apply_changes(datetime(2026, 1, 2, 8, 32, tzinfo=timezone.utc)) == 0
+    finally:
+        db.remove_reminder_listener(index.on_change)
+        other.close()
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_index_applies_timezone_change_from_another_connection(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    crud.FinanceDatabase._instance = None
+    other = crud.FinanceDatabase()
+    try:
+        set_user_timezone(db, 1, "UTC", "UTC")
+        create_habit(db, 1, "Бег", times=["09:00"])
+        index = ReminderIndex(db, "UTC")
+        index.rebuild(datetime(2026, 1, 1, 0, 0, tzinfo=timezone.utc))
+        assert db.get_user_settings(1)["timezone"] == "UTC"
+
+        # The Mini App writes the new zone through its own connection.
+        set_user_timezone(other, 1, "Asia/Tokyo", "UTC")
+        index.apply_changes(datetime(2026, 1, 1, 0, 1, tzinfo=timezone.utc))
+
+        fire = datetime.fromtimestamp(index.next_fire_ts(), tz=ZoneInfo("Asia/Tokyo"))
+        assert fire == datetime(2026, 1, 2, 9, 0, tzinfo=ZoneInfo("Asia/Tokyo"))
+        assert db.get_user_settings(1)["timezone"] == "Asia/Tokyo"
+    finally:
+        other.close()
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_index_only_holds_owned_users(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    crud.FinanceDatabase._instance = None
+    other = crud.FinanceDatabase()
+    try:
+        for user_id in (1, 2):
+            set_user_timezone(db, user_id, "UTC", "UTC")
+        mine = create_habit(db, 1, "Бег", times=["09:00"])
+        create_habit(db, 2, "Чтение", times=["09:00"])
+        index = ReminderIndex(db, "UTC", owns=lambda uid: uid == 1)
+        db.add_reminder_listener(index.on_change)
+        tick = datetime(2026, 1, 1, 8, 0, tzinfo=timezone.utc)
+        assert index.rebuild(tick) == 1
+
+        # Neither local edits nor the change log bring in another shard's user.
+        create_habit(db, 2, "Вода", times=["09:00"])
+        create_habit(other, 2, "Сон", times=["09:00"])
+        set_user_timezone(other, 2, "Asia/Tokyo", "UTC")
+        index.apply_changes(datetime(2026, 1, 1, 8, 1, tzinfo=timezone.utc))
+        assert len(index) == 1
+        due = index.pop_due(datetime(2026, 1, 1, 9, 0, tzinfo=timezone.utc))
+        assert [d.reminder_id for d in due] == [mine["id"]]
+
+        index.owns = None
+        assert index.rebuild(tick) == 4
+    finally:
+        db.remove_reminder_listener(index.on_change)
+        other.close()
+        db.close()
+        crud.FinanceDatabase._instance = None
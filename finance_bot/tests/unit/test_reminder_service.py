@@ -27,6 +27,8 @@ from Bot.services.reminder_service import (
     should_fire_at,
 )
 from Bot.services.types import ServiceError
+from Bot.utils import schedules
+from Bot.utils.schedules import compiled_schedule
 
 
 def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
@@ -201,6 +203,28 @@ def test_should_fire_interval_min_15() -> None:
     assert should_fire_at(schedule, "10:00", now) is False
 
 
+def test_compiled_schedule_invalidated_on_update(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        reminder_id = create_habit(db, 1, "Вода", ["09:00", "21:30"])["id"]
+        schedule = db.get_reminder_schedule(reminder_id)
+        compiled = compiled_schedule(schedule)
+        assert compiled.minutes == (540, 1290)
+        assert compiled.fires_at(540) and not compiled.fires_at(541)
+        assert compiled.next_minute(540) == 1290
+        assert compiled.next_minute(540, inclusive=True) == 540
+        assert compiled_schedule(schedule) is compiled
+
+        db.set_reminder_schedule(reminder_id, "specific_times", times_json='["10:00"]')
+        assert reminder_id not in schedules._CACHE
+        now = datetime(2026, 1, 1, 10, 0)
+        assert should_fire_at(db.get_reminder_schedule(reminder_id), "10:00", now) is True
+        assert should_fire_at(db.get_reminder_schedule(reminder_id), "09:00", now) is False
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
 def test_build_callback_hash_deterministic() -> None:
     h1 = build_callback_hash(1, 100, "2026-01-01T12:00:00")
     h2 = build_callback_hash(1, 100, "2026-01-01T12:00:00")
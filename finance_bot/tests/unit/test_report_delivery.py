@@ -0,0 +1,117 @@
+"""Tests for monthly report delivery."""
+import asyncio
+from datetime import datetime, timezone
+
+from Bot.database import crud
+from Bot.database.crud import TABLES
+from Bot.services.report_delivery import (
+    ReportMetrics,
+    deliver_due_reports,
+    report_due_at,
+    send_offset,
+)
+
+
+class FakeSender:
+    def __init__(self, ok: bool = True) -> None:
+        self.ok = ok
+        self.sent: list[tuple[int, str]] = []
+
+    async def send_message(self, chat_id, text, *, on_success=None, on_failure=None):
+        self.sent.append((chat_id, text))
+        callback = on_success if self.ok else on_failure
+        if callback is not None:
+            callback()
+
+
+def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
+    db_path = tmp_path / "finance.db"
+    monkeypatch.setattr(crud, "DB_PATH", db_path)
+    crud.FinanceDatabase._instance = None
+    return crud.FinanceDatabase()
+
+
+def _add_user(db, user_id: int, report_day: int, tz: str = "UTC") -> None:
+    db.ensure_user_settings(user_id)
+    db.set_report_day(user_id, report_day)
+    cursor = db.connection.cursor()
+    cursor.execute(
+        f'UPDATE "{TABLES.user_settings}" SET timezone = ? WHERE user_id = ?', (tz, user_id)
+    )
+    db.connection.commit()
+    db.settings_cache.invalidate(user_id)
+
+
+def _statuses(db) -> dict[int, str]:
+    cursor = db.connection.cursor()
+    cursor.execute(f'SELECT user_id, status FROM "{TABLES.report_deliveries}"')
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def test_send_time_is_spread_over_the_window() -> None:
+    offsets = {send_offset(user_id) for user_id in range(1, 200)}
+    assert len(offsets) > 100
+    assert all(9 * 3600 <= offset.total_seconds() < 21 * 3600 for offset in offsets)
+
+
+def test_reports_are_sent_once_per_month(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        for user_id in (1, 2, 3):
+            _add_user(db, user_id, report_day=1)
+        _add_user(db, 4, report_day=5)
+        db.log_income(1, 1000.0, "зарплата")
+        cursor = db.connection.cursor()
+        cursor.execute(
+            f'UPDATE "{TABLES.income_log}" SET created_at = ? WHERE user_id = 1',
+            ("2026-02-10T12:00:00",),
+        )
+        cursor.execute(
+            f"INSERT INTO {TABLES.income_log} (user_id, amount, category, type, note, created_at)"
+            " VALUES (2, 50.0, 'еда', 'expense', '', '2026-02-11T08:00:00')"
+        )
+        db.connection.commit()
+
+        now = datetime(2026, 3, 1, 23, 59, tzinfo=timezone.utc)
+        sender = FakeSender()
+        metrics = ReportMetrics()
+        result = asyncio.run(deliver_due_reports(db, sender, now, "UTC", batch_size=2, metrics=metrics))
+
+        assert (result.queued, result.empty) == (2, 1)
+        assert [user_id for user_id, _ in sender.sent] == [1, 2]
+        assert "2026-02" in sender.sent[0][1] and "1 000.00" in sender.sent[0][1]
+        assert _statuses(db) == {1: "sent", 2: "sent", 3: "empty"}
+        assert metrics.sent == 2
+
+        again = asyncio.run(deliver_due_reports(db, sender, now, "UTC", metrics=metrics))
+        assert (again.candidates, again.queued) == (0, 0)
+        assert len(sender.sent) == 2
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_report_waits_for_its_slot_and_failed_sends_are_not_retried(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        _add_user(db, 7, report_day=1)
+        db.add_expense(7, 10.0, "еда")
+        cursor = db.connection.cursor()
+        cursor.execute(
+            f'UPDATE "{TABLES.income_log}" SET created_at = ? WHERE user_id = 7',
+            ("2026-02-11T08:00:00",),
+        )
+        db.connection.commit()
+        due = report_due_at(datetime(2026, 3, 1, tzinfo=timezone.utc), 1, 7)
+
+        sender = FakeSender(ok=False)
+        early = asyncio.run(deliver_due_reports(db, sender, due.replace(minute=0, hour=0), "UTC"))
+        assert early.queued == 0 and _statuses(db) == {}
+
+        late = asyncio.run(deliver_due_reports(db, sender, due, "UTC"))
+        assert late.queued == 1 and _statuses(db) == {7: "failed"}
+        asyncio.run(deliver_due_reports(db, sender, due, "UTC"))
+        assert len(sender.sent) == 1
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
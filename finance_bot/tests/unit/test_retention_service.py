@@ -0,0 +1,63 @@
+"""Tests for the background BYT purge job."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from Bot.database import crud
+from Bot.database.crud import TABLES
+from Bot.services.retention_service import RetentionMetrics, purge_expired_byt
+from Bot.utils.datetime_utils import add_one_month
+
+
+def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
+    db_path = tmp_path / "finance.db"
+    monkeypatch.setattr(crud, "DB_PATH", db_path)
+    crud.FinanceDatabase._instance = None
+    return crud.FinanceDatabase()
+
+
+def _count(db, table: str) -> int:
+    cursor = db.connection.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    return int(cursor.fetchone()[0])
+
+
+def test_add_one_month_clamps_to_target_month() -> None:
+    assert add_one_month(datetime(2026, 1, 31, 10, 0)) == datetime(2026, 2, 28, 10, 0)
+    assert add_one_month(datetime(2024, 1, 30)) == datetime(2024, 2, 29)
+    assert add_one_month(datetime(2026, 12, 15)) == datetime(2027, 1, 15)
+
+
+def test_purge_deletes_only_expired_byt_rows_in_batches(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        now = datetime(2026, 3, 15, 12, 0, tzinfo=timezone.utc)
+        byt = db.create_wishlist_category(1, "Быт")
+        db.create_wishlist_category(1, "Подарки")
+        assert db.toggle_byt_reminder_category(1, byt)
+
+        for days in (40, 35, 33):
+            db.add_purchase(1, f"старая {days}", 10.0, "БЫТ", now - timedelta(days=days))
+        db.add_purchase(1, "свежая", 10.0, "быт", now - timedelta(days=3))
+        db.add_purchase(1, "подарок", 10.0, "Подарки", now - timedelta(days=90))
+        db.add_purchase(2, "чужая", 10.0, "Быт", now - timedelta(days=90))
+        old_wish = db.add_wish(1, "Швабра", 100.0, None, "byt")
+        db.mark_wish_purchased(old_wish, purchased_at=now - timedelta(days=45))
+        db.add_wish(1, "Ведро", 100.0, None, "Быт")
+
+        dry = asyncio.run(purge_expired_byt(db, now, dry_run=True))
+        assert (dry.purchases, dry.wishes, dry.batches) == (3, 1, 0)
+        assert _count(db, TABLES.purchases) == 6
+
+        result = asyncio.run(purge_expired_byt(db, now, batch_size=2, pause=0))
+        assert (result.purchases, result.wishes, result.batches) == (3, 1, 3)
+        cursor = db.connection.cursor()
+        cursor.execute(f"SELECT wish_name FROM {TABLES.purchases} ORDER BY id")
+        assert [row[0] for row in cursor.fetchall()] == ["свежая", "подарок", "чужая"]
+        assert [wish["name"] for wish in db.get_wishes_by_user(1)] == ["Ведро"]
+
+        metrics = RetentionMetrics()
+        metrics.record(result, now)
+        assert metrics.snapshot()["purchases_deleted"] == 3
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
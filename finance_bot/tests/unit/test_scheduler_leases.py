@@ -0,0 +1,82 @@
+"""Tests for scheduler shard leases."""
+from __future__ import annotations
+
+from Bot.database import crud
+from Bot.services.scheduler_leases import ShardLeases, shard_of
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
+    db_path = tmp_path / "finance.db"
+    monkeypatch.setattr(crud, "DB_PATH", db_path)
+    crud.FinanceDatabase._instance = None
+    return crud.FinanceDatabase()
+
+
+def test_shard_of_is_stable_and_spread() -> None:
+    assert shard_of(42, 1) == 0
+    assert shard_of(42, 4) == shard_of(42, 4)
+    assert {shard_of(uid, 4) for uid in range(1, 200)} == {0, 1, 2, 3}
+
+
+def test_workers_own_disjoint_shards_and_cover_dead_peers(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        clock = FakeClock()
+        kwargs = dict(shards=2, workers=2, ttl=180, renew_interval=0, clock=clock)
+        standby = ShardLeases(db, shards=2, ttl=180, renew_interval=0, clock=clock)
+        first = ShardLeases(db, worker_index=0, **kwargs)
+        second = ShardLeases(db, worker_index=1, **kwargs)
+
+        # Alone, the standby (the polling bot) dispatches every shard.
+        assert standby.refresh() == {0, 1}
+
+        # Dedicated workers reclaim their own shards; the standby lets go.
+        assert first.refresh() == {0}
+        assert second.refresh() == {1}
+        assert standby.refresh() == frozenset()
+        for uid in range(1, 50):
+            assert first.owns(uid) != second.owns(uid)
+
+        # Worker 1 dies: once its lease expires worker 0 takes the shard over.
+        clock.now += 60
+        assert first.refresh() == {0}
+        clock.now += 200
+        assert first.refresh() == {0, 1}
+
+        # A clean shutdown hands the shards straight back to the standby.
+        first.release()
+        assert standby.refresh() == {0, 1}
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_byt_slot_is_claimed_once_across_processes(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    crud.FinanceDatabase._instance = None
+    worker = crud.FinanceDatabase()
+    try:
+        # The standby still acts on its cached shards while the worker takes over.
+        assert db.claim_byt_reminder_slot(7, 3, "2026-03-01T12:00:00", "2026-02-27T12:00:00")
+        assert not worker.claim_byt_reminder_slot(7, 3, "2026-03-01T12:00:00", "2026-02-27T12:00:00")
+        assert worker.claim_byt_reminder_slot(7, 4, "2026-03-01T12:00:00", "2026-02-27T12:00:00")
+
+        # The next day's slot is new; two days on, the first claim is pruned.
+        assert worker.claim_byt_reminder_slot(7, 3, "2026-03-02T12:00:00", "2026-02-28T12:00:00")
+        assert worker.claim_byt_reminder_slot(7, 3, "2026-03-03T12:00:00", "2026-03-01T12:00:01")
+        rows = db.connection.execute(
+            f'SELECT slot FROM "{crud.TABLES.byt_reminder_slots}" WHERE category_id = 3 ORDER BY slot'
+        ).fetchall()
+        assert [row[0] for row in rows] == ["2026-03-02T12:00:00", "2026-03-03T12:00:00"]
+    finally:
+        worker.close()
+        db.close()
+        crud.FinanceDatabase._instance = None
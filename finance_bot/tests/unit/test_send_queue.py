@@ -0,0 +1,131 @@
+"""Tests for the outbound Telegram send queue."""
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+pytest.importorskip("aiogram")
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter  # noqa: E402
+
+from Bot.utils.send_queue import OutboundSender, TokenBucket  # noqa: E402
+
+
+def _run_sender(bot, jobs, **kwargs):
+    """Submit ``(chat_id, text, on_success)`` jobs and return their outcomes."""
+
+    async def scenario():
+        sender = OutboundSender(bot, base_delay=0, **kwargs)
+        sender.start()
+        futures = [
+            await sender.send_message(chat_id, text, on_success=on_success)
+            for chat_id, text, on_success in jobs
+        ]
+        outcomes = await asyncio.gather(*futures)
+        await sender.stop()
+        return sender, outcomes
+
+    return asyncio.run(scenario())
+
+
+def test_success_runs_callback() -> None:
+    bot = AsyncMock()
+    bot.send_message = AsyncMock(return_value=object())
+    delivered = []
+
+    sender, outcomes = _run_sender(bot, [(1, "hi", lambda: delivered.append(1))])
+
+    assert outcomes[0].ok is True
+    assert delivered == [1]
+    assert sender.stats["sent"] == 1
+
+
+def test_bad_request_fails_without_callback() -> None:
+    bot = AsyncMock()
+    bot.send_message = AsyncMock(
+        side_effect=TelegramBadRequest(method=None, message="chat not found")
+    )
+    delivered = []
+
+    sender, outcomes = _run_sender(bot, [(1, "hi", lambda: delivered.append(1))])
+
+    assert outcomes[0].ok is False
+    assert outcomes[0].attempts == 1
+    assert delivered == []
+    assert sender.stats["failed"] == 1
+
+
+def test_failure_runs_failure_callback() -> None:
+    bot = AsyncMock()
+    bot.send_message = AsyncMock(
+        side_effect=TelegramBadRequest(method=None, message="chat not found")
+    )
+    failed = []
+
+    async def scenario():
+        sender = OutboundSender(bot, base_delay=0)
+        sender.start()
+        future = await sender.send_message(1, "hi", on_failure=lambda: failed.append(1))
+        outcome = await future
+        await sender.stop()
+        return outcome
+
+    assert asyncio.run(scenario()).ok is False
+    assert failed == [1]
+
+
+def test_retry_after_pauses_and_retries() -> None:
+    bot = AsyncMock()
+    bot.send_message = AsyncMock(
+        side_effect=[
+            TelegramRetryAfter(method=None, message="flood", retry_after=0),
+            object(),
+        ]
+    )
+
+    sender, outcomes = _run_sender(bot, [(1, "hi", None)], per_chat_interval=0)
+
+    assert outcomes[0].ok is True
+    assert outcomes[0].attempts == 1
+    assert bot.send_message.call_count == 2
+    assert sender.stats["retry_after"] == 1
+
+
+def test_same_chat_sends_are_spaced() -> None:
+    sent_at: list[float] = []
+
+    async def fake_send(**kwargs):
+        sent_at.append(asyncio.get_running_loop().time())
+        return object()
+
+    bot = AsyncMock()
+    bot.send_message = fake_send
+
+    _run_sender(bot, [(7, "a", None), (7, "b", None)], per_chat_interval=0.05)
+
+    assert len(sent_at) == 2
+    assert sent_at[1] - sent_at[0] >= 0.045
+
+
+def test_token_bucket_limits_rate(monkeypatch) -> None:
+    now = [0.0]
+    sleeps: list[float] = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    async def scenario():
+        bucket = TokenBucket(rate=10, capacity=2, clock=lambda: now[0])
+        for _ in range(4):
+            await bucket.acquire()
+
+    runner = asyncio.new_event_loop()
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    try:
+        runner.run_until_complete(scenario())
+    finally:
+        runner.close()
+
+    # Two tokens are available up front; the next two wait 0.1s each.
+    assert sleeps == pytest.approx([0.1, 0.1])
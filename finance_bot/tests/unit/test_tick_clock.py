@@ -0,0 +1,79 @@
+"""Tests for the scheduler tick clock."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from Bot.database import crud
+from Bot.services.tick_clock import TickClock, TickMetrics
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = datetime(2024, 5, 1, 9, 0, 20, tzinfo=timezone.utc).timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
+    db_path = tmp_path / "finance.db"
+    monkeypatch.setattr(crud, "DB_PATH", db_path)
+    crud.FinanceDatabase._instance = None
+    return crud.FinanceDatabase()
+
+
+def _labels(pending) -> list[str]:
+    return [minute.strftime("%H:%M") for minute, _ in pending]
+
+
+def test_skipped_minutes_are_replayed_and_window_bounded(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        clock = FakeClock()
+        ticks = TickClock("test", db, catch_up_minutes=3, clock=clock, metrics=TickMetrics())
+
+        pending = ticks.pending()
+        assert _labels(pending) == ["09:00"]
+        ticks.mark(*pending[0])
+        assert ticks.pending() == []
+
+        # A slow tick overran two minute boundaries: both are handed back.
+        clock.now += 150
+        pending = ticks.pending()
+        assert _labels(pending) == ["09:01", "09:02"]
+        for minute, shards in pending:
+            ticks.mark(minute, shards)
+        assert ticks.metrics.caught_up_minutes == 1
+        assert ticks.metrics.missed_minutes == 0
+
+        # Beyond the catch-up window the oldest minutes are dropped.
+        clock.now += 600
+        assert _labels(ticks.pending()) == ["09:10", "09:11", "09:12"]
+        assert ticks.metrics.missed_minutes == 7
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_cursor_survives_restart_per_shard(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        clock = FakeClock()
+        first = TickClock("test", db, shards=2, clock=clock, metrics=TickMetrics())
+        for minute, shards in first.pending({0, 1}):
+            first.mark(minute, shards)
+
+        clock.now += 120
+        # Only shard 0 gets processed before the "crash".
+        minute, _ = first.pending({0})[0]
+        first.mark(minute, {0})
+
+        restarted = TickClock("test", db, shards=2, clock=clock, metrics=TickMetrics())
+        pending = restarted.pending({0, 1})
+        assert [(m.strftime("%H:%M"), set(s)) for m, s in pending] == [
+            ("09:01", {1}),
+            ("09:02", {0, 1}),
+        ]
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
@@ -2,7 +2,7 @@
 from datetime import datetime
 
 from Bot.database import crud
-from Bot.utils.time import get_user_timezone, set_user_timezone, today_for_user
+from Bot.utils.time import get_user_timezone, now_for_user, set_user_timezone, today_for_user
 
 
 def _fresh_db(tmp_path, monkeypatch) -> crud.FinanceDatabase:
@@ -24,7 +24,7 @@ def test_get_user_timezone_default(tmp_path, monkeypatch) -> None:
 def test_get_user_timezone_selected(tmp_path, monkeypatch) -> None:
     db = _fresh_db(tmp_path, monkeypatch)
     try:
-        set_user_timezone(db, 2, "UTC", "Europe/Moscow")
+        assert set_user_timezone(db, 2, "UTC", "Europe/Moscow") == "UTC"
         assert get_user_timezone(db, 2, "Europe/Moscow") == "UTC"
     finally:
         db.close()
@@ -34,7 +34,7 @@ def test_get_user_timezone_selected(tmp_path, monkeypatch) -> None:
 def test_get_user_timezone_invalid(tmp_path, monkeypatch) -> None:
     db = _fresh_db(tmp_path, monkeypatch)
     try:
-        set_user_timezone(db, 3, "Invalid/Zone", "Europe/Moscow")
+        assert set_user_timezone(db, 3, "Invalid/Zone", "Europe/Moscow") == "Europe/Moscow"
         assert get_user_timezone(db, 3, "Europe/Moscow") == "Europe/Moscow"
     finally:
         db.close()
@@ -49,3 +49,32 @@ def test_today_for_user_format(tmp_path, monkeypatch) -> None:
     finally:
         db.close()
         crud.FinanceDatabase._instance = None
+
+
+def test_now_for_user_uses_settings_cache(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    statements: list[str] = []
+    try:
+        now_for_user(db, 5, "UTC")
+        db.connection.set_trace_callback(statements.append)
+        for _ in range(10):
+            now_for_user(db, 5, "UTC")
+        db.connection.set_trace_callback(None)
+        assert statements == []
+        assert db.settings_cache.stats()["hits"] >= 10
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_settings_cache_invalidated_on_write(tmp_path, monkeypatch) -> None:
+    db = _fresh_db(tmp_path, monkeypatch)
+    try:
+        now_for_user(db, 6, "UTC")
+        set_user_timezone(db, 6, "Asia/Tokyo", "UTC")
+        assert str(now_for_user(db, 6, "UTC").tzinfo) == "Asia/Tokyo"
+        db.set_byt_defer_max_days(6, 12)
+        assert db.get_user_settings(6)["byt_defer_max_days"] == 12
+    finally:
+        db.close()
+        crud.FinanceDatabase._instance = None
@@ -128,6 +128,7 @@ class DummyBot:
 
     def __init__(self) -> None:
         self.delete_message = AsyncMock()
+        self.delete_messages = AsyncMock()
         self.edit_message_text = AsyncMock()
         self.send_message = AsyncMock()
 
@@ -159,10 +160,9 @@ def test_ui_cleanup_keeps_welcome() -> None:
         bot = DummyBot()
         await ui_cleanup_to_context(bot, state, 1, "MAIN_MENU")
 
-        deleted_ids = {
-            call.kwargs["message_id"] for call in bot.delete_message.call_args_list
-        }
-        assert deleted_ids == {222, 333}
+        bot.delete_message.assert_not_called()
+        bot.delete_messages.assert_awaited_once()
+        assert set(bot.delete_messages.await_args.kwargs["message_ids"]) == {222, 333}
         data = await state.get_data()
         assert data["ui_tracked_message_ids"] == []
 
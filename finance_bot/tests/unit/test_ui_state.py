@@ -0,0 +1,81 @@
+"""Tests for update-scoped UI state buffering."""
+from __future__ import annotations
+
+import asyncio
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from Bot.utils.ui_cleanup import (
+    ui_get_welcome_id,
+    ui_register_protected_message,
+    ui_set_screen_message,
+    ui_set_welcome_id,
+    ui_track_message,
+)
+from Bot.utils.ui_state import UI_TRACK_LIMIT, UiStateMiddleware
+
+KEY = StorageKey(bot_id=1, chat_id=1, user_id=1)
+
+
+class CountingStorage(MemoryStorage):
+    """MemoryStorage that counts data round trips."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+        self.writes = 0
+
+    async def get_data(self, key):
+        self.reads += 1
+        return await super().get_data(key)
+
+    async def set_data(self, key, data):
+        self.writes += 1
+        await super().set_data(key, data)
+
+
+def _run_update(storage: CountingStorage, handler) -> None:
+    async def wrapped(event, data):
+        await handler(data["state"])
+
+    state = FSMContext(storage=storage, key=KEY)
+    asyncio.run(UiStateMiddleware()(wrapped, object(), {"state": state}))
+
+
+def test_ui_updates_are_flushed_once_per_update() -> None:
+    storage = CountingStorage()
+
+    async def handler(state) -> None:
+        for message_id in range(1, UI_TRACK_LIMIT + 6):
+            await ui_track_message(state, 7, message_id)
+        await ui_register_protected_message(state, 7, 900)
+        await ui_set_welcome_id(state, 901)
+        await ui_set_screen_message(state, 7, 902)
+        assert await ui_get_welcome_id(state) == 901
+        assert (await state.get_data())["ui_screen_message_id"] == 902
+
+    _run_update(storage, handler)
+
+    data = asyncio.run(storage.get_data(KEY))
+    assert storage.writes == 1
+    assert data["ui_chat_id"] == 7
+    assert len(data["ui_tracked_message_ids"]) == UI_TRACK_LIMIT
+    assert data["ui_tracked_message_ids"][-1] == 902
+    assert data["ui_protected_message_ids"] == [900]
+    assert data["ui_welcome_message_id"] == 901
+
+
+def test_state_clear_drops_pending_ui_updates() -> None:
+    storage = CountingStorage()
+
+    async def handler(state) -> None:
+        await ui_track_message(state, 7, 10)
+        await state.clear()
+        await ui_track_message(state, 7, 11)
+
+    _run_update(storage, handler)
+
+    data = asyncio.run(storage.get_data(KEY))
+    assert data == {"ui_chat_id": 7, "ui_tracked_message_ids": [11]}
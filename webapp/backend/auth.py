@@ -9,17 +9,35 @@ import hashlib
 import hmac
 import json
 import time
-from typing import Any
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable
 from urllib.parse import parse_qs, unquote
 
+DEFAULT_MAX_AGE_SECONDS = 86400
+INIT_DATA_CACHE_SIZE = 4096
+INIT_DATA_CACHE_TTL = 3600.0
 
-def validate_init_data(init_data: str, bot_token: str, max_age_seconds: int = 86400) -> dict[str, Any]:
+
+def derive_secret_key(bot_token: str) -> bytes:
+    """Return the initData signing key: HMAC_SHA256("WebAppData", bot_token)."""
+    return hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+
+
+def validate_init_data(
+    init_data: str,
+    bot_token: str,
+    max_age_seconds: int = DEFAULT_MAX_AGE_SECONDS,
+    *,
+    secret_key: bytes | None = None,
+) -> dict[str, Any]:
     """Validate Telegram WebApp initData and return parsed user info.
 
     Args:
         init_data: Raw initData query string from Telegram WebApp.
         bot_token: Bot token used to compute HMAC secret.
         max_age_seconds: Max allowed age of auth_date (default 24h).
+        secret_key: Precomputed ``derive_secret_key(bot_token)``, if available.
 
     Returns:
         Parsed user dict with at least 'id' field.
@@ -27,6 +45,16 @@ def validate_init_data(init_data: str, bot_token: str, max_age_seconds: int = 86
     Raises:
         ValueError: If validation fails.
     """
+    user, _ = _verify_init_data(
+        init_data, secret_key or derive_secret_key(bot_token), max_age_seconds
+    )
+    return user
+
+
+def _verify_init_data(
+    init_data: str, secret_key: bytes, max_age_seconds: int, now: float | None = None
+) -> tuple[dict[str, Any], int | None]:
+    """Return the user and auth_date of signed initData or raise ValueError."""
     if not init_data:
         raise ValueError("Empty initData")
 
@@ -44,8 +72,6 @@ def validate_init_data(init_data: str, bot_token: str, max_age_seconds: int = 86
         data_pairs.append(f"{key}={value}")
     data_check_string = "\n".join(data_pairs)
 
-    # Compute HMAC: secret_key = HMAC_SHA256("WebAppData", bot_token)
-    secret_key = hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
     computed_hash = hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
 
     if not hmac.compare_digest(computed_hash, hash_value):
@@ -53,10 +79,11 @@ def validate_init_data(init_data: str, bot_token: str, max_age_seconds: int = 86
 
     # Check auth_date freshness
     auth_date_str = parsed.get("auth_date", [None])[0]
+    auth_date: int | None = None
     if auth_date_str:
         try:
             auth_date = int(auth_date_str)
-            if time.time() - auth_date > max_age_seconds:
+            if (time.time() if now is None else now) - auth_date > max_age_seconds:
                 raise ValueError("initData expired")
         except (TypeError, ValueError) as exc:
             if "expired" in str(exc):
@@ -76,4 +103,83 @@ def validate_init_data(init_data: str, bot_token: str, max_age_seconds: int = 86
     if "id" not in user:
         raise ValueError("Missing user id")
 
-    return user
+    return user, auth_date
+
+
+class InitDataValidator:
+    """initData verification with a precomputed key and a bounded TTL cache.
+
+    The Mini App sends the same initData for a whole session, so verified
+    users are cached by the raw initData string and the HMAC only runs on a
+    miss. A cached entry never outlives its ``auth_date`` expiry.
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        max_age_seconds: int = DEFAULT_MAX_AGE_SECONDS,
+        cache_size: int = INIT_DATA_CACHE_SIZE,
+        cache_ttl: float = INIT_DATA_CACHE_TTL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._secret_key = derive_secret_key(bot_token)
+        self.max_age_seconds = max_age_seconds
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._clock = clock
+        self._cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.evictions = 0
+
+    def validate(self, init_data: str) -> dict[str, Any]:
+        """Return the user for ``init_data`` or raise ValueError."""
+        now = self._clock()
+        with self._lock:
+            entry = self._cache.get(init_data)
+            if entry is not None:
+                expires_at, user = entry
+                if now < expires_at:
+                    self._cache.move_to_end(init_data)
+                    self.hits += 1
+                    return dict(user)
+                del self._cache[init_data]
+            self.misses += 1
+
+        try:
+            user, auth_date = _verify_init_data(
+                init_data, self._secret_key, self.max_age_seconds, now
+            )
+        except ValueError:
+            with self._lock:
+                self.failures += 1
+            raise
+
+        expires_at = now + self.cache_ttl
+        if auth_date is not None:
+            expires_at = min(expires_at, auth_date + self.max_age_seconds)
+        with self._lock:
+            self._cache[init_data] = (expires_at, user)
+            self._cache.move_to_end(init_data)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+        return dict(user)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "failures": self.failures,
+                "evictions": self.evictions,
+                "size": len(self._cache),
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
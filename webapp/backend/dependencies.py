@@ -3,13 +3,19 @@ from __future__ import annotations
 
 from typing import Any
 
-from fastapi import HTTPException, Request
+from fastapi import Depends, HTTPException, Request
 
 from Bot.config.settings import get_settings
-from webapp.backend.auth import validate_init_data
+from webapp.backend.auth import InitDataValidator
 
 _settings = get_settings()
 _BOT_TOKEN = (_settings.bot_token or "").strip()
+_VALIDATOR = InitDataValidator(_BOT_TOKEN)
+
+
+def get_auth_metrics() -> dict[str, Any]:
+    """Return initData cache counters (hits, misses, hit_ratio, ...)."""
+    return _VALIDATOR.stats()
 
 
 def get_current_user(request: Request) -> dict[str, Any]:
@@ -19,7 +25,14 @@ def get_current_user(request: Request) -> dict[str, Any]:
         raise HTTPException(status_code=401, detail="Missing authorization")
     init_data = auth[4:]
     try:
-        user = validate_init_data(init_data, _BOT_TOKEN)
+        user = _VALIDATOR.validate(init_data)
     except ValueError as exc:
         raise HTTPException(status_code=401, detail=str(exc))
     return user
+
+
+def get_admin_user(user: dict[str, Any] = Depends(get_current_user)) -> dict[str, Any]:
+    """Like ``get_current_user``, but only for the bot's admin (``ADMIN_ID``)."""
+    if int(user["id"]) != int(_settings.admin_id):
+        raise HTTPException(status_code=403, detail="Admin only")
+    return user
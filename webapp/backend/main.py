@@ -6,7 +6,7 @@ import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
@@ -18,7 +18,10 @@ for p in (str(PROJECT_ROOT), str(FINANCE_BOT_ROOT)):
     if p not in sys.path:
         sys.path.insert(0, p)
 
-from Bot.database.get_db import get_db
+from Bot.database.get_db import close_async_db, get_async_db, get_db
+from webapp.backend.dependencies import get_admin_user, get_auth_metrics
+from webapp.backend.utils.excel_export import close_export_manager, get_export_manager
+from webapp.backend.utils.google_sheets import close_sync_manager, get_sync_manager
 from webapp.backend.routers import debts, expenses, export, gsheets, household, income, recurring, reports, savings, settings, wishlist
 
 logger = logging.getLogger(__name__)
@@ -28,8 +31,12 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Startup / shutdown."""
     db = get_db()
+    get_async_db()
     logger.info("Mini App backend started, DB ready")
     yield
+    await close_export_manager()
+    await close_sync_manager()
+    await close_async_db()
     db.close()
     logger.info("Mini App backend stopped")
 
@@ -43,6 +50,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Mount routers
@@ -64,6 +72,16 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/api/metrics", dependencies=[Depends(get_admin_user)])
+async def metrics():
+    """Internal counters; admin only."""
+    return {
+        "auth": get_auth_metrics(),
+        "export": get_export_manager().stats(),
+        "sheets": get_sync_manager().stats(),
+    }
+
+
 # ── Serve frontend static files in production ─────────
 FRONTEND_DIST = PROJECT_ROOT / "webapp" / "frontend" / "dist"
 
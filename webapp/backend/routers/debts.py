@@ -6,7 +6,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, Field
 
-from Bot.database.get_db import get_db
+from Bot.database.get_db import get_async_db
 
 from webapp.backend.dependencies import get_current_user
 
@@ -47,8 +47,8 @@ async def list_debts(
     user: dict = Depends(get_current_user),
 ):
     """List debts (active or settled)."""
-    db = get_db()
-    items = db.list_debts(user["id"], settled=settled)
+    db = get_async_db()
+    items = await db.list_debts(user["id"], settled=settled)
     return [DebtOut(**item) for item in items]
 
 
@@ -58,8 +58,8 @@ async def create_debt(
     user: dict = Depends(get_current_user),
 ):
     """Create a new debt entry."""
-    db = get_db()
-    new_id = db.add_debt(
+    db = get_async_db()
+    new_id = await db.add_debt(
         user_id=user["id"],
         person=body.person,
         amount=body.amount,
@@ -84,8 +84,8 @@ async def settle_debt(
     user: dict = Depends(get_current_user),
 ):
     """Mark a debt as settled."""
-    db = get_db()
-    ok = db.settle_debt(user["id"], debt_id)
+    db = get_async_db()
+    ok = await db.settle_debt(user["id"], debt_id)
     return {"ok": ok}
 
 
@@ -95,8 +95,8 @@ async def delete_debt(
     user: dict = Depends(get_current_user),
 ):
     """Delete a debt entry."""
-    db = get_db()
-    ok = db.delete_debt(user["id"], debt_id)
+    db = get_async_db()
+    ok = await db.delete_debt(user["id"], debt_id)
     return {"ok": ok}
 
 
@@ -105,5 +105,5 @@ async def get_debt_summary(
     user: dict = Depends(get_current_user),
 ):
     """Get debt summary (total owed to me, I owe, net balance)."""
-    db = get_db()
-    return db.get_debt_summary(user["id"])
+    db = get_async_db()
+    return await db.get_debt_summary(user["id"])
@@ -1,13 +1,15 @@
 """Expense tracking REST API endpoints."""
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
-from Bot.database.get_db import get_db
+from Bot.database.get_db import get_async_db
+from Bot.services.budget_service import resolve_budget_period
+from Bot.services.types import ServiceError
 
 from webapp.backend.dependencies import get_current_user
 
@@ -46,6 +48,7 @@ class BudgetStatusOut(BaseModel):
     category_id: int
     category: str
     budget_limit: float
+    monthly_limit: float
     spent: float
     remaining: float
     percent_used: int
@@ -56,9 +59,9 @@ class BudgetStatusOut(BaseModel):
 @router.get("/categories", response_model=list[ExpenseCategoryOut])
 async def list_categories(user: dict = Depends(get_current_user)):
     """List active expense categories."""
-    db = get_db()
-    db.ensure_expense_categories_seeded(user["id"])
-    cats = db.list_active_expense_categories(user["id"])
+    db = get_async_db()
+    await db.ensure_expense_categories_seeded(user["id"])
+    cats = await db.list_active_expense_categories(user["id"])
     return [ExpenseCategoryOut(id=c["id"], code=c["code"], title=c["title"], budget_limit=c.get("budget_limit", 0)) for c in cats]
 
 
@@ -73,8 +76,8 @@ async def list_expenses(
         now = datetime.utcnow()
         year = year or now.year
         month = month or now.month
-    db = get_db()
-    items = db.list_expenses(user["id"], year, month)
+    db = get_async_db()
+    items = await db.list_expenses(user["id"], year, month)
     return [ExpenseOut(**item) for item in items]
 
 
@@ -84,8 +87,8 @@ async def create_expense(
     user: dict = Depends(get_current_user),
 ):
     """Create a new expense entry."""
-    db = get_db()
-    new_id = db.add_expense(
+    db = get_async_db()
+    new_id = await db.add_expense(
         user_id=user["id"],
         amount=body.amount,
         category=body.category,
@@ -106,8 +109,8 @@ async def delete_expense(
     user: dict = Depends(get_current_user),
 ):
     """Delete an expense entry."""
-    db = get_db()
-    deleted = db.delete_expense(user["id"], expense_id)
+    db = get_async_db()
+    deleted = await db.delete_expense(user["id"], expense_id)
     return {"ok": deleted}
 
 
@@ -117,8 +120,8 @@ async def set_budget_limit(
     user: dict = Depends(get_current_user),
 ):
     """Set budget limit for an expense category."""
-    db = get_db()
-    ok = db.set_budget_limit(user["id"], body.category_id, body.limit)
+    db = get_async_db()
+    ok = await db.set_budget_limit(user["id"], body.category_id, body.limit)
     return {"ok": ok}
 
 
@@ -126,13 +129,28 @@ async def set_budget_limit(
 async def get_budget_status(
     year: int = Query(default=None),
     month: int = Query(default=None),
+    period: str = Query(default="month"),
+    start: Optional[date] = Query(default=None),
+    end: Optional[date] = Query(default=None),
     user: dict = Depends(get_current_user),
 ):
-    """Get budget limit vs actual spending per category."""
-    if year is None or month is None:
-        now = datetime.utcnow()
-        year = year or now.year
-        month = month or now.month
-    db = get_db()
-    items = db.get_budget_status(user["id"], year, month)
+    """Get budget limit vs actual spending per category.
+
+    ``period`` is ``month`` (default, uses year/month), ``week``,
+    ``rolling30`` or ``custom`` (uses start/end, inclusive). For windows
+    other than a month, ``budget_limit`` is the monthly limit prorated to
+    the window and ``monthly_limit`` the configured one.
+    """
+    resolved = resolve_budget_period(
+        period, datetime.utcnow().date(), year=year, month=month, start=start, end=end,
+    )
+    if isinstance(resolved, ServiceError):
+        raise HTTPException(status_code=400, detail=resolved.message)
+    db = get_async_db()
+    if resolved.month is not None:
+        items = await db.get_budget_status(user["id"], *resolved.month)
+    else:
+        items = await db.get_budget_status_between(
+            user["id"], resolved.start_iso, resolved.end_iso, resolved.limit_factor
+        )
     return [BudgetStatusOut(**item) for item in items]
@@ -1,17 +1,19 @@
-"""Google Sheets sync REST API endpoints."""
-from __future__ import annotations
+"""Google Sheets sync REST API endpoints.
 
-import logging
+``POST /sync`` starts a background sync job and returns its id; the client
+polls ``GET /jobs/{id}`` for the outcome.
+"""
+from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 
-from Bot.database.get_db import get_db
+from Bot.database.get_db import get_async_db
 
 from webapp.backend.dependencies import get_current_user
+from webapp.backend.utils.google_sheets import get_sync_manager
 
 router = APIRouter()
-LOGGER = logging.getLogger(__name__)
 
 
 # ── Schemas ───────────────────────────────────────────
@@ -33,8 +35,8 @@ async def get_sheets_status(user: dict = Depends(get_current_user)):
     """Check if Google Sheets is connected."""
     from webapp.backend.utils.google_sheets import get_service_account_email
 
-    db = get_db()
-    sheets_id = db.get_google_sheets_id(user["id"])
+    db = get_async_db()
+    sheets_id = await db.get_google_sheets_id(user["id"])
     return SheetsStatusOut(
         connected=sheets_id is not None,
         spreadsheet_id=sheets_id,
@@ -51,32 +53,35 @@ async def connect_sheets(
     from webapp.backend.utils.google_sheets import extract_spreadsheet_id
 
     spreadsheet_id = extract_spreadsheet_id(body.spreadsheet_url)
-    db = get_db()
-    db.set_google_sheets_id(user["id"], spreadsheet_id)
+    db = get_async_db()
+    await db.set_google_sheets_id(user["id"], spreadsheet_id)
     return {"ok": True, "spreadsheet_id": spreadsheet_id}
 
 
 @router.post("/disconnect")
 async def disconnect_sheets(user: dict = Depends(get_current_user)):
     """Disconnect Google Sheets."""
-    db = get_db()
-    db.set_google_sheets_id(user["id"], None)
+    db = get_async_db()
+    await db.set_google_sheets_id(user["id"], None)
     return {"ok": True}
 
 
 @router.post("/sync")
 async def sync_sheets(user: dict = Depends(get_current_user)):
-    """Sync current data to the connected Google Spreadsheet."""
-    db = get_db()
-    sheets_id = db.get_google_sheets_id(user["id"])
+    """Queue a sync of current data to the connected Google Spreadsheet."""
+    db = get_async_db()
+    sheets_id = await db.get_google_sheets_id(user["id"])
     if not sheets_id:
         return {"ok": False, "error": "Google Sheets не подключён"}
 
-    try:
-        from webapp.backend.utils.google_sheets import sync_to_sheets
+    job = await get_sync_manager().submit(db, user["id"], sheets_id)
+    return {"ok": True, **job.public()}
+
 
-        result = sync_to_sheets(user["id"], sheets_id)
-        return result
-    except Exception as exc:
-        LOGGER.exception("Google Sheets sync failed for user %s", user["id"])
-        return {"ok": False, "error": str(exc)}
+@router.get("/jobs/{job_id}")
+async def get_sync_job(job_id: str, user: dict = Depends(get_current_user)):
+    """Return the status (and, once done, the result) of a sync job."""
+    job = get_sync_manager().get(job_id, user["id"])
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"ok": job.status != "failed", **job.public()}
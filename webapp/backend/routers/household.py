@@ -6,7 +6,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 
-from Bot.database.get_db import get_db
+from Bot.database.get_db import get_async_db
 from Bot.config.settings import get_settings
 from Bot.utils.time import now_for_user
 from Bot.utils.datetime_utils import current_month_str
@@ -49,9 +49,9 @@ class AnswerRequest(BaseModel):
 @router.get("/items", response_model=list[HouseholdItemOut])
 async def list_household_items(user: dict = Depends(get_current_user)):
     """List active household payment items."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
-    items = db.list_active_household_items(user_id)
+    items = await db.list_active_household_items(user_id)
     return [
         HouseholdItemOut(
             code=i["code"],
@@ -69,30 +69,25 @@ async def get_payment_status(
     user: dict = Depends(get_current_user),
 ):
     """Get payment status for current (or specified) month."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
 
     if not month:
-        now = now_for_user(db, user_id, DEFAULT_TZ)
+        now = await db.run_sync(now_for_user, user_id, DEFAULT_TZ)
         month = current_month_str(now)
 
     # Ensure month is initialized
     await db.init_household_questions_for_month(user_id, month)
-    status_map = await db.get_household_payment_status_map(user_id, month)
-    items = db.list_active_household_items(user_id)
-
-    result = []
-    for item in items:
-        code = item["code"]
-        result.append(
-            PaymentStatusOut(
-                code=code,
-                text=item["text"],
-                amount=item["amount"],
-                is_paid=bool(status_map.get(code, 0)),
-            )
+    items = await db.list_household_items_with_status(user_id, month)
+    return [
+        PaymentStatusOut(
+            code=item["code"],
+            text=item["text"],
+            amount=item["amount"],
+            is_paid=bool(item["is_paid"]),
         )
-    return result
+        for item in items
+    ]
 
 
 @router.post("/answer")
@@ -102,19 +97,19 @@ async def answer_question(
     user: dict = Depends(get_current_user),
 ):
     """Mark a household payment as paid or unpaid."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
 
     if not month:
-        now = now_for_user(db, user_id, DEFAULT_TZ)
+        now = await db.run_sync(now_for_user, user_id, DEFAULT_TZ)
         month = current_month_str(now)
 
     # Get item amount for savings deduction
-    item = db.get_household_item_by_code(user_id, body.question_code)
+    item = await db.get_household_item_by_code(user_id, body.question_code)
     amount = item["amount"] if item else None
-    debit_category = db.get_household_debit_category(user_id)
+    debit_category = await db.get_household_debit_category(user_id)
 
-    changed = db.apply_household_payment_answer(
+    changed = await db.apply_household_payment_answer(
         user_id=user_id,
         month=month,
         question_code=body.question_code,
@@ -132,11 +127,11 @@ async def reset_month(
     user: dict = Depends(get_current_user),
 ):
     """Reset all payments for a month."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
 
     if not month:
-        now = now_for_user(db, user_id, DEFAULT_TZ)
+        now = await db.run_sync(now_for_user, user_id, DEFAULT_TZ)
         month = current_month_str(now)
 
     await db.reset_household_questions_for_month(user_id, month)
@@ -6,7 +6,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 
-from Bot.database.get_db import get_db
+from Bot.database.get_db import get_async_db
 from Bot.config.settings import get_settings
 from Bot.utils.time import now_for_user
 
@@ -58,10 +58,10 @@ class ConfirmRequest(BaseModel):
 @router.get("/categories", response_model=list[IncomeCategoryOut])
 async def list_income_categories(user: dict = Depends(get_current_user)):
     """List active income categories with percents."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
-    db.ensure_user_settings(user_id)
-    categories = db.list_active_income_categories(user_id)
+    await db.ensure_user_settings(user_id)
+    categories = await db.list_active_income_categories(user_id)
     return [
         IncomeCategoryOut(
             id=c["id"],
@@ -80,9 +80,9 @@ async def calculate_distribution(
     user: dict = Depends(get_current_user),
 ):
     """Calculate income distribution without saving."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
-    categories = db.list_active_income_categories(user_id)
+    categories = await db.list_active_income_categories(user_id)
 
     allocations = []
     total_percent = 0
@@ -111,10 +111,10 @@ async def confirm_distribution(
     body: ConfirmRequest,
     user: dict = Depends(get_current_user),
 ):
-    """Confirm income distribution — add amounts to savings."""
-    db = get_db()
+    """Confirm income distribution — add amounts to savings in one transaction."""
+    db = get_async_db()
     user_id = user["id"]
-    categories = db.list_active_income_categories(user_id)
+    categories = await db.list_active_income_categories(user_id)
 
     applied = []
     for cat in categories:
@@ -122,8 +122,11 @@ async def confirm_distribution(
         if pct <= 0:
             continue
         allocated = round(body.amount * pct / 100, 2)
-        db.update_saving(user_id, cat["code"], allocated)
-        db.log_income(user_id, allocated, cat["code"], "income")
         applied.append({"code": cat["code"], "title": cat["title"], "amount": allocated})
 
+    ok = await db.distribute_income(
+        user_id, [(item["code"], item["amount"]) for item in applied], "income"
+    )
+    if not ok:
+        raise HTTPException(status_code=500, detail="Failed to distribute income")
     return {"ok": True, "applied": applied}
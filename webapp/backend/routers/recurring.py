@@ -6,7 +6,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, Field
 
-from Bot.database.get_db import get_db
+from Bot.database.get_db import get_async_db
 
 from webapp.backend.dependencies import get_current_user
 
@@ -38,8 +38,8 @@ class CreateRecurringRequest(BaseModel):
 @router.get("/", response_model=list[RecurringPaymentOut])
 async def list_recurring(user: dict = Depends(get_current_user)):
     """List active recurring payments."""
-    db = get_db()
-    items = db.list_recurring_payments(user["id"])
+    db = get_async_db()
+    items = await db.list_recurring_payments(user["id"])
     return [RecurringPaymentOut(**item) for item in items]
 
 
@@ -49,8 +49,8 @@ async def create_recurring(
     user: dict = Depends(get_current_user),
 ):
     """Create a new recurring payment."""
-    db = get_db()
-    new_id = db.add_recurring_payment(
+    db = get_async_db()
+    new_id = await db.add_recurring_payment(
         user_id=user["id"],
         title=body.title,
         amount=body.amount,
@@ -58,7 +58,7 @@ async def create_recurring(
         frequency=body.frequency,
         day_of_month=body.day_of_month,
     )
-    items = db.list_recurring_payments(user["id"])
+    items = await db.list_recurring_payments(user["id"])
     item = next((i for i in items if i["id"] == new_id), items[-1] if items else {})
     return RecurringPaymentOut(**item)
 
@@ -69,6 +69,6 @@ async def delete_recurring(
     user: dict = Depends(get_current_user),
 ):
     """Deactivate a recurring payment."""
-    db = get_db()
-    db.deactivate_recurring_payment(user["id"], payment_id)
+    db = get_async_db()
+    await db.deactivate_recurring_payment(user["id"], payment_id)
     return {"ok": True}
@@ -6,7 +6,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel, Field
 
-from Bot.database.get_db import get_db
+from Bot.database.get_db import get_async_db
 
 from webapp.backend.dependencies import get_current_user
 
@@ -49,8 +49,8 @@ async def get_monthly_report(
         year = year or now.year
         month = month or now.month
 
-    db = get_db()
-    data = db.get_monthly_report_data(user["id"], year, month)
+    db = get_async_db()
+    data = await db.get_monthly_report_data(user["id"], year, month)
     return MonthlyReportOut(
         month=data["month"],
         total_income=data["total_income"],
@@ -66,8 +66,8 @@ async def get_monthly_report(
 @router.get("/report-day")
 async def get_report_day(user: dict = Depends(get_current_user)):
     """Get the configured report day."""
-    db = get_db()
-    day = db.get_report_day(user["id"])
+    db = get_async_db()
+    day = await db.get_report_day(user["id"])
     return {"day": day}
 
 
@@ -77,6 +77,6 @@ async def set_report_day(
     user: dict = Depends(get_current_user),
 ):
     """Set the day of month for auto-reports."""
-    db = get_db()
-    db.set_report_day(user["id"], body.day)
+    db = get_async_db()
+    await db.set_report_day(user["id"], body.day)
     return {"ok": True, "day": body.day}
@@ -2,16 +2,26 @@
 from __future__ import annotations
 
 from typing import Optional
+from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 
-from Bot.database.get_db import get_db
+from Bot.config.settings import get_settings
+from Bot.database.get_db import get_async_db
+from Bot.utils.time import set_user_timezone
 
 from webapp.backend.dependencies import get_current_user
 
 router = APIRouter()
 
+_settings = get_settings()
+DEFAULT_TZ = (
+    _settings.timezone.key
+    if hasattr(_settings.timezone, "key")
+    else str(_settings.timezone)
+)
+
 
 # ── Schemas ───────────────────────────────────────────
 
@@ -38,9 +48,9 @@ class UpdateKeepDaysRequest(BaseModel):
 @router.get("/", response_model=UserSettingsOut)
 async def get_settings(user: dict = Depends(get_current_user)):
     """Get user settings."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
-    s = db.get_user_settings(user_id)
+    s = await db.get_user_settings(user_id)
     return UserSettingsOut(
         timezone=s.get("timezone", "Europe/Moscow"),
         purchased_keep_days=int(s.get("purchased_keep_days", 30)),
@@ -57,17 +67,15 @@ async def update_timezone(
     body: UpdateTimezoneRequest,
     user: dict = Depends(get_current_user),
 ):
-    """Update user timezone."""
-    db = get_db()
+    """Update user timezone; unknown IANA zones are rejected."""
+    try:
+        ZoneInfo(body.timezone)
+    except Exception:  # noqa: BLE001
+        raise HTTPException(status_code=400, detail="Unknown timezone")
+    db = get_async_db()
     user_id = user["id"]
-    db.ensure_user_settings(user_id)
-    cursor = db.connection.cursor()
-    cursor.execute(
-        f'UPDATE "{db.tables.user_settings}" SET timezone = ? WHERE user_id = ?',
-        (body.timezone, user_id),
-    )
-    db.connection.commit()
-    return {"ok": True, "timezone": body.timezone}
+    stored = await db.run_sync(set_user_timezone, user_id, body.timezone, DEFAULT_TZ)
+    return {"ok": True, "timezone": stored}
 
 
 @router.post("/keep-days")
@@ -76,18 +84,18 @@ async def update_keep_days(
     user: dict = Depends(get_current_user),
 ):
     """Update purchased keep days."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
-    db.update_purchased_keep_days(user_id, body.days)
+    await db.update_purchased_keep_days(user_id, body.days)
     return {"ok": True, "days": body.days}
 
 
 @router.post("/byt-reminders/toggle")
 async def toggle_byt_reminders(user: dict = Depends(get_current_user)):
     """Toggle BYT reminders on/off."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
-    s = db.get_user_settings(user_id)
+    s = await db.get_user_settings(user_id)
     current = bool(s.get("byt_reminders_enabled", 1))
-    db.set_byt_reminders_enabled(user_id, not current)
+    await db.set_byt_reminders_enabled(user_id, not current)
     return {"ok": True, "enabled": not current}
@@ -3,17 +3,21 @@ from __future__ import annotations
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field
 
 from Bot.config.settings import get_settings
-from Bot.database.get_db import get_db
+from Bot.database.async_db import AsyncFinanceDatabase
+from Bot.database.get_db import get_async_db
 from Bot.utils.time import now_for_user
 
 from webapp.backend.dependencies import get_current_user
 
 router = APIRouter()
 
+PURCHASES_PAGE_SIZE = 50
+PURCHASES_MAX_PAGE_SIZE = 200
+
 _settings = get_settings()
 DEFAULT_TZ = (
     _settings.timezone.key
@@ -22,8 +26,20 @@ DEFAULT_TZ = (
 )
 
 
-def _clock(db: FinanceDatabase, user_id: int):
-    return now_for_user(db, user_id, DEFAULT_TZ)
+async def _clock(db: AsyncFinanceDatabase, user_id: int):
+    return await db.run_sync(now_for_user, user_id, DEFAULT_TZ)
+
+
+def _encode_cursor(purchase: dict) -> str:
+    return f"{purchase['purchased_at_utc']}~{purchase['id']}"
+
+
+def _decode_cursor(cursor: str) -> tuple[str, int]:
+    timestamp, _, raw_id = cursor.rpartition("~")
+    try:
+        return timestamp, int(raw_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
 
 
 # ── Pydantic schemas ──────────────────────────────────────────────
@@ -72,9 +88,9 @@ class PurchaseOut(BaseModel):
 @router.get("/categories", response_model=list[CategoryOut])
 async def list_categories(user: dict = Depends(get_current_user)):
     """List active wishlist categories."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
-    categories = db.list_active_wishlist_categories(user_id)
+    categories = await db.list_active_wishlist_categories(user_id)
     return [
         CategoryOut(
             id=c["id"],
@@ -93,9 +109,9 @@ async def list_wishes(
     user: dict = Depends(get_current_user),
 ):
     """List wishes for user, optionally filtered by category."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
-    all_wishes = db.get_wishes_by_user(user_id)
+    all_wishes = await db.get_wishes_by_user(user_id)
 
     result = []
     for w in all_wishes:
@@ -120,10 +136,10 @@ async def list_wishes(
 @router.post("/wishes", response_model=WishOut)
 async def create_wish(body: WishCreate, user: dict = Depends(get_current_user)):
     """Add a new wish."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
 
-    wish_id = db.add_wish(
+    wish_id = await db.add_wish(
         user_id=user_id,
         name=body.name,
         price=body.price,
@@ -147,12 +163,12 @@ async def create_wish(body: WishCreate, user: dict = Depends(get_current_user)):
 @router.post("/wishes/{wish_id}/purchase")
 async def purchase_wish(wish_id: int, user: dict = Depends(get_current_user)):
     """Mark a wish as purchased."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
 
-    debit_category = db.get_wishlist_debit_category(user_id)
-    purchased_at = _clock(db, user_id)
-    result = db.purchase_wish(user_id, wish_id, debit_category, purchased_at=purchased_at)
+    debit_category = await db.get_wishlist_debit_category(user_id)
+    purchased_at = await _clock(db, user_id)
+    result = await db.purchase_wish(user_id, wish_id, debit_category, purchased_at=purchased_at)
 
     status = result.get("status")
     if status == "not_found":
@@ -183,37 +199,50 @@ async def defer_wish(
     user: dict = Depends(get_current_user),
 ):
     """Defer a wish until a specific date."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
 
-    wish = db.get_wish(wish_id)
+    wish = await db.get_wish(wish_id)
     if not wish or wish.get("user_id") != user_id:
         raise HTTPException(status_code=404, detail="Wish not found")
 
-    db.set_wishlist_item_deferred_until(user_id, wish_id, body.deferred_until)
+    await db.set_wishlist_item_deferred_until(user_id, wish_id, body.deferred_until)
     return {"ok": True, "deferred_until": body.deferred_until}
 
 
 @router.delete("/wishes/{wish_id}")
 async def delete_wish(wish_id: int, user: dict = Depends(get_current_user)):
     """Delete a wish by marking it purchased (soft delete)."""
-    db = get_db()
+    db = get_async_db()
     user_id = user["id"]
 
-    wish = db.get_wish(wish_id)
+    wish = await db.get_wish(wish_id)
     if not wish or wish.get("user_id") != user_id:
         raise HTTPException(status_code=404, detail="Wish not found")
 
-    db.mark_wish_purchased(wish_id, purchased_at=_clock(db, user_id))
+    await db.mark_wish_purchased(wish_id, purchased_at=await _clock(db, user_id))
     return {"ok": True}
 
 
 @router.get("/purchases", response_model=list[PurchaseOut])
-async def list_purchases(user: dict = Depends(get_current_user)):
-    """List recent purchases."""
-    db = get_db()
+async def list_purchases(
+    response: Response,
+    limit: int = Query(default=PURCHASES_PAGE_SIZE, ge=1, le=PURCHASES_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    user: dict = Depends(get_current_user),
+):
+    """List recent purchases, newest first.
+
+    Pages are keyset-based: when more rows exist the ``X-Next-Cursor``
+    header carries the value to pass as ``cursor`` for the next page.
+    """
+    db = get_async_db()
     user_id = user["id"]
-    purchases = db.get_purchases_by_user(user_id)
+    after = _decode_cursor(cursor) if cursor else None
+    purchases = await db.get_purchases_by_user(user_id, limit=limit + 1, after=after)
+    if len(purchases) > limit:
+        purchases = purchases[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(purchases[-1])
     return [
         PurchaseOut(
             id=p["id"],
@@ -0,0 +1,361 @@
+"""Excel export: bulk data collection, streaming workbook writer and job queue.
+
+Data for a report is collected on the event loop through the async DB
+facade (a handful of bulk reads), fingerprinted, and handed to a worker
+process that writes the workbook with openpyxl's write-only mode straight
+to disk. Finished files are cached per (user, year, month, data digest),
+so downloading an unchanged report again does not rebuild it. A file is
+never deleted while a live job points at it; superseded versions go when
+their last job expires, and files unused for ``EXPORT_FILE_MAX_AGE`` are
+swept from ``EXPORT_DIR``.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import tempfile
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+EXPORT_DIR = Path(tempfile.gettempdir()) / "finance_exports"
+EXPORT_WORKERS = 1
+# Finished/failed jobs are forgotten after this long.
+JOB_RETENTION_SECONDS = 3600
+# Export files not built or served for this long are deleted, including
+# leftovers from earlier processes; the sweep runs at most this often.
+EXPORT_FILE_MAX_AGE = 24 * 3600
+EXPORT_SWEEP_INTERVAL = 600
+
+_HEADER_FILL = "4472C4"
+
+
+async def collect_export_data(db, user_id: int, year: int, month: int) -> dict[str, Any]:
+    """Gather everything the workbook needs with bulk reads."""
+
+    month_prefix = f"{year:04d}-{month:02d}"
+    savings, report, recurring, items = await asyncio.gather(
+        db.get_all_savings_list(user_id),
+        db.get_monthly_report_data(user_id, year, month),
+        db.list_recurring_payments(user_id),
+        db.list_household_items_with_status(user_id, month_prefix),
+    )
+    return {
+        "savings": savings,
+        "report": report,
+        "recurring": recurring,
+        "household": [
+            {"text": item["text"], "amount": item["amount"], "is_paid": bool(item["is_paid"])}
+            for item in items
+        ],
+    }
+
+
+def data_digest(data: dict[str, Any]) -> str:
+    """Stable fingerprint of export data; changes whenever the report would."""
+
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def write_workbook(data: dict[str, Any], path: str) -> str:
+    """Write the .xlsx for ``data`` to ``path`` using openpyxl write-only mode.
+
+    Runs in a worker process; only ``data`` crosses the process boundary.
+    """
+
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+
+    wb = Workbook(write_only=True)
+    header_font = Font(bold=True, size=11, color="FFFFFF")
+    header_fill = PatternFill(start_color=_HEADER_FILL, end_color=_HEADER_FILL, fill_type="solid")
+    header_alignment = Alignment(horizontal="center")
+
+    def new_sheet(title: str, header: list[str], widths: dict[str, int]):
+        ws = wb.create_sheet(title)
+        for column, width in widths.items():
+            ws.column_dimensions[column].width = width
+        cells = []
+        for value in header:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = header_alignment
+            cells.append(cell)
+        ws.append(cells)
+        return ws
+
+    # ── Sheet 1: Savings ──────────────────────────────
+    ws = new_sheet(
+        "Накопления",
+        ["Категория", "Текущие", "Цель", "Назначение", "Прогресс %"],
+        {"A": 20, "D": 25},
+    )
+    for s in data["savings"]:
+        current = float(s.get("current") or 0)
+        goal = float(s.get("goal") or 0)
+        pct = round(current / goal * 100, 1) if goal > 0 else 0
+        ws.append([s["category"], current, goal, s.get("purpose", ""), pct])
+
+    # ── Sheet 2: Monthly Report ───────────────────────
+    report = data["report"]
+    ws = new_sheet("Отчёт за месяц", ["Показатель", "Сумма"], {"A": 30, "B": 15})
+    ws.append(["Месяц", report["month"]])
+    ws.append(["Общий доход", report["total_income"]])
+    ws.append(["Общий расход", report["total_expense"]])
+    ws.append(["Баланс", round(report["total_income"] - report["total_expense"], 2)])
+    ws.append(["Бытовые оплачено", report["household_paid"]])
+    ws.append(["Бытовые всего", report["household_total"]])
+    ws.append([])
+    ws.append(["--- Доходы по категориям ---", ""])
+    for item in report["income_by_category"]:
+        ws.append([item["category"], item["amount"]])
+    ws.append([])
+    ws.append(["--- Расходы по категориям ---", ""])
+    for item in report["expense_by_category"]:
+        ws.append([item["category"], item["amount"]])
+
+    # ── Sheet 3: Recurring Payments ───────────────────
+    ws = new_sheet(
+        "Повторяющиеся",
+        ["Название", "Сумма", "Частота", "День месяца", "Следующая дата"],
+        {"A": 25},
+    )
+    for r in data["recurring"]:
+        ws.append([r["title"], r["amount"], r["frequency"], r["day_of_month"], r.get("next_due_date", "")])
+
+    # ── Sheet 4: Household ────────────────────────────
+    ws = new_sheet("Бытовые платежи", ["Платёж", "Сумма", "Оплачено"], {"A": 35})
+    for item in data["household"]:
+        ws.append([item["text"], item["amount"], "Да" if item["is_paid"] else "Нет"])
+
+    tmp_path = f"{path}.part"
+    wb.save(tmp_path)
+    Path(tmp_path).replace(path)
+    return path
+
+
+@dataclass
+class ExportJob:
+    id: str
+    user_id: int
+    year: int
+    month: int
+    status: str = "queued"  # queued | running | done | failed
+    path: Path | None = None
+    error: str | None = None
+    cached: bool = False
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+    @property
+    def filename(self) -> str:
+        return f"finance_report_{self.year}_{self.month:02d}.xlsx"
+
+    def public(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "year": self.year,
+            "month": self.month,
+            "cached": self.cached,
+            "error": self.error,
+        }
+
+
+class ExportJobManager:
+    """Queue of export jobs executed on a worker pool, with an on-disk cache."""
+
+    def __init__(
+        self,
+        export_dir: Path = EXPORT_DIR,
+        executor: Executor | None = None,
+        workers: int = EXPORT_WORKERS,
+    ) -> None:
+        self.export_dir = Path(export_dir)
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._workers = workers
+        self._jobs: dict[str, ExportJob] = {}
+        self._in_flight: dict[Path, asyncio.Task] = {}
+        # Newest file of each (user_id, year, month) report: the cache entry.
+        self._latest: dict[tuple[int, int, int], Path] = {}
+        self._swept_at = 0.0
+        self.hits = 0
+        self.builds = 0
+        self.files_removed = 0
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _cache_path(self, job: ExportJob, digest: str) -> Path:
+        return self.export_dir / f"{job.user_id}_{job.year:04d}-{job.month:02d}_{digest}.xlsx"
+
+    def _referenced(self) -> set[Path]:
+        paths = {job.path for job in self._jobs.values() if job.path is not None}
+        paths.update(self._in_flight)
+        return paths
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return
+        self.files_removed += 1
+
+    def _set_latest(self, job: ExportJob, path: Path) -> None:
+        key = (job.user_id, job.year, job.month)
+        previous = self._latest.get(key)
+        self._latest[key] = path
+        if previous is not None and previous != path and previous not in self._referenced():
+            self._remove(previous)
+
+    def _prune(self) -> None:
+        now = time.time()
+        cutoff = now - JOB_RETENTION_SECONDS
+        stale = [
+            job
+            for job in self._jobs.values()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job in stale:
+            del self._jobs[job.id]
+        referenced = self._referenced()
+        keep = referenced | set(self._latest.values())
+        for job in stale:
+            if job.path is not None and job.path not in keep:
+                self._remove(job.path)
+        if now - self._swept_at >= EXPORT_SWEEP_INTERVAL:
+            self._swept_at = now
+            self._sweep(now, referenced)
+
+    def _sweep(self, now: float, referenced: set[Path]) -> None:
+        """Delete export files untouched for ``EXPORT_FILE_MAX_AGE`` that no job uses."""
+
+        removed = self.files_removed
+        for path in self.export_dir.glob("*.xlsx"):
+            if path in referenced:
+                continue
+            try:
+                if now - path.stat().st_mtime < EXPORT_FILE_MAX_AGE:
+                    continue
+            except FileNotFoundError:
+                continue
+            self._remove(path)
+        self._latest = {key: path for key, path in self._latest.items() if path.exists()}
+        if self.files_removed > removed:
+            LOGGER.info("Excel export sweep removed %s files", self.files_removed - removed)
+
+    async def submit(self, db, user_id: int, year: int, month: int) -> ExportJob:
+        """Create a job for the report; returns immediately."""
+
+        self._prune()
+        job = ExportJob(id=uuid.uuid4().hex, user_id=user_id, year=year, month=month)
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(db, job))
+        return job
+
+    async def _run(self, db, job: ExportJob) -> None:
+        try:
+            data = await collect_export_data(db, job.user_id, job.year, job.month)
+            path = self._cache_path(job, data_digest(data))
+            if path.exists():
+                self.hits += 1
+                job.cached = True
+                # A served file counts as used for the age sweep.
+                path.touch()
+            else:
+                build = self._in_flight.get(path)
+                if build is None:
+                    build = asyncio.create_task(self._build(job, data, path))
+                    self._in_flight[path] = build
+                    build.add_done_callback(lambda _: self._in_flight.pop(path, None))
+                job.status = "running"
+                await asyncio.shield(build)
+            job.path = path
+            job.status = "done"
+            self._set_latest(job, path)
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.exception("Excel export failed for user %s", job.user_id)
+            job.status = "failed"
+            job.error = str(exc)
+        finally:
+            job.finished_at = time.time()
+
+    async def _build(self, job: ExportJob, data: dict[str, Any], path: Path) -> None:
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            await loop.run_in_executor(self._pool(), write_workbook, data, str(path))
+        except BrokenProcessPool:
+            # A crashed worker poisons the pool; start a fresh one next time.
+            if self._owns_executor:
+                self._executor = None
+            raise
+        self.builds += 1
+        LOGGER.info(
+            "Excel export built user=%s month=%04d-%02d in %.3fs",
+            job.user_id, job.year, job.month, time.perf_counter() - started,
+        )
+
+    def get(self, job_id: str, user_id: int) -> ExportJob | None:
+        job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    async def wait(self, job: ExportJob) -> ExportJob:
+        if job.task is not None:
+            await asyncio.shield(job.task)
+        return job
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "jobs": len(self._jobs),
+            "cache_hits": self.hits,
+            "builds": self.builds,
+            "files_removed": self.files_removed,
+        }
+
+    async def close(self) -> None:
+        for job in list(self._jobs.values()):
+            if job.task is not None and not job.task.done():
+                job.task.cancel()
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_MANAGER: ExportJobManager | None = None
+
+
+def get_export_manager() -> ExportJobManager:
+    global _MANAGER
+    if _MANAGER is None:
+        _MANAGER = ExportJobManager()
+    return _MANAGER
+
+
+async def close_export_manager() -> None:
+    global _MANAGER
+    if _MANAGER is not None:
+        await _MANAGER.close()
+        _MANAGER = None
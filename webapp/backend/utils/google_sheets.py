@@ -5,13 +5,26 @@ Requires:
   - gspread + google-auth packages
   - GOOGLE_SHEETS_CREDENTIALS env var pointing to service account JSON file
   - User must share the spreadsheet with the service account email
+
+Syncs are incremental: the rows of every worksheet are collected through
+the async DB facade, hashed row by row and compared with the snapshot of
+the last successful sync (``снимки_таблиц``). Only changed row ranges are
+sent, in one ``values_batch_update`` per spreadsheet, from a background
+job whose gspread calls run in a worker thread.
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
 import re
+import time
+import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Callable
 
 LOGGER = logging.getLogger(__name__)
 
@@ -64,65 +77,60 @@ def get_service_account_email() -> str | None:
         return None
 
 
-def sync_to_sheets(user_id: int, spreadsheet_id: str) -> dict:
-    """Sync all financial data to the given Google Spreadsheet.
+SHEET_TITLES = (
+    "Накопления",
+    "Расходы",
+    "Отчёт",
+    "Повторяющиеся",
+    "Бытовые платежи",
+    "Долги",
+)
+# Finished/failed sync jobs are forgotten after this long.
+JOB_RETENTION_SECONDS = 3600
 
-    Creates/updates worksheets:
-      - Накопления (Savings)
-      - Расходы (Expenses for current month)
-      - Отчёт (Monthly report)
-      - Повторяющиеся (Recurring)
-      - Бытовые платежи (Household)
-      - Долги (Debts)
 
-    Returns: {"ok": True, "sheets_updated": int} or raises on error.
-    """
-    from Bot.database.get_db import get_db
+def _debt_rows(debts: list[dict], status: str) -> list[list[Any]]:
+    return [
+        [
+            d["person"],
+            d["amount"],
+            "Мне должны" if d["direction"] == "owed" else "Я должен",
+            d.get("description", ""),
+            status,
+            d["created_at"],
+        ]
+        for d in debts
+    ]
+
 
-    gc = _get_client()
-    sh = gc.open_by_key(spreadsheet_id)
-    db = get_db()
+async def collect_sheet_rows(db, user_id: int, year: int, month: int) -> dict[str, list[list[Any]]]:
+    """Rows (header first) of every synced worksheet, from bulk reads."""
 
-    now = datetime.utcnow()
-    year, month = now.year, now.month
     month_prefix = f"{year:04d}-{month:02d}"
-    sheets_updated = 0
+    savings, expenses, report, recurring, items, active_debts, settled_debts = (
+        await asyncio.gather(
+            db.get_all_savings_list(user_id),
+            db.list_expenses(user_id, year, month),
+            db.get_monthly_report_data(user_id, year, month),
+            db.list_recurring_payments(user_id),
+            db.list_household_items_with_status(user_id, month_prefix),
+            db.list_debts(user_id, settled=False),
+            db.list_debts(user_id, settled=True),
+        )
+    )
 
-    def _get_or_create_worksheet(title: str, rows: int = 100, cols: int = 10):
-        try:
-            ws = sh.worksheet(title)
-            ws.clear()
-        except Exception:
-            ws = sh.add_worksheet(title=title, rows=rows, cols=cols)
-        return ws
-
-    # ── 1. Savings ────────────────────────────────────────
-    savings = db.get_all_savings_list(user_id)
-    ws = _get_or_create_worksheet("Накопления")
-    data = [["Категория", "Текущие", "Цель", "Назначение", "Прогресс %"]]
+    savings_rows: list[list[Any]] = [["Категория", "Текущие", "Цель", "Назначение", "Прогресс %"]]
     for s in savings:
-        current = float(s.get("current", 0))
-        goal = float(s.get("goal", 0))
+        current = float(s.get("current") or 0)
+        goal = float(s.get("goal") or 0)
         pct = round(current / goal * 100, 1) if goal > 0 else 0
-        data.append([s["category"], current, goal, s.get("purpose", ""), pct])
-    if len(data) > 1:
-        ws.update(data, value_input_option="RAW")
-    sheets_updated += 1
-
-    # ── 2. Expenses ───────────────────────────────────────
-    expenses = db.list_expenses(user_id, year, month)
-    ws = _get_or_create_worksheet("Расходы")
-    data = [["Дата", "Категория", "Сумма", "Заметка"]]
+        savings_rows.append([s["category"], current, goal, s.get("purpose", ""), pct])
+
+    expense_rows: list[list[Any]] = [["Дата", "Категория", "Сумма", "Заметка"]]
     for e in expenses:
-        data.append([e.get("created_at", ""), e.get("category", ""), e.get("amount", 0), e.get("note", "")])
-    if len(data) > 1:
-        ws.update(data, value_input_option="RAW")
-    sheets_updated += 1
-
-    # ── 3. Monthly Report ─────────────────────────────────
-    report = db.get_monthly_report_data(user_id, year, month)
-    ws = _get_or_create_worksheet("Отчёт")
-    data = [
+        expense_rows.append([e.get("created_at", ""), e.get("category", ""), e.get("amount", 0), e.get("note", "")])
+
+    report_rows: list[list[Any]] = [
         ["Показатель", "Сумма"],
         ["Месяц", report["month"]],
         ["Общий доход", report["total_income"]],
@@ -134,57 +142,273 @@ def sync_to_sheets(user_id: int, spreadsheet_id: str) -> dict:
         ["--- Доходы по категориям ---", ""],
     ]
     for item in report["income_by_category"]:
-        data.append([item["category"], item["amount"]])
-    data.append([])
-    data.append(["--- Расходы по категориям ---", ""])
+        report_rows.append([item["category"], item["amount"]])
+    report_rows.append([])
+    report_rows.append(["--- Расходы по категориям ---", ""])
     for item in report["expense_by_category"]:
-        data.append([item["category"], item["amount"]])
-    ws.update(data, value_input_option="RAW")
-    sheets_updated += 1
-
-    # ── 4. Recurring ──────────────────────────────────────
-    recurring = db.list_recurring_payments(user_id)
-    ws = _get_or_create_worksheet("Повторяющиеся")
-    data = [["Название", "Сумма", "Частота", "День месяца", "Следующая дата"]]
+        report_rows.append([item["category"], item["amount"]])
+
+    recurring_rows: list[list[Any]] = [["Название", "Сумма", "Частота", "День месяца", "Следующая дата"]]
     for r in recurring:
-        data.append([r["title"], r["amount"], r["frequency"], r["day_of_month"], r.get("next_due_date", "")])
-    if len(data) > 1:
-        ws.update(data, value_input_option="RAW")
-    sheets_updated += 1
-
-    # ── 5. Household ──────────────────────────────────────
-    items = db.list_active_household_items(user_id)
-    ws = _get_or_create_worksheet("Бытовые платежи")
-    data = [["Платёж", "Сумма", "Оплачено"]]
-    cursor = db.connection.cursor()
+        recurring_rows.append([r["title"], r["amount"], r["frequency"], r["day_of_month"], r.get("next_due_date", "")])
+
+    household_rows: list[list[Any]] = [["Платёж", "Сумма", "Оплачено"]]
     for item in items:
+        household_rows.append([item["text"], item["amount"], "Да" if item["is_paid"] else "Нет"])
+
+    debt_rows: list[list[Any]] = [["Человек", "Сумма", "Направление", "Описание", "Статус", "Дата"]]
+    debt_rows += _debt_rows(active_debts, "Активный")
+    debt_rows += _debt_rows(settled_debts, "Погашен")
+
+    return dict(
+        zip(
+            SHEET_TITLES,
+            (savings_rows, expense_rows, report_rows, recurring_rows, household_rows, debt_rows),
+        )
+    )
+
+
+def _row_hash(row: list[Any]) -> str:
+    payload = json.dumps(row, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def _quote(title: str) -> str:
+    return "'" + title.replace("'", "''") + "'"
+
+
+def _a1(title: str, first_row: int, last_row: int, width: int) -> str:
+    return f"{_quote(title)}!A{first_row}:{_column_letter(width)}{last_row}"
+
+
+def diff_sheet(
+    title: str, rows: list[list[Any]], snapshot: dict[str, Any] | None
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Value ranges that turn the last synced ``snapshot`` into ``rows``.
+
+    Consecutive changed rows share one range. Rows are padded with blanks
+    to the wider of the old and new width, and rows that disappeared are
+    blanked, so no stale cell survives. Returns the ranges and the new
+    snapshot.
+    """
+
+    hashes = [_row_hash(row) for row in rows]
+    width = max([len(row) for row in rows] + [1])
+    old_hashes = snapshot["row_hashes"] if snapshot else []
+    pad_to = max(width, snapshot["width"] if snapshot else 0)
+    total = max(len(rows), len(old_hashes))
+
+    ranges: list[dict[str, Any]] = []
+    start: int | None = None
+    for index in range(total + 1):
+        changed = index < total and (
+            index >= len(old_hashes) or index >= len(hashes) or old_hashes[index] != hashes[index]
+        )
+        if changed and start is None:
+            start = index
+        elif not changed and start is not None:
+            values = [
+                list(rows[i]) + [""] * (pad_to - len(rows[i])) if i < len(rows) else [""] * pad_to
+                for i in range(start, index)
+            ]
+            ranges.append({"range": _a1(title, start + 1, index, pad_to), "values": values})
+            start = None
+    return ranges, {"width": width, "row_hashes": hashes}
+
+
+def _open_spreadsheet(client_factory: Callable[[], Any], spreadsheet_id: str) -> tuple[Any, set[str]]:
+    """Open the spreadsheet and list its worksheet titles (worker thread)."""
+
+    sh = client_factory().open_by_key(spreadsheet_id)
+    return sh, {ws.title for ws in sh.worksheets()}
+
+
+def _push_ranges(
+    sh,
+    existing: set[str],
+    ranges: list[dict[str, Any]],
+    fresh_sheets: dict[str, int],
+) -> None:
+    """Apply ``ranges`` to the spreadsheet (worker thread).
+
+    ``fresh_sheets`` maps sheets without a usable snapshot to their row
+    count: missing ones are created, existing ones are cleared once since
+    their content is unknown.
+    """
+
+    clear = []
+    for title, row_count in fresh_sheets.items():
+        if title not in existing:
+            sh.add_worksheet(title=title, rows=max(100, row_count), cols=10)
+        else:
+            clear.append(_quote(title))
+    if clear:
+        sh.values_batch_clear(body={"ranges": clear})
+    if ranges:
+        sh.values_batch_update({"valueInputOption": "RAW", "data": ranges})
+
+
+async def sync_to_sheets(
+    db,
+    user_id: int,
+    spreadsheet_id: str,
+    *,
+    now: datetime | None = None,
+    client_factory: Callable[[], Any] = _get_client,
+) -> dict:
+    """Sync all financial data to the given Google Spreadsheet.
+
+    Creates/updates worksheets:
+      - Накопления (Savings)
+      - Расходы (Expenses for current month)
+      - Отчёт (Monthly report)
+      - Повторяющиеся (Recurring)
+      - Бытовые платежи (Household)
+      - Долги (Debts)
+
+    Returns: {"ok": True, "sheets_updated": int, "ranges": int} or raises on error.
+    """
+
+    now = now or datetime.utcnow()
+    sheets = await collect_sheet_rows(db, user_id, now.year, now.month)
+    snapshots = await db.get_sheet_snapshots(user_id, spreadsheet_id)
+    sh, existing = await asyncio.to_thread(_open_spreadsheet, client_factory, spreadsheet_id)
+
+    ranges: list[dict[str, Any]] = []
+    fresh: dict[str, int] = {}
+    new_snapshots: dict[str, dict[str, Any]] = {}
+    sheets_updated = 0
+    for title, rows in sheets.items():
+        # A worksheet deleted by the user is rebuilt from scratch.
+        snapshot = snapshots.get(title) if title in existing else None
+        sheet_ranges, new_snapshots[title] = diff_sheet(title, rows, snapshot)
+        if snapshot is None:
+            fresh[title] = len(rows)
+        if sheet_ranges:
+            sheets_updated += 1
+            ranges.extend(sheet_ranges)
+
+    if ranges or fresh:
+        await asyncio.to_thread(_push_ranges, sh, existing, ranges, fresh)
+        await db.save_sheet_snapshots(user_id, spreadsheet_id, new_snapshots)
+    LOGGER.info(
+        "SHEETS_SYNC user=%s sheets_updated=%s ranges=%s fresh=%s",
+        user_id, sheets_updated, len(ranges), len(fresh),
+    )
+    return {"ok": True, "sheets_updated": sheets_updated, "ranges": len(ranges)}
+
+
+@dataclass
+class SyncJob:
+    id: str
+    user_id: int
+    spreadsheet_id: str
+    status: str = "queued"  # queued | running | done | failed
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+    def public(self) -> dict[str, Any]:
+        payload = {"job_id": self.id, "status": self.status, "error": self.error}
+        if self.result is not None:
+            payload.update(self.result)
+        return payload
+
+
+class SheetsSyncManager:
+    """Background sync jobs; one job per user runs at a time.
+
+    A request for the spreadsheet the user's latest job targets returns
+    that job; one for another spreadsheet is queued behind it.
+    """
+
+    def __init__(self, client_factory: Callable[[], Any] = _get_client) -> None:
+        self._client_factory = client_factory
+        self._jobs: dict[str, SyncJob] = {}
+        self._active: dict[int, SyncJob] = {}
+        self.runs = 0
+        self.failures = 0
+
+    def _prune(self) -> None:
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        stale = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in stale:
+            del self._jobs[job_id]
+
+    async def submit(self, db, user_id: int, spreadsheet_id: str) -> SyncJob:
+        """Start or queue a sync, or return the matching pending one; returns immediately."""
+
+        self._prune()
+        active = self._active.get(user_id)
+        if active is not None and active.spreadsheet_id == spreadsheet_id:
+            return active
+        job = SyncJob(id=uuid.uuid4().hex, user_id=user_id, spreadsheet_id=spreadsheet_id)
+        self._jobs[job.id] = job
+        self._active[user_id] = job
+        job.task = asyncio.create_task(self._run(db, job, after=active))
+        return job
+
+    async def _run(self, db, job: SyncJob, after: SyncJob | None = None) -> None:
+        if after is not None and after.task is not None:
+            await asyncio.wait([after.task])
+        job.status = "running"
         try:
-            cursor.execute(
-                f'SELECT is_paid FROM "{db.tables.household_payments}" WHERE user_id = ? AND month = ? AND question_code = ?',
-                (user_id, month_prefix, item["code"]),
+            job.result = await sync_to_sheets(
+                db, job.user_id, job.spreadsheet_id, client_factory=self._client_factory
             )
-            row = cursor.fetchone()
-            is_paid = bool(row and int(row["is_paid"])) if row else False
-        except Exception:
-            is_paid = False
-        data.append([item["text"], item["amount"], "Да" if is_paid else "Нет"])
-    if len(data) > 1:
-        ws.update(data, value_input_option="RAW")
-    sheets_updated += 1
-
-    # ── 6. Debts ──────────────────────────────────────────
-    active_debts = db.list_debts(user_id, settled=False)
-    settled_debts = db.list_debts(user_id, settled=True)
-    ws = _get_or_create_worksheet("Долги")
-    data = [["Человек", "Сумма", "Направление", "Описание", "Статус", "Дата"]]
-    for d in active_debts:
-        direction_text = "Мне должны" if d["direction"] == "owed" else "Я должен"
-        data.append([d["person"], d["amount"], direction_text, d.get("description", ""), "Активный", d["created_at"]])
-    for d in settled_debts:
-        direction_text = "Мне должны" if d["direction"] == "owed" else "Я должен"
-        data.append([d["person"], d["amount"], direction_text, d.get("description", ""), "Погашен", d["created_at"]])
-    if len(data) > 1:
-        ws.update(data, value_input_option="RAW")
-    sheets_updated += 1
-
-    return {"ok": True, "sheets_updated": sheets_updated}
+            job.status = "done"
+            self.runs += 1
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.exception("Google Sheets sync failed for user %s", job.user_id)
+            job.status = "failed"
+            job.error = str(exc)
+            self.failures += 1
+        finally:
+            job.finished_at = time.time()
+            if self._active.get(job.user_id) is job:
+                del self._active[job.user_id]
+
+    def get(self, job_id: str, user_id: int) -> SyncJob | None:
+        job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    def stats(self) -> dict[str, int]:
+        return {"jobs": len(self._jobs), "runs": self.runs, "failures": self.failures}
+
+    async def close(self) -> None:
+        for job in list(self._jobs.values()):
+            if job.task is not None and not job.task.done():
+                job.task.cancel()
+
+
+_MANAGER: SheetsSyncManager | None = None
+
+
+def get_sync_manager() -> SheetsSyncManager:
+    global _MANAGER
+    if _MANAGER is None:
+        _MANAGER = SheetsSyncManager()
+    return _MANAGER
+
+
+async def close_sync_manager() -> None:
+    global _MANAGER
+    if _MANAGER is not None:
+        await _MANAGER.close()
+        _MANAGER = None
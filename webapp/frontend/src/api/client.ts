@@ -9,7 +9,7 @@ function getInitData(): string {
   return window.Telegram?.WebApp?.initData ?? "";
 }
 
-async function request<T>(path: string, options: RequestInit = {}): Promise<T> {
+async function send(path: string, options: RequestInit = {}): Promise<Response> {
   const initData = getInitData();
   const res = await fetch(`${API_BASE}${path}`, {
     ...options,
@@ -25,9 +25,26 @@ async function request<T>(path: string, options: RequestInit = {}): Promise<T> {
     throw new Error(body.detail || `HTTP ${res.status}`);
   }
 
+  return res;
+}
+
+async function request<T>(path: string, options: RequestInit = {}): Promise<T> {
+  const res = await send(path, options);
   return res.json();
 }
 
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+/** Fetch one keyset page; the next cursor comes in the X-Next-Cursor header. */
+async function requestPage<T>(path: string, cursor?: string | null): Promise<Page<T>> {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+  const res = await send(`${path}${query}`);
+  return { items: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") };
+}
+
 // ── Expense Types ────────────────────────────────────
 
 export interface Expense {
@@ -49,6 +66,7 @@ export interface BudgetStatus {
   category_id: number;
   category: string;
   budget_limit: number;
+  monthly_limit: number;
   spent: number;
   remaining: number;
   percent_used: number;
@@ -246,7 +264,20 @@ export const wishlistApi = {
       method: "DELETE",
     }),
 
-  getPurchases: () => request<Purchase[]>("/wishlist/purchases"),
+  getPurchasesPage: (cursor?: string | null) =>
+    requestPage<Purchase>("/wishlist/purchases", cursor),
+
+  /** All visible purchases, following the server's pages. */
+  getPurchases: async () => {
+    const purchases: Purchase[] = [];
+    let cursor: string | null = null;
+    do {
+      const page: Page<Purchase> = await requestPage<Purchase>("/wishlist/purchases", cursor);
+      purchases.push(...page.items);
+      cursor = page.nextCursor;
+    } while (cursor);
+    return purchases;
+  },
 };
 
 // ── Income API ────────────────────────────────────────
@@ -441,10 +472,15 @@ export const gsheetsApi = {
       method: "POST",
     }),
 
-  sync: () =>
-    request<{ ok: boolean; sheets_updated?: number; error?: string }>("/gsheets/sync", {
-      method: "POST",
-    }),
+  sync: async () => {
+    type SyncJob = { ok: boolean; job_id?: string; status?: string; sheets_updated?: number; error?: string };
+    let job = await request<SyncJob>("/gsheets/sync", { method: "POST" });
+    while (job.ok && (job.status === "queued" || job.status === "running")) {
+      await new Promise((resolve) => setTimeout(resolve, 500));
+      job = await request<SyncJob>(`/gsheets/jobs/${job.job_id}`);
+    }
+    return job;
+  },
 };
 
 // ── Export API ────────────────────────────────────────
@@ -455,8 +491,18 @@ export const exportApi = {
     if (year) params.set("year", String(year));
     if (month) params.set("month", String(month));
     const qs = params.toString();
+    const job = await request<{ job_id: string; status: string; error?: string }>(
+      `/export/excel${qs ? `?${qs}` : ""}`,
+      { method: "POST" },
+    );
+    let status = job.status;
+    while (status === "queued" || status === "running") {
+      await new Promise((resolve) => setTimeout(resolve, 500));
+      status = (await request<{ status: string }>(`/export/jobs/${job.job_id}`)).status;
+    }
+    if (status !== "done") throw new Error("Export failed");
     const initData = getInitData();
-    const res = await fetch(`${API_BASE}/export/excel${qs ? `?${qs}` : ""}`, {
+    const res = await fetch(`${API_BASE}/export/jobs/${job.job_id}/file`, {
       headers: { Authorization: `tma ${initData}` },
     });
     if (!res.ok) throw new Error("Export failed");
@@ -0,0 +1,10 @@
+"""Make ``webapp`` and the bot's ``Bot`` package importable, as main.py does."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+for path in (str(PROJECT_ROOT), str(PROJECT_ROOT / "finance_bot")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
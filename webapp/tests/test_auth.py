@@ -0,0 +1,107 @@
+"""Tests for Telegram initData validation and its cache."""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+from urllib.parse import urlencode
+
+import pytest
+
+from webapp.backend import auth
+from webapp.backend.auth import InitDataValidator, derive_secret_key
+
+BOT_TOKEN = "123456:TEST"
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _init_data(user_id: int, auth_date: int, token: str = BOT_TOKEN) -> str:
+    fields = {"auth_date": str(auth_date), "user": json.dumps({"id": user_id})}
+    check = "\n".join(f"{key}={fields[key]}" for key in sorted(fields))
+    signature = hmac.new(derive_secret_key(token), check.encode(), hashlib.sha256).hexdigest()
+    return urlencode({**fields, "hash": signature})
+
+
+@pytest.fixture
+def verify_calls(monkeypatch) -> list[str]:
+    calls: list[str] = []
+    verify = auth._verify_init_data
+
+    def counting(init_data, *args, **kwargs):
+        calls.append(init_data)
+        return verify(init_data, *args, **kwargs)
+
+    monkeypatch.setattr(auth, "_verify_init_data", counting)
+    return calls
+
+
+def test_cache_hit_skips_hmac(verify_calls) -> None:
+    clock = FakeClock(1_000_000.0)
+    validator = InitDataValidator(BOT_TOKEN, clock=clock)
+    init_data = _init_data(7, auth_date=int(clock.now) - 10)
+
+    assert validator.validate(init_data)["id"] == 7
+    assert validator.validate(init_data)["id"] == 7
+    assert len(verify_calls) == 1
+    assert validator.stats()["hits"] == 1
+    assert validator.stats()["misses"] == 1
+
+
+def test_cached_entry_expires_with_auth_date(verify_calls) -> None:
+    clock = FakeClock(1_000_000.0)
+    validator = InitDataValidator(BOT_TOKEN, max_age_seconds=600, cache_ttl=3600, clock=clock)
+    init_data = _init_data(7, auth_date=int(clock.now) - 500)
+    validator.validate(init_data)
+
+    # The cache TTL is an hour, but auth_date + max_age comes first.
+    clock.now += 99
+    validator.validate(init_data)
+    assert len(verify_calls) == 1
+    clock.now += 2
+    with pytest.raises(ValueError, match="expired"):
+        validator.validate(init_data)
+    assert len(verify_calls) == 2
+    assert validator.stats()["size"] == 0
+
+
+def test_tampered_data_is_rejected_and_counted() -> None:
+    clock = FakeClock(1_000_000.0)
+    validator = InitDataValidator(BOT_TOKEN, clock=clock)
+    genuine = _init_data(7, auth_date=int(clock.now))
+    tampered = genuine.replace("%3A+7%7D", "%3A+8%7D")
+    assert tampered != genuine
+
+    with pytest.raises(ValueError, match="signature"):
+        validator.validate(tampered)
+    with pytest.raises(ValueError, match="signature"):
+        validator.validate(_init_data(7, auth_date=int(clock.now), token="654321:OTHER"))
+    stats = validator.stats()
+    assert stats["failures"] == 2
+    assert stats["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(verify_calls) -> None:
+    clock = FakeClock(1_000_000.0)
+    validator = InitDataValidator(BOT_TOKEN, cache_size=2, clock=clock)
+    first, second, third = (_init_data(uid, auth_date=int(clock.now)) for uid in (1, 2, 3))
+
+    validator.validate(first)
+    validator.validate(second)
+    validator.validate(first)  # ``second`` is now the least recently used
+    validator.validate(third)
+    assert validator.stats()["evictions"] == 1
+    assert validator.stats()["size"] == 2
+
+    verify_calls.clear()
+    validator.validate(first)
+    validator.validate(third)
+    assert verify_calls == []
+    validator.validate(second)
+    assert verify_calls == [second]
@@ -0,0 +1,143 @@
+"""Tests for the Excel export job queue and its on-disk cache."""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from webapp.backend.utils import excel_export
+from webapp.backend.utils.excel_export import ExportJobManager
+
+
+class FakeDb:
+    """The bulk reads collect_export_data makes, over in-memory data."""
+
+    def __init__(self) -> None:
+        self.savings = [{"category": "Подушка", "current": 100.0}]
+
+    async def get_all_savings_list(self, user_id):
+        return list(self.savings)
+
+    async def get_monthly_report_data(self, user_id, year, month):
+        return {"month": f"{year:04d}-{month:02d}", "total_income": 0, "total_expense": 0}
+
+    async def list_recurring_payments(self, user_id):
+        return []
+
+    async def list_household_items_with_status(self, user_id, month):
+        return []
+
+
+def _write_stub(data, path: str) -> str:
+    # openpyxl is exercised elsewhere; these tests are about jobs and files.
+    Path(path).write_text(repr(data))
+    return path
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(excel_export, "write_workbook", _write_stub)
+    executor = ThreadPoolExecutor(max_workers=1)
+    manager = ExportJobManager(export_dir=tmp_path / "exports", executor=executor)
+    yield manager
+    executor.shutdown(wait=True)
+
+
+def _export(manager: ExportJobManager, db: FakeDb, user_id: int = 1):
+    async def run():
+        job = await manager.submit(db, user_id, 2026, 3)
+        return await manager.wait(job)
+
+    return asyncio.run(run())
+
+
+def _expire(*jobs) -> None:
+    for job in jobs:
+        job.finished_at -= excel_export.JOB_RETENTION_SECONDS + 1
+
+
+def test_unchanged_data_is_served_from_cache(manager) -> None:
+    db = FakeDb()
+    first = _export(manager, db)
+    second = _export(manager, db)
+
+    assert (first.status, second.status) == ("done", "done")
+    assert not first.cached and second.cached
+    assert second.path == first.path and first.path.exists()
+    assert manager.stats()["builds"] == 1
+    assert manager.stats()["cache_hits"] == 1
+
+
+def test_superseded_file_is_removed_only_when_unreferenced(manager) -> None:
+    db = FakeDb()
+    old = _export(manager, db)
+    db.savings.append({"category": "Отпуск", "current": 5.0})
+    new = _export(manager, db)
+
+    # ``old`` is still a live job, so its file must stay downloadable.
+    assert new.path != old.path
+    assert old.path.exists() and new.path.exists()
+
+    _expire(old)
+    _export(manager, db)  # submit prunes expired jobs
+    assert not old.path.exists()
+    assert new.path.exists()
+
+    # Once every job has expired, the latest version stays as the cache.
+    _expire(*manager._jobs.values())
+    manager._prune()
+    assert new.path.exists()
+    assert _export(manager, db).cached
+
+
+def test_sweep_removes_old_unused_files(manager) -> None:
+    manager.export_dir.mkdir(parents=True)
+    stale = manager.export_dir / "9_2020-01_deadbeef.xlsx"
+    stale.write_text("left over from an earlier process")
+    old = time.time() - excel_export.EXPORT_FILE_MAX_AGE - 60
+    os.utime(stale, (old, old))
+
+    job = _export(manager, FakeDb())
+    assert not stale.exists()
+
+    # A file a live job points at survives the sweep however old it is.
+    os.utime(job.path, (old, old))
+    manager._swept_at = 0.0
+    _export(manager, FakeDb(), user_id=2)
+    assert job.path.exists()
+    assert manager.stats()["files_removed"] == 1
+
+
+def test_other_users_job_is_not_found(manager, monkeypatch) -> None:
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi import FastAPI, Request
+    from fastapi.testclient import TestClient
+
+    from webapp.backend.dependencies import get_current_user
+    from webapp.backend.routers import export
+
+    monkeypatch.setattr(excel_export, "_MANAGER", manager)
+    monkeypatch.setattr(export, "get_async_db", FakeDb)
+    app = FastAPI()
+    app.include_router(export.router, prefix="/api/export")
+
+    def current_user(request: Request) -> dict:
+        return {"id": int(request.headers["X-Test-User"])}
+
+    app.dependency_overrides[get_current_user] = current_user
+    with TestClient(app) as client:
+        started = client.post(
+            "/api/export/excel", params={"year": 2026, "month": 3}, headers={"X-Test-User": "1"}
+        )
+        job_id = started.json()["job_id"]
+        assert client.get(f"/api/export/jobs/{job_id}", headers={"X-Test-User": "2"}).status_code == 404
+        assert (
+            client.get(f"/api/export/jobs/{job_id}/file", headers={"X-Test-User": "2"}).status_code
+            == 404
+        )
+        assert client.get(f"/api/export/jobs/{job_id}", headers={"X-Test-User": "1"}).status_code == 200
@@ -0,0 +1,194 @@
+"""Tests for the incremental Google Sheets sync, against a fake gspread client."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+from webapp.backend.utils import google_sheets
+from webapp.backend.utils.google_sheets import SheetsSyncManager, diff_sheet, sync_to_sheets
+
+NOW = datetime(2026, 3, 15)
+
+
+class FakeDb:
+    """The reads collect_sheet_rows makes, plus in-memory sync snapshots."""
+
+    def __init__(self) -> None:
+        self.expenses = [
+            {"created_at": "2026-03-01", "category": "Еда", "amount": 100.0, "note": ""},
+            {"created_at": "2026-03-02", "category": "Кафе", "amount": 50.0, "note": "обед"},
+        ]
+        self.snapshots: dict[tuple[int, str], dict] = {}
+        self.events: list[str] = []
+
+    async def get_all_savings_list(self, user_id):
+        return [{"category": "Подушка", "current": 100.0, "goal": 1000.0, "purpose": ""}]
+
+    async def list_expenses(self, user_id, year, month):
+        return list(self.expenses)
+
+    async def get_monthly_report_data(self, user_id, year, month):
+        return {
+            "month": f"{year:04d}-{month:02d}",
+            "total_income": 1000.0,
+            "total_expense": 150.0,
+            "household_paid": 0,
+            "household_total": 0,
+            "income_by_category": [],
+            "expense_by_category": [],
+        }
+
+    async def list_recurring_payments(self, user_id):
+        return []
+
+    async def list_household_items_with_status(self, user_id, month):
+        return []
+
+    async def list_debts(self, user_id, settled=False):
+        return []
+
+    async def get_sheet_snapshots(self, user_id, spreadsheet_id):
+        return dict(self.snapshots.get((user_id, spreadsheet_id), {}))
+
+    async def save_sheet_snapshots(self, user_id, spreadsheet_id, snapshots):
+        self.events.append(f"saved {spreadsheet_id}")
+        for key in [key for key in self.snapshots if key[0] == user_id]:
+            del self.snapshots[key]
+        self.snapshots[(user_id, spreadsheet_id)] = dict(snapshots)
+
+
+class FakeWorksheet:
+    def __init__(self, title: str) -> None:
+        self.title = title
+
+
+class FakeSpreadsheet:
+    def __init__(self, titles=()) -> None:
+        self.titles = list(titles)
+        self.added: list[str] = []
+        self.cleared: list[list[str]] = []
+        self.updates: list[list[dict]] = []
+
+    def worksheets(self):
+        return [FakeWorksheet(title) for title in self.titles]
+
+    def add_worksheet(self, title, rows, cols):
+        self.titles.append(title)
+        self.added.append(title)
+
+    def values_batch_clear(self, body):
+        self.cleared.append(body["ranges"])
+
+    def values_batch_update(self, body):
+        self.updates.append(body["data"])
+
+    def reset(self) -> None:
+        self.added, self.cleared, self.updates = [], [], []
+
+
+class FakeClient:
+    def __init__(self, db: FakeDb | None = None, **spreadsheets: FakeSpreadsheet) -> None:
+        self.db = db
+        self.spreadsheets = spreadsheets
+
+    def open_by_key(self, key):
+        if self.db is not None:
+            self.db.events.append(f"open {key}")
+        return self.spreadsheets[key]
+
+
+def _sync(db: FakeDb, client: FakeClient, spreadsheet_id: str = "sheet") -> dict:
+    return asyncio.run(
+        sync_to_sheets(db, 1, spreadsheet_id, now=NOW, client_factory=lambda: client)
+    )
+
+
+def test_diff_sheet_blanks_rows_that_disappeared() -> None:
+    rows = [["h1", "h2", "h3"], ["a", 1, 2], ["b", 3, 4]]
+    ranges, snapshot = diff_sheet("Лист", rows, None)
+    assert ranges == [{"range": "'Лист'!A1:C3", "values": rows}]
+
+    ranges, _ = diff_sheet("Лист", [["h1", "h2"]], snapshot)
+    assert ranges == [
+        {"range": "'Лист'!A1:C3", "values": [["h1", "h2", ""], ["", "", ""], ["", "", ""]]}
+    ]
+
+
+def test_first_sync_creates_or_clears_every_sheet() -> None:
+    db = FakeDb()
+    sheet = FakeSpreadsheet(["Накопления"])
+    result = _sync(db, FakeClient(sheet=sheet))
+
+    assert sheet.added == [t for t in google_sheets.SHEET_TITLES if t != "Накопления"]
+    assert sheet.cleared == [["'Накопления'"]]
+    written = {entry["range"].split("!")[0] for entry in sheet.updates[0]}
+    assert written == {f"'{title}'" for title in google_sheets.SHEET_TITLES}
+    assert result["sheets_updated"] == len(google_sheets.SHEET_TITLES)
+
+
+def test_unchanged_resync_sends_nothing() -> None:
+    db = FakeDb()
+    sheet = FakeSpreadsheet()
+    _sync(db, FakeClient(sheet=sheet))
+    sheet.reset()
+
+    result = _sync(db, FakeClient(sheet=sheet))
+    assert (sheet.added, sheet.cleared, sheet.updates) == ([], [], [])
+    assert result == {"ok": True, "sheets_updated": 0, "ranges": 0}
+
+
+def test_shrunk_sheet_blanks_trailing_rows() -> None:
+    db = FakeDb()
+    sheet = FakeSpreadsheet()
+    _sync(db, FakeClient(sheet=sheet))
+    sheet.reset()
+
+    db.expenses.pop()
+    result = _sync(db, FakeClient(sheet=sheet))
+    assert sheet.cleared == []
+    assert sheet.updates == [[{"range": "'Расходы'!A3:D3", "values": [["", "", "", ""]]}]]
+    assert result["ranges"] == 1
+
+
+def test_deleted_worksheet_is_rebuilt() -> None:
+    db = FakeDb()
+    sheet = FakeSpreadsheet()
+    _sync(db, FakeClient(sheet=sheet))
+    sheet.titles.remove("Расходы")
+    sheet.reset()
+
+    _sync(db, FakeClient(sheet=sheet))
+    assert sheet.added == ["Расходы"]
+    assert sheet.cleared == []
+    assert sheet.updates == [
+        [
+            {
+                "range": "'Расходы'!A1:D3",
+                "values": [
+                    ["Дата", "Категория", "Сумма", "Заметка"],
+                    ["2026-03-01", "Еда", 100.0, ""],
+                    ["2026-03-02", "Кафе", 50.0, "обед"],
+                ],
+            }
+        ]
+    ]
+
+
+def test_manager_runs_one_job_per_user_at_a_time() -> None:
+    db = FakeDb()
+    client = FakeClient(db, first=FakeSpreadsheet(), second=FakeSpreadsheet())
+    manager = SheetsSyncManager(client_factory=lambda: client)
+
+    async def run():
+        first = await manager.submit(db, 1, "first")
+        assert await manager.submit(db, 1, "first") is first
+        second = await manager.submit(db, 1, "second")
+        assert second is not first and second.status == "queued"
+        assert await manager.submit(db, 1, "second") is second
+        await asyncio.gather(first.task, second.task)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert (first.status, second.status) == ("done", "done")
+    assert db.events == ["open first", "saved first", "open second", "saved second"]
+    assert manager.stats()["runs"] == 2
@@ -0,0 +1,64 @@
+"""Tests for the keyset-paged purchases endpoint."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from Bot.database import crud
+from Bot.database.async_db import AsyncFinanceDatabase
+from webapp.backend.dependencies import get_current_user
+from webapp.backend.routers import wishlist
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(crud, "DB_PATH", tmp_path / "finance.db")
+    crud.FinanceDatabase._instance = None
+    db = crud.FinanceDatabase()
+    async_db = AsyncFinanceDatabase(db)
+    monkeypatch.setattr(wishlist, "get_async_db", lambda: async_db)
+
+    app = FastAPI()
+    app.include_router(wishlist.router, prefix="/api/wishlist")
+    app.dependency_overrides[get_current_user] = lambda: {"id": 1}
+    try:
+        with TestClient(app) as test_client:
+            yield db, test_client
+    finally:
+        asyncio.run(async_db.close())
+        db.close()
+        crud.FinanceDatabase._instance = None
+
+
+def test_purchases_are_walked_page_by_page(client) -> None:
+    db, test_client = client
+    moment = datetime.now(timezone.utc) - timedelta(hours=1)
+    for index in range(5):
+        db.add_purchase(1, f"p{index}", 1.0, "Прочее", moment - timedelta(minutes=index))
+    db.add_purchase(2, "чужая", 1.0, "Прочее", moment)
+
+    pages: list[list[str]] = []
+    params: dict = {"limit": 2}
+    while True:
+        response = test_client.get("/api/wishlist/purchases", params=params)
+        assert response.status_code == 200
+        pages.append([row["wish_name"] for row in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": 2, "cursor": cursor}
+    assert pages == [["p0", "p1"], ["p2", "p3"], ["p4"]]
+
+
+def test_invalid_cursor_is_rejected(client) -> None:
+    _, test_client = client
+    response = test_client.get("/api/wishlist/purchases", params={"cursor": "garbage"})
+    assert response.status_code == 400